@@ -0,0 +1,238 @@
+import asyncio
+import time
+from selenium.common.exceptions import (NoAlertPresentException, NoSuchElementException,
+                                        StaleElementReferenceException, TimeoutException,
+                                        UnexpectedAlertPresentException)
+from base.scripts import load_script
+from locators.registry import compile_locator
+from utils.driver_factory import DriverFactory
+
+_RETRYABLE = (NoSuchElementException, StaleElementReferenceException)
+
+
+class AsyncBasePage:
+    """asyncio counterpart of BasePage for an AsyncWebDriver session.
+
+    Same locators, same wait semantics (positive queries poll up to the
+    explicit wait, negative queries check once and wait only
+    ``negative_wait``), but every wait sleeps on the event loop, so many
+    pages on many sessions make progress in one thread.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        settings = DriverFactory().get_wait_config()
+        self.timeout = settings['explicit_wait']
+        self.negative_timeout = settings['negative_wait']
+        self.poll_frequency = settings['poll_frequency']
+        self.quiet_ms = DriverFactory().get_readiness_config()['quiet_ms']
+
+    async def until(self, condition, timeout=None, message=""):
+        """Await until the coroutine condition() returns something truthy and return it"""
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        while True:
+            try:
+                value = await condition()
+                if value:
+                    return value
+            except _RETRYABLE:
+                pass
+            if time.monotonic() >= deadline:
+                raise TimeoutException(message)
+            await asyncio.sleep(self.poll_frequency)
+
+    async def open(self, url):
+        """Open the specified URL"""
+        await self.driver.get(url)
+
+    async def get_title(self):
+        """Get the page title"""
+        return await self.driver.title()
+
+    async def get_current_url(self):
+        """Get the current URL"""
+        return await self.driver.current_url()
+
+    async def find_element(self, locator, timeout=None):
+        """Find element, waiting until it is present"""
+        by, value = compile_locator(locator)
+        try:
+            try:
+                return await self.until(lambda: self.driver.find_element(by, value), timeout,
+                                        f"Element not found: {locator}")
+            except UnexpectedAlertPresentException:
+                # Dismiss unexpected alerts and retry once
+                await self.handle_any_alert()
+                return await self.until(lambda: self.driver.find_element(by, value), timeout,
+                                        f"Element not found: {locator}")
+        except TimeoutException:
+            raise NoSuchElementException(f"Element not found: {locator}")
+
+    async def find_elements(self, locator, timeout=None, expect_empty=False):
+        """Find multiple elements; with expect_empty=True return the current matches at once"""
+        by, value = compile_locator(locator)
+        if expect_empty:
+            return await self.driver.find_elements(by, value)
+        try:
+            return await self.until(lambda: self.driver.find_elements(by, value), timeout)
+        except TimeoutException:
+            return []
+
+    async def _use_element(self, locator, action, timeout=None):
+        """Await action(element), re-finding the element once if the DOM replaced it"""
+        try:
+            return await action(await self.find_element(locator, timeout))
+        except StaleElementReferenceException:
+            return await action(await self.find_element(locator, timeout))
+
+    async def click_element(self, locator, timeout=None):
+        """Click element once it is displayed and enabled"""
+        by, value = compile_locator(locator)
+
+        async def _clickable():
+            element = await self.driver.find_element(by, value)
+            return element if await element.is_displayed() and await element.is_enabled() else None
+
+        try:
+            element = await self.until(_clickable, timeout, f"Element not clickable: {locator}")
+            await element.click()
+        except UnexpectedAlertPresentException:
+            await self.handle_any_alert()
+            element = await self.until(_clickable, timeout, f"Element not clickable: {locator}")
+            await element.click()
+
+    async def send_keys_to_element(self, locator, text, timeout=None):
+        """Send keys to element with explicit wait"""
+        async def _type(element):
+            await element.clear()
+            await element.send_keys(text)
+        await self._use_element(locator, _type, timeout)
+
+    async def get_element_text(self, locator, timeout=None):
+        """Get text from element"""
+        return await self._use_element(locator, lambda element: element.text(), timeout)
+
+    async def extract_rows(self, row_locator, fields, timeout=None):
+        """Read structured data from every row in one script call; see BasePage.extract_rows"""
+        row_locator = compile_locator(row_locator)
+        spec = {name: list(field) + [None] * (3 - len(field)) for name, field in fields.items()}
+        script = load_script('extract_rows')
+        rows = await self.driver.execute_script(script, row_locator[0], row_locator[1], spec)
+        if rows or not await self.find_elements(row_locator, timeout):
+            return rows
+        return await self.driver.execute_script(script, row_locator[0], row_locator[1], spec)
+
+    async def is_element_displayed(self, locator, timeout=None):
+        """Check if element is displayed, waiting for it to be present"""
+        try:
+            return await self._use_element(locator, lambda element: element.is_displayed(), timeout)
+        except NoSuchElementException:
+            return False
+
+    async def is_element_present(self, locator, timeout=None):
+        """Check if element is in the DOM, waiting for it to appear"""
+        try:
+            await self.find_element(locator, timeout)
+            return True
+        except NoSuchElementException:
+            return False
+
+    async def is_element_absent(self, locator, timeout=None):
+        """Check that element is not in the DOM; returns at once when it is already gone"""
+        by, value = compile_locator(locator)
+        if not await self.driver.find_elements(by, value):
+            return True
+
+        async def _gone():
+            return not await self.driver.find_elements(by, value)
+
+        try:
+            return await self.until(_gone, self.negative_timeout if timeout is None else timeout)
+        except TimeoutException:
+            return False
+
+    async def wait_for_element_visible(self, locator, timeout=None):
+        """Wait for element to be visible"""
+        by, value = compile_locator(locator)
+
+        async def _visible():
+            element = await self.driver.find_element(by, value)
+            return element if await element.is_displayed() else None
+
+        try:
+            await self.until(_visible, timeout, f"Element not visible: {locator}")
+            return True
+        except TimeoutException:
+            return False
+
+    async def wait_for_url_contains(self, fragment, timeout=None):
+        """Wait until current URL contains the given fragment"""
+        async def _contains():
+            return fragment in (await self.driver.current_url() or "")
+
+        try:
+            await self.until(_contains, timeout)
+            return True
+        except TimeoutException:
+            return False
+
+    async def wait_for_dom_change(self, locator, condition, timeout=None):
+        """Wait for a DOM condition on locator's matches without polling; see WaitPolicy.dom_change"""
+        by, value = compile_locator(locator)
+        timeout = self.timeout if timeout is None else timeout
+        return await self.driver.execute_async_script(load_script('wait_for_change'), by, value,
+                                                      list(condition), int(timeout * 1000))
+
+    async def wait_for_network_idle(self, quiet_ms=None, timeout=None):
+        """Wait until the page has loaded and sent no fetch/XHR for quiet_ms; False on timeout"""
+        timeout = self.timeout if timeout is None else timeout
+        state = await self.driver.execute_async_script(
+            load_script('network_tracker') + load_script('network_wait'),
+            ["idle", self.quiet_ms if quiet_ms is None else quiet_ms], int(timeout * 1000))
+        return state["met"]
+
+    async def _alert_text(self):
+        try:
+            return await self.driver.alert_text()
+        except NoAlertPresentException:
+            return None
+
+    async def wait_for_alert_and_accept(self, timeout=5):
+        """Wait for a JavaScript alert and accept it; returns False if none opened"""
+        async def _open():
+            return await self._alert_text() is not None
+
+        try:
+            await self.until(_open, timeout)
+            await self.driver.accept_alert()
+        except (TimeoutException, NoAlertPresentException):
+            return False
+        return True
+
+    async def handle_any_alert(self):
+        """Accept (or failing that dismiss) an open alert; False when there was none"""
+        try:
+            await self.driver.accept_alert()
+            return True
+        except NoAlertPresentException:
+            return False
+        except Exception:
+            try:
+                await self.driver.dismiss_alert()
+                return True
+            except Exception:
+                return False
+
+    async def refresh_page(self):
+        """Refresh the current page"""
+        await self.driver.refresh()
+
+    async def go_back(self):
+        """Go back to previous page"""
+        await self.driver.back()
+
+    async def switch_to_latest_window(self):
+        """Switch focus to the most recently opened browser window/tab"""
+        handles = await self.driver.window_handles()
+        if handles:
+            await self.driver.switch_to_window(handles[-1])
@@ -0,0 +1,346 @@
+"""WebDriver protocol client for asyncio.
+
+Speaks the W3C WebDriver HTTP protocol to a driver executable (chromedriver,
+geckodriver, msedgedriver) over keep-alive connections managed on the event
+loop, so one process can drive many browser sessions concurrently without a
+thread per session. Errors are raised as the same selenium exceptions the
+synchronous driver raises.
+"""
+import asyncio
+import json
+from urllib.parse import quote, urlsplit
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.driver_finder import DriverFinder
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+from selenium.webdriver.remote.locator_converter import LocatorConverter
+from utils.driver_factory import DriverFactory
+
+ELEMENT_KEY = "element-6066-11e4-a52f-4f735466cecf"
+_errors = ErrorHandler()
+_locators = LocatorConverter()
+
+
+class AsyncHttpClient:
+    """Minimal HTTP/1.1 JSON client with a bounded pool of keep-alive connections"""
+
+    def __init__(self, base_url, connections=32):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self.requests = 0
+        self.connections = 0
+        self._limit = connections
+        self._slots = None
+        self._idle = []
+
+    async def request(self, method, path, body=None):
+        """Send one request and return (status, decoded JSON body)"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._limit)
+        payload = json.dumps(body).encode() if body is not None else b""
+        async with self._slots:
+            reused = bool(self._idle)
+            connection = self._idle.pop() if reused else await self._connect()
+            try:
+                status, data, keep_alive = await self._roundtrip(connection, method, path, payload)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection[1].close()
+                if not reused:
+                    raise
+                # The server closed an idle keep-alive connection; nothing was processed
+                connection = await self._connect()
+                status, data, keep_alive = await self._roundtrip(connection, method, path, payload)
+            self.requests += 1
+            if keep_alive:
+                self._idle.append(connection)
+            else:
+                connection[1].close()
+        return status, json.loads(data) if data else None
+
+    async def _connect(self):
+        self.connections += 1
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def _roundtrip(self, connection, method, path, payload):
+        reader, writer = connection
+        head = (f"{method} {self.prefix}{path} HTTP/1.1\r\n"
+                f"Host: {self.host}:{self.port}\r\n"
+                "Accept: application/json\r\n"
+                "Content-Type: application/json;charset=UTF-8\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                "Connection: keep-alive\r\n\r\n")
+        writer.write(head.encode() + payload)
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed before response")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(":")
+            headers[name.strip().lower()] = value.strip()
+        keep_alive = headers.get('connection', '').lower() != 'close'
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            data = b""
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                data += await reader.readexactly(size)
+                await reader.readexactly(2)
+        elif 'content-length' in headers:
+            data = await reader.readexactly(int(headers['content-length']))
+        else:
+            data = await reader.read()
+            keep_alive = False
+        return status, data, keep_alive
+
+    async def close(self):
+        """Close every idle connection"""
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+class AsyncWebElement:
+    """Handle to an element in an AsyncWebDriver session"""
+
+    def __init__(self, driver, element_id):
+        self.driver = driver
+        self.id = element_id
+
+    def __eq__(self, other):
+        return isinstance(other, AsyncWebElement) and other.id == self.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def _execute(self, method, command, body=None):
+        return self.driver.execute(method, f"/element/{self.id}{command}", body)
+
+    async def click(self):
+        await self._execute("POST", "/click", {})
+
+    async def clear(self):
+        await self._execute("POST", "/clear", {})
+
+    async def send_keys(self, text):
+        await self._execute("POST", "/value", {"text": str(text)})
+
+    async def text(self):
+        return await self._execute("GET", "/text")
+
+    async def get_attribute(self, name):
+        return await self._execute("GET", f"/attribute/{quote(name)}")
+
+    async def get_property(self, name):
+        return await self._execute("GET", f"/property/{quote(name)}")
+
+    async def is_displayed(self):
+        return await self._execute("GET", "/displayed")
+
+    async def is_enabled(self):
+        return await self._execute("GET", "/enabled")
+
+    async def find_element(self, by, value):
+        by, value = _locators.convert(by, value)
+        return await self._execute("POST", "/element", {"using": by, "value": value})
+
+    async def find_elements(self, by, value):
+        by, value = _locators.convert(by, value)
+        return await self._execute("POST", "/elements", {"using": by, "value": value})
+
+
+class AsyncWebDriver:
+    """One browser session driven from the event loop; every command is a coroutine"""
+
+    def __init__(self, client, session_id, capabilities=None):
+        self.client = client
+        self.session_id = session_id
+        self.capabilities = capabilities or {}
+
+    @classmethod
+    async def start(cls, client, capabilities):
+        """Create a new browser session on the driver server behind client"""
+        status, response = await client.request(
+            "POST", "/session", {"capabilities": {"firstMatch": [{}], "alwaysMatch": capabilities}})
+        value = _check(status, response)
+        return cls(client, value["sessionId"], value.get("capabilities"))
+
+    async def execute(self, method, command, body=None):
+        """Send a session command and return its unwrapped value"""
+        status, response = await self.client.request(method, f"/session/{self.session_id}{command}", body)
+        return self._unwrap(_check(status, response))
+
+    def _unwrap(self, value):
+        if isinstance(value, dict):
+            if ELEMENT_KEY in value:
+                return AsyncWebElement(self, value[ELEMENT_KEY])
+            return {key: self._unwrap(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._unwrap(item) for item in value]
+        return value
+
+    @staticmethod
+    def _wrap(value):
+        if isinstance(value, AsyncWebElement):
+            return {ELEMENT_KEY: value.id}
+        if isinstance(value, (list, tuple)):
+            return [AsyncWebDriver._wrap(item) for item in value]
+        if isinstance(value, dict):
+            return {key: AsyncWebDriver._wrap(item) for key, item in value.items()}
+        return value
+
+    async def get(self, url):
+        await self.execute("POST", "/url", {"url": url})
+
+    async def current_url(self):
+        return await self.execute("GET", "/url")
+
+    async def title(self):
+        return await self.execute("GET", "/title")
+
+    async def back(self):
+        await self.execute("POST", "/back", {})
+
+    async def forward(self):
+        await self.execute("POST", "/forward", {})
+
+    async def refresh(self):
+        await self.execute("POST", "/refresh", {})
+
+    async def find_element(self, by, value):
+        by, value = _locators.convert(by, value)
+        return await self.execute("POST", "/element", {"using": by, "value": value})
+
+    async def find_elements(self, by, value):
+        by, value = _locators.convert(by, value)
+        return await self.execute("POST", "/elements", {"using": by, "value": value})
+
+    async def execute_script(self, script, *args):
+        return await self.execute("POST", "/execute/sync", {"script": script, "args": self._wrap(list(args))})
+
+    async def execute_async_script(self, script, *args):
+        return await self.execute("POST", "/execute/async", {"script": script, "args": self._wrap(list(args))})
+
+    async def window_handles(self):
+        return await self.execute("GET", "/window/handles")
+
+    async def switch_to_window(self, handle):
+        await self.execute("POST", "/window", {"handle": handle})
+
+    async def alert_text(self):
+        return await self.execute("GET", "/alert/text")
+
+    async def accept_alert(self):
+        await self.execute("POST", "/alert/accept", {})
+
+    async def dismiss_alert(self):
+        await self.execute("POST", "/alert/dismiss", {})
+
+    async def add_cookie(self, cookie):
+        await self.execute("POST", "/cookie", {"cookie": cookie})
+
+    async def delete_all_cookies(self):
+        await self.execute("DELETE", "/cookie")
+
+    async def set_timeouts(self, **milliseconds):
+        """Set W3C timeouts, e.g. set_timeouts(pageLoad=30000, script=30000)"""
+        await self.execute("POST", "/timeouts", milliseconds)
+
+    async def screenshot_as_base64(self):
+        return await self.execute("GET", "/screenshot")
+
+    async def quit(self):
+        """End the browser session"""
+        try:
+            await self.execute("DELETE", "")
+        except WebDriverException:
+            pass
+
+
+class AsyncDriverService:
+    """One driver executable serving many async browser sessions.
+
+    Without a url the configured browser's driver is located and launched
+    the same way ``DriverFactory`` does; with a url an already running
+    driver server (or Selenium Grid) is used.
+    """
+
+    def __init__(self, url=None, browser=None, factory=None):
+        self.factory = factory or DriverFactory()
+        self.browser = browser
+        self.url = url
+        self.settings = self.factory.get_async_config()
+        self.client = None
+        self.sessions = []
+        self._starting = 0
+        self._service = None
+        self._browser_path = None
+
+    async def start(self):
+        if self.url is None:
+            self._service = self.factory.get_service(self.browser)
+            finder = DriverFinder(self._service, self.factory.get_options(self.browser))
+            self._browser_path = finder.get_browser_path() or None
+            self._service.path = self._service.env_path() or finder.get_driver_path()
+            await asyncio.to_thread(self._service.start)
+            self.url = self._service.service_url
+        self.client = AsyncHttpClient(self.url, self.settings['connections'])
+        return self
+
+    async def new_session(self):
+        """Launch a browser with the configured options"""
+        # Count sessions still starting too, or concurrent calls would all pass the check
+        if len(self.sessions) + self._starting >= self.settings['max_sessions']:
+            raise Exception(f"Async session limit reached ({self.settings['max_sessions']}); "
+                            "raise async_sessions.max_sessions in config.json")
+        self._starting += 1
+        try:
+            options = self.factory.get_options(self.browser)
+            if self._browser_path:
+                options.binary_location = self._browser_path
+            capabilities = options.to_capabilities()
+            # BiDi dialog events belong to the synchronous layer
+            capabilities.pop('webSocketUrl', None)
+            driver = await AsyncWebDriver.start(self.client, capabilities)
+            self.sessions.append(driver)
+        finally:
+            self._starting -= 1
+        await driver.set_timeouts(pageLoad=int(self.factory.config.get('page_load_timeout', 30) * 1000),
+                                  script=int(self.factory.config.get('script_timeout', 30) * 1000))
+        return driver
+
+    async def new_sessions(self, count):
+        """Launch count browsers concurrently"""
+        return list(await asyncio.gather(*(self.new_session() for _ in range(count))))
+
+    async def stop(self):
+        """Quit every session and stop the driver executable if this service launched it"""
+        await asyncio.gather(*(driver.quit() for driver in self.sessions), return_exceptions=True)
+        self.sessions.clear()
+        if self.client is not None:
+            await self.client.close()
+        if self._service is not None:
+            await asyncio.to_thread(self._service.stop)
+            self._service = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+
+def _check(status, response):
+    """Return a response's value or raise the matching selenium exception"""
+    if status >= 400 or (isinstance(response, dict) and isinstance(response.get("value"), dict)
+                         and "error" in response["value"]):
+        _errors.check_response({"status": status, "value": json.dumps(response)})
+        raise WebDriverException(f"HTTP {status}: {response}")
+    return response.get("value") if isinstance(response, dict) else response
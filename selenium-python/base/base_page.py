@@ -7,16 +7,35 @@ from selenium.webdriver.support import expected_conditions as ec
 from selenium.common.exceptions import NoAlertPresentException
 from selenium.webdriver.support import expected_conditions as expected_conditions
 from selenium.common.exceptions import UnexpectedAlertPresentException
+from selenium.common.exceptions import StaleElementReferenceException
+from base.wait_policy import WaitPolicy
+from base.dialogs import DialogWatcher
+from base.scripts import load_script
+from base.element_cache import ElementCache
+from base.readiness import NetworkReadiness
+from base import snapshots, step_retry
+from locators.registry import compile_locator
+from utils.screenshots import get_pipeline
 
 class BasePage:
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Page-object steps are the unit StepRetry re-runs on transient failures
+        step_retry.wrap_steps(cls)
+
     def __init__(self, driver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 10)
+        self.waits = WaitPolicy.for_driver(driver)
+        self.dialogs = DialogWatcher.for_driver(driver)
+        self.elements = ElementCache.for_driver(driver)
+        self.network = NetworkReadiness.for_driver(driver)
+        self.wait = WebDriverWait(driver, self.waits.timeout)
         self.actions = ActionChains(driver)
 
     def open(self, url):
         """Open the specified URL"""
         with allure.step(f"Opening URL: {url}"):
+            self.page_changed()
             self.driver.get(url)
 
     def get_title(self):
@@ -27,93 +46,211 @@ class BasePage:
         """Get the current URL"""
         return self.driver.current_url
 
-    def find_element(self, locator):
-        """Find element with explicit wait"""
+    def page_changed(self):
+        """Start a new page generation: drop cached elements"""
+        self.elements.invalidate()
+
+    def find_element(self, locator, timeout=None):
+        """Find element, waiting until it is present; repeat lookups in one page state hit the cache"""
+        compiled = compile_locator(locator)
+        element = self.elements.get(compiled)
+        if element is not None:
+            return element
         try:
-            return self.wait.until(EC.presence_of_element_located(locator))
+            element = self.waits.present(compiled, timeout)
         except UnexpectedAlertPresentException:
             # Dismiss unexpected alerts and retry once
             self.handle_any_alert()
-            return self.wait.until(EC.presence_of_element_located(locator))
+            element = self.waits.present(compiled, timeout)
         except TimeoutException:
             raise NoSuchElementException(f"Element not found: {locator}")
+        self.elements.put(compiled, element)
+        return element
 
-    def find_elements(self, locator):
-        """Find multiple elements with explicit wait"""
+    def _use_element(self, locator, action, timeout=None):
+        """Run action(element), re-finding the element once if the DOM replaced it"""
         try:
-            return self.wait.until(EC.presence_of_all_elements_located(locator))
+            return action(self.find_element(locator, timeout))
+        except StaleElementReferenceException:
+            self.page_changed()
+            return action(self.find_element(locator, timeout))
+
+    def find_elements(self, locator, timeout=None, expect_empty=False):
+        """Find multiple elements; no match is a valid answer.
+
+        Current matches are returned at once. When nothing matches yet, the
+        page's fetch/XHR requests are given up to timeout to settle and the
+        matches negative_wait to appear, so an empty result never costs the
+        full explicit wait. With expect_empty=True nothing is waited for.
+        """
+        try:
+            return self._current_or_settled(locator, timeout, expect_empty)
         except UnexpectedAlertPresentException:
             self.handle_any_alert()
-            return self.wait.until(EC.presence_of_all_elements_located(locator))
+            return self._current_or_settled(locator, timeout, expect_empty)
+
+    def _current_or_settled(self, locator, timeout, expect_empty):
+        matches = self.waits.current(locator)
+        if matches or expect_empty:
+            return matches
+        self.wait_for_network_idle(timeout=timeout)
+        try:
+            return self.waits.all_present(locator, self.waits.negative_timeout)
         except TimeoutException:
             return []
 
-    def click_element(self, locator):
+    def click_element(self, locator, timeout=None):
         """Click element with explicit wait"""
         with allure.step(f"Clicking element: {locator}"):
             try:
-                element = self.wait.until(EC.element_to_be_clickable(locator))
+                element = self.waits.clickable(locator, timeout)
                 element.click()
             except UnexpectedAlertPresentException:
                 self.handle_any_alert()
-                element = self.wait.until(EC.element_to_be_clickable(locator))
+                element = self.waits.clickable(locator, timeout)
                 element.click()
+            # A click may navigate or re-render, so cached handles are no longer trusted
+            self.page_changed()
 
-    def send_keys_to_element(self, locator, text):
+    def send_keys_to_element(self, locator, text, timeout=None):
         """Send keys to element with explicit wait"""
         with allure.step(f"Sending keys '{text}' to element: {locator}"):
-            element = self.wait.until(EC.presence_of_element_located(locator))
-            element.clear()
-            element.send_keys(text)
+            def _type(element):
+                element.clear()
+                element.send_keys(text)
+            self._use_element(locator, _type, timeout)
 
-    def get_element_text(self, locator):
+    def get_element_text(self, locator, timeout=None):
         """Get text from element"""
-        element = self.find_element(locator)
-        return element.text
+        return self._use_element(locator, lambda element: element.text, timeout)
 
-    def is_element_displayed(self, locator):
-        """Check if element is displayed"""
+    def extract_rows(self, row_locator, fields, timeout=None):
+        """Read structured data from every element matching row_locator in one script call.
+
+        fields maps each output key to (selector, source[, pattern]): a CSS
+        selector relative to the row (None for the row itself), what to read
+        ("text", "html", "element", "href", "src" or an attribute name) and an
+        optional regex whose first group becomes the value. Waits for rows only
+        when none are present yet.
+        """
+        row_locator = compile_locator(row_locator)
+        spec = {name: list(field) + [None] * (3 - len(field)) for name, field in fields.items()}
+        script = load_script('extract_rows')
+        try:
+            rows = self.driver.execute_script(script, row_locator[0], row_locator[1], spec)
+        except UnexpectedAlertPresentException:
+            self.handle_any_alert()
+            rows = self.driver.execute_script(script, row_locator[0], row_locator[1], spec)
+        if rows or not self.find_elements(row_locator, timeout):
+            return rows
+        return self.driver.execute_script(script, row_locator[0], row_locator[1], spec)
+
+    def is_element_displayed(self, locator, timeout=None):
+        """Check if element is displayed; an absent element costs negative_wait once the page has settled"""
+        compiled = compile_locator(locator)
+        if self.elements.get(compiled) is None:
+            matches = self.find_elements(compiled, timeout)
+            if not matches:
+                return False
+            self.elements.put(compiled, matches[0])
         try:
-            element = self.find_element(locator)
-            return element.is_displayed()
+            return self._use_element(compiled, lambda element: element.is_displayed(), timeout)
         except NoSuchElementException:
             return False
 
-    def wait_for_element_visible(self, locator, timeout=10):
+    def is_element_present(self, locator, timeout=None):
+        """Check if element is in the DOM, waiting for it to appear"""
+        try:
+            self.find_element(locator, timeout)
+            return True
+        except NoSuchElementException:
+            return False
+
+    def is_element_absent(self, locator, timeout=None):
+        """Check that element is not in the DOM; returns at once when it is already gone"""
+        try:
+            return self.waits.absent(locator, timeout)
+        except UnexpectedAlertPresentException:
+            self.handle_any_alert()
+            return self.waits.absent(locator, timeout)
+
+    def wait_for_element_visible(self, locator, timeout=None):
         """Wait for element to be visible"""
         try:
             try:
-                WebDriverWait(self.driver, timeout).until(EC.visibility_of_element_located(locator))
+                self.waits.visible(locator, timeout)
             except UnexpectedAlertPresentException:
                 self.handle_any_alert()
-                WebDriverWait(self.driver, timeout).until(EC.visibility_of_element_located(locator))
+                self.waits.visible(locator, timeout)
             return True
         except TimeoutException:
             return False
 
-    def wait_for_alert_and_accept(self, timeout=5):
-        """Wait for a JavaScript alert and accept it if present"""
+    def wait_for_dom_change(self, locator, condition, timeout=None):
+        """Wait for a DOM condition on locator's matches without polling; see WaitPolicy.dom_change.
+
+        Returns {"met", "count", "text"}, e.g. ("text_matches", r"^\\d+$") for
+        a total that becomes numeric or ("count_below", n) after a delete.
+        """
         try:
-            end_time = __import__("time").time() + timeout
-            handled = False
-            while __import__("time").time() < end_time:
-                try:
-                    WebDriverWait(self.driver, 1).until(EC.alert_is_present())
-                    alert = self.driver.switch_to.alert
-                    alert.accept()
-                    handled = True
-                    break
-                except Exception:
-                    pass
-            if handled:
-                self.wait_until_no_alert(timeout=3)
-                return True
-            return False
+            return self.waits.dom_change(locator, condition, timeout)
+        except UnexpectedAlertPresentException:
+            self.handle_any_alert()
+            return self.waits.dom_change(locator, condition, timeout)
+
+    def wait_for_network_idle(self, quiet_ms=None, timeout=None):
+        """Wait until the page has loaded and sent no fetch/XHR for quiet_ms; False on timeout"""
+        try:
+            return self.network.idle(quiet_ms, timeout)["met"]
+        except UnexpectedAlertPresentException:
+            self.handle_any_alert()
+            return self.network.idle(quiet_ms, timeout)["met"]
+
+    def wait_for_request(self, url_pattern, timeout=None, after=None):
+        """Wait for a fetch/XHR whose URL matches url_pattern to finish and return {url, status}, or None.
+
+        Requests that finished earlier in this document count unless `after`
+        is a `self.network.mark()` taken before the triggering action.
+        """
+        try:
+            return self.network.request(url_pattern, timeout, after)["request"]
+        except UnexpectedAlertPresentException:
+            self.handle_any_alert()
+            return self.network.request(url_pattern, timeout, after)["request"]
+
+    def wait_for_alert_and_accept(self, timeout=5, after=None):
+        """Wait for a JavaScript alert and accept it if present.
+
+        With dialog events the call returns the moment the dialog opens; pass
+        `after=self.dialogs.mark()` taken before the triggering action to ignore
+        dialogs that were already reported.
+        """
+        if self.dialogs.supported:
+            dialog = self.dialogs.next_dialog(timeout, after=after)
+            if dialog is None:
+                return False
+            self.dialogs.accept(dialog)
+            self.dialogs.wait_until_closed(timeout=3)
+            return True
+        try:
+            self.waits.until(EC.alert_is_present(), timeout)
+            self.driver.switch_to.alert.accept()
         except Exception:
             return False
+        self.wait_until_no_alert(timeout=3)
+        return True
 
     def handle_any_alert(self) -> bool:
         """Accept or dismiss any open alert if present."""
+        if self.dialogs.supported:
+            # Known from dialog events, so the common no-alert case costs no command
+            dialog = self.dialogs.open_dialog()
+            if dialog is None:
+                return False
+            if not self.dialogs.accept(dialog):
+                self.dialogs.dismiss(dialog)
+            self.dialogs.wait_until_closed(timeout=2)
+            return True
         try:
             alert = self.driver.switch_to.alert
             try:
@@ -130,6 +267,8 @@ class BasePage:
 
     def wait_until_no_alert(self, timeout: int = 3) -> bool:
         """Wait until there is no alert present."""
+        if self.dialogs.supported:
+            return self.dialogs.wait_until_closed(timeout)
         import time
         end = time.time() + timeout
         while time.time() < end:
@@ -143,31 +282,65 @@ class BasePage:
 
     def scroll_to_element(self, locator):
         """Scroll to element"""
-        element = self.find_element(locator)
-        self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
+        self._use_element(locator, lambda element: self.driver.execute_script(
+            "arguments[0].scrollIntoView(true);", element))
 
     def hover_over_element(self, locator):
         """Hover over element"""
-        element = self.find_element(locator)
-        self.actions.move_to_element(element).perform()
+        self._use_element(locator, lambda element: self.actions.move_to_element(element).perform())
 
     def take_screenshot(self, name="screenshot"):
-        """Take screenshot for debugging"""
-        self.driver.save_screenshot(f"reports/{name}.png")
+        """Take screenshot for debugging; storing it happens in the background"""
+        return get_pipeline().capture(self.driver, name)
+
+    def capture_snapshot(self, name, data=None):
+        """Capture URL, cookies, storage and open windows as a snapshot this session can restore"""
+        with allure.step(f"Capture snapshot: {name}"):
+            snapshot = snapshots.PageSnapshot.capture(self.driver, name, data)
+            snapshots.save_snapshot(snapshot)
+            return snapshot
+
+    def restore_snapshot(self, name):
+        """Restore a captured snapshot into this (freshly leased) session; False if there is none"""
+        snapshot = snapshots.get_snapshot(name)
+        if snapshot is None:
+            return False
+        with allure.step(f"Restore snapshot: {name}"):
+            self.page_changed()
+            snapshot.restore(self.driver)
+            self._checkpoint(snapshot)
+        return True
+
+    def start_from_snapshot(self, name, setup):
+        """Start from snapshot name, running setup() and capturing the result the first time.
+
+        Returns what setup returned when the snapshot was captured.
+        """
+        if not self.restore_snapshot(name):
+            data = setup()
+            self._checkpoint(self.capture_snapshot(name, data))
+        return snapshots.get_snapshot(name).data
+
+    def _checkpoint(self, snapshot):
+        # Step retries that restore state rebuild the snapshot instead of giving up on a dirty session
+        step_retry.StepRetry.for_driver(self.driver).checkpoint(snapshot.restore, snapshot.url)
 
     def refresh_page(self):
         """Refresh the current page"""
+        self.page_changed()
         self.driver.refresh()
 
     def go_back(self):
         """Go back to previous page"""
+        self.page_changed()
         self.driver.back()
 
     def go_forward(self):
         """Go forward to next page"""
+        self.page_changed()
         self.driver.forward()
 
-    def wait_for_url_contains(self, fragment: str, timeout: int = 10) -> bool:
+    def wait_for_url_contains(self, fragment: str, timeout: int = None) -> bool:
         """Wait until current URL contains the given fragment"""
         try:
             def _cond(driver):
@@ -177,17 +350,21 @@ class BasePage:
                     self.handle_any_alert()
                     return False
                 return fragment in current
-            WebDriverWait(self.driver, timeout).until(_cond)
+            self.waits.until(_cond, timeout)
             return True
         except TimeoutException:
             return False
 
     def switch_to_latest_window(self, timeout: int = 5) -> None:
         """Switch focus to the most recently opened browser window/tab."""
+        if getattr(self.driver, '_pinned_window', None) is not None:
+            # A TabScheduler owns window focus; the latest tab belongs to another check
+            return
         try:
-            WebDriverWait(self.driver, timeout).until(lambda d: len(d.window_handles) > 0)
+            self.waits.until(lambda d: len(d.window_handles) > 0, timeout)
             latest = self.driver.window_handles[-1]
             self.driver.switch_to.window(latest)
+            self.page_changed()
         except Exception:
             # best-effort; keep current window if switching fails
             pass
@@ -195,12 +372,13 @@ class BasePage:
     def wait_for_new_window_and_switch(self, original_handles: list[str], timeout: int = 10) -> bool:
         """Wait for a new window to open compared to original_handles and switch to it."""
         try:
-            WebDriverWait(self.driver, timeout).until(
-                lambda d: len([h for h in d.window_handles if h not in original_handles]) > 0
+            self.waits.until(
+                lambda d: len([h for h in d.window_handles if h not in original_handles]) > 0, timeout
             )
             new_handles = [h for h in self.driver.window_handles if h not in original_handles]
             if new_handles:
                 self.driver.switch_to.window(new_handles[-1])
+                self.page_changed()
                 return True
             return False
         except TimeoutException:
@@ -0,0 +1,157 @@
+import itertools
+import threading
+import time
+from collections import deque
+from utils.driver_factory import DriverFactory
+
+
+class Dialog:
+    """A JavaScript alert/confirm/prompt reported by the browser"""
+
+    def __init__(self, seq, context, message, type):
+        self.seq = seq
+        self.context = context
+        self.message = message
+        self.type = type
+        self.handled = False
+        self.accepted = None
+
+    def __repr__(self):
+        return f"Dialog({self.type!r}, {self.message!r}, handled={self.handled})"
+
+
+class DialogWatcher:
+    """Event-driven JavaScript dialog tracking for one WebDriver session.
+
+    Subscribes to the WebDriver BiDi ``browsingContext.userPromptOpened`` and
+    ``userPromptClosed`` events, so the framework knows whether a dialog is
+    open without sending a command. With the ``accept`` or ``dismiss`` policy
+    dialogs are answered the moment they open; with ``manual`` they stay open
+    for the caller. ``next_dialog`` blocks until the next dialog appears.
+
+    When the session was created without BiDi, ``supported`` is False and
+    ``BasePage`` falls back to polling ``switch_to.alert``.
+    """
+
+    POLICIES = ("accept", "dismiss", "manual")
+
+    def __init__(self, driver, policy="accept", history=50):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Dialog policy must be one of {self.POLICIES}, got {policy!r}")
+        self.driver = driver
+        self.policy = policy
+        self.supported = False
+        self._seq = itertools.count(1)
+        self._last_seq = 0
+        self._events = deque(maxlen=history)
+        self._open = {}
+        self._condition = threading.Condition()
+        self._subscribe()
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Get the watcher shared by every page object using this driver"""
+        watcher = getattr(driver, '_dialog_watcher', None)
+        if watcher is None:
+            settings = DriverFactory().get_dialog_config()
+            watcher = cls(driver, policy=settings['policy'])
+            driver._dialog_watcher = watcher
+        return watcher
+
+    def _subscribe(self):
+        caps = getattr(self.driver, 'caps', None) or {}
+        if not caps.get('webSocketUrl'):
+            return
+        try:
+            self.driver.browsing_context.add_event_handler("user_prompt_opened", self._on_opened)
+            self.driver.browsing_context.add_event_handler("user_prompt_closed", self._on_closed)
+            self.supported = True
+        except Exception:
+            self.supported = False
+
+    @staticmethod
+    def _field(event, name):
+        if isinstance(event, dict):
+            return event.get(name)
+        return getattr(event, name, None)
+
+    def _on_opened(self, event):
+        with self._condition:
+            seq = next(self._seq)
+            self._last_seq = seq
+            dialog = Dialog(seq, self._field(event, 'context'), self._field(event, 'message'),
+                            self._field(event, 'type'))
+            self._open[dialog.context] = dialog
+            self._events.append(dialog)
+            self._condition.notify_all()
+        if self.policy != "manual":
+            self._handle(dialog, accept=self.policy == "accept")
+
+    def _on_closed(self, event):
+        with self._condition:
+            dialog = self._open.pop(self._field(event, 'context'), None)
+            if dialog is not None:
+                dialog.handled = True
+                if dialog.accepted is None:
+                    dialog.accepted = self._field(event, 'accepted')
+            self._condition.notify_all()
+
+    def _handle(self, dialog, accept):
+        try:
+            self.driver.browsing_context.handle_user_prompt(context=dialog.context, accept=accept)
+            dialog.accepted = accept
+            return True
+        except Exception:
+            # Already closed by the page or another handler
+            return False
+
+    def mark(self):
+        """Sequence number of the latest dialog; pass to next_dialog to ignore older ones"""
+        with self._condition:
+            return self._last_seq
+
+    def next_dialog(self, timeout=None, after=None):
+        """Wait for and consume the next dialog (newer than `after`), or None on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                while self._events and after is not None and self._events[0].seq <= after:
+                    self._events.popleft()
+                if self._events:
+                    return self._events.popleft()
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+
+    def open_dialog(self):
+        """The dialog currently open, if any; costs no WebDriver command"""
+        with self._condition:
+            return next(iter(self._open.values()), None)
+
+    def accept(self, dialog=None):
+        """Accept the given (or currently open) dialog"""
+        dialog = dialog or self.open_dialog()
+        return dialog is not None and not dialog.handled and self._handle(dialog, accept=True)
+
+    def dismiss(self, dialog=None):
+        """Dismiss the given (or currently open) dialog"""
+        dialog = dialog or self.open_dialog()
+        return dialog is not None and not dialog.handled and self._handle(dialog, accept=False)
+
+    def wait_until_closed(self, timeout=3):
+        """Wait until no dialog is open"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._open:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def clear(self):
+        """Forget recorded dialogs, e.g. when a pooled session is handed to the next test"""
+        with self._condition:
+            self._events.clear()
+            self._open.clear()
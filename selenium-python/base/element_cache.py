@@ -0,0 +1,48 @@
+import threading
+
+
+class ElementCache:
+    """WebElement handles resolved within the current page generation.
+
+    A generation is one page state of one window. ``BasePage`` starts a new
+    generation whenever it navigates, clicks, or switches windows, and when a
+    cached handle turns out to be stale because the DOM was replaced. Entries
+    from older generations are never returned.
+    """
+
+    def __init__(self):
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._elements = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Get the cache shared by every page object using this driver"""
+        cache = getattr(driver, '_element_cache', None)
+        if cache is None:
+            cache = cls()
+            driver._element_cache = cache
+        return cache
+
+    def get(self, locator):
+        """Get a cached element for the current generation, or None"""
+        with self._lock:
+            entry = self._elements.get(locator)
+            if entry is not None and entry[0] == self.generation:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, locator, element):
+        """Cache an element resolved in the current generation"""
+        with self._lock:
+            self._elements[locator] = (self.generation, element)
+
+    def invalidate(self):
+        """Start a new generation, dropping every cached handle"""
+        with self._lock:
+            self.generation += 1
+            self._elements.clear()
@@ -0,0 +1,56 @@
+// Read structured rows from the page in a single round trip.
+// arguments: by, value (a Selenium locator), fields {name: [selector, source, pattern]}
+// selector: CSS relative to the row, or null for the row itself
+// source: "text", "html", "element", "href"/"src" (resolved URLs) or any attribute name
+// pattern: optional regex; the first capture group (or whole match) becomes the value
+var by = arguments[0], value = arguments[1], fields = arguments[2];
+
+function findAll(by, value, root) {
+  root = root || document;
+  switch (by) {
+    case 'css selector': return Array.prototype.slice.call(root.querySelectorAll(value));
+    case 'id': return Array.prototype.slice.call(root.querySelectorAll('#' + CSS.escape(value)));
+    case 'class name': return Array.prototype.slice.call(root.querySelectorAll('.' + CSS.escape(value)));
+    case 'tag name': return Array.prototype.slice.call(root.querySelectorAll(value));
+    case 'name': return Array.prototype.slice.call(root.querySelectorAll('[name="' + value + '"]'));
+    case 'link text':
+    case 'partial link text':
+      return Array.prototype.slice.call(root.querySelectorAll('a')).filter(function (a) {
+        var text = (a.innerText || '').trim();
+        return by === 'link text' ? text === value : text.indexOf(value) >= 0;
+      });
+    case 'xpath':
+      var snapshot = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      var nodes = [];
+      for (var i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+      return nodes;
+  }
+  throw new Error('Unsupported locator strategy: ' + by);
+}
+
+function read(el, source) {
+  if (!el) return null;
+  switch (source) {
+    case 'text': return (el.innerText || el.textContent || '').trim();
+    case 'html': return el.innerHTML;
+    case 'element': return el;
+    case 'href':
+    case 'src': return el[source] || el.getAttribute(source);
+  }
+  return el.getAttribute(source);
+}
+
+return findAll(by, value).map(function (row) {
+  var result = {};
+  Object.keys(fields).forEach(function (name) {
+    var field = fields[name];
+    var el = field[0] ? row.querySelector(field[0]) : row;
+    var data = read(el, field[1]);
+    if (field[2] && typeof data === 'string') {
+      var match = data.match(new RegExp(field[2]));
+      data = match ? (match.length > 1 ? match[1] : match[0]) : null;
+    }
+    result[name] = data;
+  });
+  return result;
+});
@@ -0,0 +1,84 @@
+// Count fetch/XHR requests in flight and remember the ones that finished.
+// Runs at document start when preloaded; injected later it also records requests from
+// Resource Timing, but cannot see the ones already in flight as started.
+(function () {
+  if (window.__networkTracker) return;
+  var tracker = window.__networkTracker = {
+    inflight: 0, seq: 0, changed: performance.now(), done: [], listeners: [],
+    late: document.readyState !== 'loading'
+  };
+
+  function notify() {
+    tracker.listeners.slice().forEach(function (listener) { listener(); });
+  }
+
+  function started() {
+    tracker.inflight++;
+    tracker.changed = performance.now();
+    notify();
+  }
+
+  function record(url, status) {
+    tracker.seq++;
+    tracker.done.push({seq: tracker.seq, url: url, status: status});
+    if (tracker.done.length > 200) tracker.done.shift();
+  }
+
+  function finished(url, status) {
+    // Let the page's own response handlers update the DOM first
+    setTimeout(function () {
+      tracker.inflight = Math.max(tracker.inflight - 1, 0);
+      tracker.changed = performance.now();
+      record(url, status);
+      notify();
+    }, 0);
+  }
+
+  function absolute(url) {
+    try { return new URL(url, location.href).href; } catch (e) { return String(url); }
+  }
+
+  if (window.fetch) {
+    var fetch = window.fetch;
+    window.fetch = function (input) {
+      var url = absolute(input && input.url ? input.url : input);
+      started();
+      return fetch.apply(this, arguments).then(function (response) {
+        // Done once the body has arrived, not when the headers did
+        response.clone().arrayBuffer().then(function () { finished(url, response.status); },
+                                            function () { finished(url, response.status); });
+        return response;
+      }, function (error) {
+        finished(url, 0);
+        throw error;
+      });
+    };
+  }
+
+  var open = XMLHttpRequest.prototype.open, send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.open = function (method, url) {
+    this.__trackedUrl = absolute(url);
+    return open.apply(this, arguments);
+  };
+  XMLHttpRequest.prototype.send = function () {
+    var xhr = this;
+    started();
+    xhr.addEventListener('loadend', function () { finished(xhr.__trackedUrl, xhr.status); });
+    return send.apply(this, arguments);
+  };
+
+  // Requests the patches also saw are recorded twice; waits only look for a match
+  if (tracker.late && window.PerformanceObserver) {
+    var fromTiming = function (entry) {
+      if (entry.initiatorType === 'fetch' || entry.initiatorType === 'xmlhttprequest') {
+        record(entry.name, entry.responseStatus || null);
+      }
+    };
+    performance.getEntriesByType('resource').forEach(fromTiming);
+    new PerformanceObserver(function (list) {
+      list.getEntries().forEach(fromTiming);
+      notify();
+    }).observe({type: 'resource'});
+  }
+  window.addEventListener('load', notify);
+})();
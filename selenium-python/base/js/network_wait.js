@@ -0,0 +1,52 @@
+// Resolve when the network is idle or a matching request has finished; runs after network_tracker.js.
+// arguments: condition ["idle", quiet_ms] or ["request", url_regex, after_seq], timeout_ms, callback
+// "idle": the document has loaded and no fetch/XHR has been in flight for quiet_ms
+// "request": a request whose URL matches url_regex finished after after_seq (0 for any)
+// Calls back with {met, inflight, seq, request} once the condition holds or timeout_ms has passed
+var condition = arguments[0], timeout = arguments[1];
+var done = arguments[arguments.length - 1];
+var tracker = window.__networkTracker;
+var finished = false, quietTimer = null, deadline = null;
+
+function state(met, request) {
+  return {met: met, inflight: tracker.inflight, seq: tracker.seq, request: request || null};
+}
+
+function matching() {
+  var pattern = new RegExp(condition[1]);
+  for (var i = tracker.done.length - 1; i >= 0; i--) {
+    var request = tracker.done[i];
+    if (request.seq > condition[2] && pattern.test(request.url)) return request;
+  }
+  return null;
+}
+
+function finish(result) {
+  if (finished) return;
+  finished = true;
+  clearTimeout(quietTimer);
+  clearTimeout(deadline);
+  var index = tracker.listeners.indexOf(evaluate);
+  if (index >= 0) tracker.listeners.splice(index, 1);
+  done(result);
+}
+
+function evaluate() {
+  if (condition[0] === 'request') {
+    var request = matching();
+    if (request) finish(state(true, request));
+    return;
+  }
+  clearTimeout(quietTimer);
+  if (tracker.inflight > 0 || document.readyState !== 'complete') return;
+  var quiet = performance.now() - tracker.changed;
+  if (quiet >= condition[1]) {
+    finish(state(true));
+  } else {
+    quietTimer = setTimeout(evaluate, condition[1] - quiet);
+  }
+}
+
+tracker.listeners.push(evaluate);
+deadline = setTimeout(function () { finish(state(false)); }, timeout);
+evaluate();
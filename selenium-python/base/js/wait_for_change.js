@@ -0,0 +1,65 @@
+// Resolve the moment the DOM meets a condition, woken by a MutationObserver instead of polling.
+// arguments: by, value (a Selenium locator), condition [kind, arg], timeout_ms, callback
+// kinds: "present", "absent", "count_below" n, "count_at_least" n,
+//        "text_matches" regex (text of the first match)
+// Calls back with {met, count, text} once the condition holds or timeout_ms has passed
+var by = arguments[0], value = arguments[1], condition = arguments[2], timeout = arguments[3];
+var done = arguments[arguments.length - 1];
+
+function findAll(by, value) {
+  switch (by) {
+    case 'css selector': return document.querySelectorAll(value);
+    case 'id': return document.querySelectorAll('#' + CSS.escape(value));
+    case 'class name': return document.querySelectorAll('.' + CSS.escape(value));
+    case 'tag name': return document.querySelectorAll(value);
+    case 'name': return document.querySelectorAll('[name="' + value + '"]');
+    case 'link text':
+    case 'partial link text':
+      return Array.prototype.filter.call(document.querySelectorAll('a'), function (a) {
+        var text = (a.innerText || '').trim();
+        return by === 'link text' ? text === value : text.indexOf(value) >= 0;
+      });
+    case 'xpath':
+      var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      var nodes = [];
+      for (var i = 0; i < snapshot.snapshotLength; i++) nodes.push(snapshot.snapshotItem(i));
+      return nodes;
+  }
+  throw new Error('Unsupported locator strategy: ' + by);
+}
+
+function state() {
+  var nodes = findAll(by, value);
+  var first = nodes.length ? nodes[0] : null;
+  var result = {count: nodes.length, text: first ? (first.innerText || first.textContent || '').trim() : null};
+  switch (condition[0]) {
+    case 'present': result.met = result.count > 0; break;
+    case 'absent': result.met = result.count === 0; break;
+    case 'count_below': result.met = result.count < condition[1]; break;
+    case 'count_at_least': result.met = result.count >= condition[1]; break;
+    case 'text_matches': result.met = result.text !== null && new RegExp(condition[1]).test(result.text); break;
+    default: throw new Error('Unsupported condition: ' + condition[0]);
+  }
+  return result;
+}
+
+var current = state();
+if (current.met) {
+  done(current);
+} else {
+  var finished = false, timer = null;
+  var observer = new MutationObserver(function () {
+    var next = state();
+    if (next.met) finish(next);
+  });
+  var finish = function (result) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done(result);
+  };
+  observer.observe(document.documentElement,
+                   {childList: true, subtree: true, characterData: true, attributes: true});
+  timer = setTimeout(function () { finish(state()); }, timeout);
+}
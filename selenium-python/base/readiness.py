@@ -0,0 +1,63 @@
+from selenium.common.exceptions import JavascriptException
+from base.scripts import load_script
+from base.wait_policy import WaitCancelled, WaitPolicy
+from utils.driver_factory import DriverFactory
+
+
+class NetworkReadiness:
+    """Page readiness from the fetch/XHR requests a page sends, for one WebDriver session.
+
+    A tracker script (``base/js/network_tracker.js``) counts requests in
+    flight and remembers the ones that finished. On Chromium it is
+    registered over CDP to run at document start, so every request of every
+    later navigation is seen; elsewhere, and for the document already open
+    when it is first used, it is injected on demand and picks up finished
+    requests from Resource Timing. Waits run in the page as one async script
+    and return the moment the condition holds.
+    """
+
+    def __init__(self, driver, quiet_ms=300, preload=True):
+        self.driver = driver
+        self.waits = WaitPolicy.for_driver(driver)
+        self.quiet_ms = quiet_ms
+        self.preload = preload
+        self.preload_id = None
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Get the tracker shared by every page object using this driver"""
+        readiness = getattr(driver, '_network_readiness', None)
+        if readiness is None:
+            settings = DriverFactory().get_readiness_config()
+            readiness = cls(driver, quiet_ms=settings['quiet_ms'], preload=settings['preload'])
+            driver._network_readiness = readiness
+        return readiness
+
+    def install(self):
+        """Run the tracker at the start of every later document in this window (Chromium only)"""
+        if self.preload_id is None and self.preload and hasattr(self.driver, 'execute_cdp_cmd'):
+            self.preload_id = self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument',
+                                                          {"source": load_script('network_tracker')})
+        return self.preload_id is not None
+
+    def mark(self):
+        """Sequence number of the last finished request; pass it as after= to wait for a later one"""
+        return self.driver.execute_script(load_script('network_tracker') + "return window.__networkTracker.seq;")
+
+    def idle(self, quiet_ms=None, timeout=None):
+        """Wait until the document has loaded and no request has been in flight for quiet_ms"""
+        return self._wait(["idle", self.quiet_ms if quiet_ms is None else quiet_ms], timeout)
+
+    def request(self, url_pattern, timeout=None, after=None):
+        """Wait until a request whose URL matches url_pattern (a regex) has finished after mark after"""
+        return self._wait(["request", url_pattern, after or 0], timeout)
+
+    def _wait(self, condition, timeout):
+        self.install()
+        timeout = self.waits.timeout if timeout is None else timeout
+        try:
+            return self.driver.execute_async_script(load_script('network_tracker') + load_script('network_wait'),
+                                                    condition, int(timeout * 1000))
+        except JavascriptException as e:
+            # Navigation unloads the document the wait was watching
+            raise WaitCancelled(f"Wait cancelled: {e.msg}")
@@ -0,0 +1,12 @@
+import os
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'js')
+_cache = {}
+
+
+def load_script(name):
+    """Load a browser-side script from base/js once and cache its source"""
+    if name not in _cache:
+        with open(os.path.join(SCRIPTS_DIR, f"{name}.js")) as f:
+            _cache[name] = f.read()
+    return _cache[name]
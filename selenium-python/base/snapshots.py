@@ -0,0 +1,179 @@
+import json
+import threading
+from urllib.parse import urlsplit
+
+# Read one window's storage in a single round trip
+_READ_STORAGE = """
+const read = (storage) => {
+    const items = {};
+    for (let i = 0; i < storage.length; i++) {
+        const key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+};
+let local = {}, session = {};
+try { local = read(window.localStorage); session = read(window.sessionStorage); } catch (e) {}
+return {url: window.location.href, local: local, session: session};
+"""
+# Fill storage for one origin; runs before the page's own scripts when preloaded
+_WRITE_STORAGE = """
+(function (origin, local, session) {
+    if (window.location.origin !== origin) { return; }
+    try {
+        for (const [key, value] of Object.entries(local)) { window.localStorage.setItem(key, value); }
+        for (const [key, value] of Object.entries(session)) { window.sessionStorage.setItem(key, value); }
+    } catch (e) {}
+})(%s, %s, %s);
+"""
+# Keys CDP Network.setCookies accepts from what Network.getAllCookies returns
+_CDP_COOKIE_KEYS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+_WEBDRIVER_COOKIE_KEYS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expiry")
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def _origin(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _cdp_cookie(cookie):
+    """A cookie in the form CDP Network.setCookies takes"""
+    cookie = dict(cookie)
+    if "expiry" in cookie:
+        cookie["expires"] = cookie.pop("expiry")
+    if cookie.get("session") or cookie.get("expires", -1) < 0:
+        cookie.pop("expires", None)
+    return {key: cookie[key] for key in _CDP_COOKIE_KEYS if key in cookie}
+
+
+def _webdriver_cookie(cookie):
+    """A cookie in the form WebDriver add_cookie takes"""
+    cookie = dict(cookie)
+    if "expires" in cookie:
+        expires = cookie.pop("expires")
+        if not cookie.get("session") and expires >= 0:
+            cookie["expiry"] = int(expires)
+    return {key: cookie[key] for key in _WEBDRIVER_COOKIE_KEYS if key in cookie}
+
+
+class PageSnapshot:
+    """Browser state after an expensive setup: cookies, every window's URL and storage.
+
+    ``capture`` reads it with one script per window (plus one cookie
+    command); ``restore`` puts it into any session. On Chromium the cookies
+    are set and the storage is preloaded with CDP, so each window costs a
+    single navigation; elsewhere each window is opened, filled in and
+    reloaded. Cookies the session already has (e.g. a seeded shopper
+    cookie) are kept. Navigation history is not part of a snapshot.
+    """
+
+    def __init__(self, name, cookies, windows, current, data=None):
+        self.name = name
+        self.cookies = cookies
+        self.windows = windows
+        self.current = current
+        self.data = data
+        self.restores = 0
+
+    @property
+    def url(self):
+        return self.windows[self.current]["url"]
+
+    @classmethod
+    def capture(cls, driver, name, data=None):
+        """Read the session's state into a snapshot"""
+        original = driver.current_window_handle
+        handles = driver.window_handles
+        windows = []
+        for handle in handles:
+            if handle != driver.current_window_handle:
+                driver.switch_to.window(handle)
+            windows.append(driver.execute_script(_READ_STORAGE))
+        if driver.current_window_handle != original:
+            driver.switch_to.window(original)
+        if hasattr(driver, 'execute_cdp_cmd'):
+            # Every domain's cookies, not only the current page's
+            cookies = driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']
+        else:
+            cookies = driver.get_cookies()
+        return cls(name, cookies, windows, handles.index(original), data)
+
+    def restore(self, driver):
+        """Open this snapshot's windows in driver, which should be blank (e.g. freshly reset)"""
+        cdp = hasattr(driver, 'execute_cdp_cmd')
+        if cdp and self.cookies:
+            existing = driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']
+            present = {(cookie["name"], cookie["domain"]) for cookie in existing}
+            cookies = [_cdp_cookie(cookie) for cookie in self.cookies
+                       if (cookie["name"], cookie.get("domain")) not in present]
+            if cookies:
+                driver.execute_cdp_cmd('Network.setCookies', {"cookies": cookies})
+        handles = []
+        for index, window in enumerate(self.windows):
+            if index:
+                driver.switch_to.new_window('tab')
+            handles.append(driver.current_window_handle)
+            if cdp:
+                self._open_preloaded(driver, window)
+            else:
+                self._open_and_fill(driver, window)
+        driver.switch_to.window(handles[self.current])
+        self.restores += 1
+
+    def _open_preloaded(self, driver, window):
+        script = _storage_script(window)
+        if script is None:
+            driver.get(window["url"])
+            return
+        identifier = driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {"source": script})
+        try:
+            driver.get(window["url"])
+        finally:
+            # Later navigations must see the page's own storage changes, not the snapshot again
+            driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', identifier)
+
+    def _open_and_fill(self, driver, window):
+        driver.get(window["url"])
+        host = urlsplit(window["url"]).hostname or ""
+        present = {cookie["name"] for cookie in driver.get_cookies()}
+        filled = False
+        for cookie in self.cookies:
+            domain = cookie.get("domain", "").lstrip(".")
+            if cookie["name"] not in present and domain and (host == domain or host.endswith("." + domain)):
+                driver.add_cookie(_webdriver_cookie(cookie))
+                filled = True
+        script = _storage_script(window)
+        if script is not None:
+            driver.execute_script(script)
+            filled = True
+        if filled:
+            # The page has to load again to render with the restored state
+            driver.refresh()
+
+
+def _storage_script(window):
+    """Script that writes a window's captured storage, or None if there is none"""
+    if not window["local"] and not window["session"]:
+        return None
+    return _WRITE_STORAGE % (json.dumps(_origin(window["url"])), json.dumps(window["local"]),
+                             json.dumps(window["session"]))
+
+
+def get_snapshot(name):
+    """Get a snapshot captured earlier in this session (this worker), or None"""
+    return _snapshots.get(name)
+
+
+def save_snapshot(snapshot):
+    """Keep a snapshot for the rest of the session"""
+    with _snapshots_lock:
+        _snapshots[snapshot.name] = snapshot
+
+
+def clear_snapshots():
+    """Forget every snapshot, e.g. after the site's data changed"""
+    with _snapshots_lock:
+        _snapshots.clear()
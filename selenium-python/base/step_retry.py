@@ -0,0 +1,204 @@
+import functools
+import threading
+import allure
+import urllib3
+from selenium.common import exceptions
+from selenium.common.exceptions import InvalidSessionIdException, UnexpectedAlertPresentException
+from utils import command_events
+from utils.driver_factory import DriverFactory
+
+# Commands that change page or server state; a step that sent one cannot simply run again
+MUTATING = {"clickElement", "sendKeysToElement", "clearElement", "goBack", "goForward", "refresh", "actions"}
+# The browser or its driver is gone; only a new session helps
+SESSION_LOST = (InvalidSessionIdException, ConnectionError, urllib3.exceptions.HTTPError)
+# Per thread: [page class, method, uuid of the allure step it opened] for each page-object step running
+_owners = threading.local()
+
+
+def page_step(title):
+    """Decorate a page-object method as an Allure step that StepRetry may re-run"""
+    def decorate(method):
+        step = allure.step(title)(method)
+        step.__page_step__ = True
+        return step
+    return decorate
+
+
+def is_step(function):
+    """Whether function is a method decorated with page_step"""
+    return getattr(function, '__page_step__', False)
+
+
+def wrap_steps(cls):
+    """Make every page_step method defined on a page class retryable"""
+    for name, attribute in list(vars(cls).items()):
+        if is_step(attribute):
+            setattr(cls, name, retryable(attribute))
+
+
+def retryable(step):
+    """Run a page-object step through the retry engine of the page's driver"""
+    @functools.wraps(step)
+    def owned_step(page, *args, **kwargs):
+        stack = _owner_stack()
+        stack.append([type(page).__name__, step.__name__, None])
+        try:
+            return step(page, *args, **kwargs)
+        finally:
+            stack.pop()
+
+    @functools.wraps(step)
+    def retry_step(page, *args, **kwargs):
+        return StepRetry.for_page(page).run(page, owned_step, args, kwargs)
+    return retry_step
+
+
+def _owner_stack():
+    stack = getattr(_owners, 'stack', None)
+    if stack is None:
+        stack = _owners.stack = []
+    return stack
+
+
+def step_owner(uuid):
+    """Page class and method name of the page-object step that opened allure step uuid, or (None, None)"""
+    stack = _owner_stack()
+    if not stack:
+        return None, None
+    owner = stack[-1]
+    if owner[2] is None:
+        # The first step started inside a page-object call is the one its decorator opened
+        owner[2] = uuid
+    return (owner[0], owner[1]) if owner[2] == uuid else (None, None)
+
+
+class StepRetry:
+    """Re-run a page-object step that failed transiently instead of the whole test.
+
+    Only the outermost page-object step (a ``page_step`` method of a
+    ``BasePage`` subclass) is retried, up to ``test_config.retry_failed_tests``
+    times. A step that failed before sending any state-changing command runs
+    again in place. One that already clicked or typed is retried only after
+    restoring the checkpoint: the test's state from before its first
+    state-changing command. Restoring resets the browser, re-applies
+    registered restorers (API-seeded cart, session cookie) and reloads the
+    last URL opened. A lost session is replaced with a fresh pooled driver
+    and restored the same way. Anything not restorable is raised as before.
+    """
+
+    def __init__(self, driver):
+        settings = DriverFactory().get_retry_config()
+        self.driver = driver
+        self.default_retries = settings['retries']
+        self.retries = self.default_retries
+        self.transient = tuple(getattr(exceptions, name) for name in settings['transient'])
+        self.replace = None
+        self.reset = None
+        self.restorers = []
+        self.events = []
+        self.url = None
+        self.dirty = False
+        self._mutated = False
+        self._depth = 0
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Get the retry engine attached to this driver"""
+        engine = getattr(driver, '_step_retry', None)
+        if engine is None:
+            engine = cls(driver)
+            driver._step_retry = engine
+        return engine
+
+    @classmethod
+    def for_page(cls, page):
+        """Get the page's engine, moving the page to a replacement driver if its session was lost"""
+        engine = cls.for_driver(page.driver)
+        if engine.driver is not page.driver:
+            page.__init__(engine.driver)
+        return engine
+
+    def begin(self, retries=None, replace=None, reset=None):
+        """Start a test: forget the previous checkpoint and set how to replace and reset the driver"""
+        self.retries = self.default_retries if retries is None else retries
+        self.replace = replace
+        self.reset = reset
+        self.restorers = []
+        self.events = []
+        self.url = None
+        self.dirty = False
+
+    def on_restore(self, restorer):
+        """Call restorer(driver) whenever the checkpoint is restored, e.g. to re-seed state"""
+        self.restorers.append(restorer)
+
+    def checkpoint(self, restorer, url):
+        """Make the current state the checkpoint, rebuilt after a reset by restorer(driver) and loading url"""
+        self.restorers.append(restorer)
+        self.url = url
+        self.dirty = False
+
+    def run(self, page, step, args, kwargs):
+        """Run step(page, ...), retrying it while failures are transient and restorable"""
+        if self._depth or not self.retries:
+            return step(page, *args, **kwargs)
+        restorable = not self.dirty
+        attempt = 0
+        while True:
+            self._depth += 1
+            self._mutated = False
+            try:
+                return step(page, *args, **kwargs)
+            except Exception as error:
+                attempt += 1
+                action = self._recovery(error, restorable) if attempt <= self.retries else None
+                if action is None:
+                    raise
+                failure = error
+                self.events.append({"step": f"{type(page).__name__}.{step.__name__}",
+                                    "error": type(error).__name__, "action": action, "attempt": attempt})
+            finally:
+                self._depth -= 1
+            self._recover(page, action, failure)
+
+    def _recovery(self, error, restorable):
+        """How to recover from error: "retry", "restore", "new_driver", or None to give up"""
+        if isinstance(error, SESSION_LOST):
+            return "new_driver" if restorable and self.replace else None
+        if not isinstance(error, self.transient):
+            return None
+        if not self._mutated:
+            return "retry"
+        return "restore" if restorable and self.reset else None
+
+    def _recover(self, page, action, error):
+        if action == "new_driver":
+            lost = self.driver
+            self.driver = self.replace(lost)
+            self.driver._step_retry = self
+            page.__init__(self.driver)
+        if action in ("restore", "new_driver"):
+            if action == "restore":
+                self.reset(self.driver)
+            for restorer in self.restorers:
+                restorer(self.driver)
+            if self.url:
+                self.driver.get(self.url)
+            self.dirty = False
+        elif isinstance(error, UnexpectedAlertPresentException):
+            page.handle_any_alert()
+        page.page_changed()
+
+
+def _on_command(driver, command, params, duration, error):
+    engine = getattr(driver, '_step_retry', None)
+    if engine is None or error is not None:
+        return
+    if command == "get" and not engine.dirty:
+        engine.url = params.get("url")
+    elif command in MUTATING:
+        engine.dirty = True
+        engine._mutated = True
+
+
+command_events.add_listener(_on_command)
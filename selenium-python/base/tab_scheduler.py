@@ -0,0 +1,142 @@
+import time
+from collections import deque
+from selenium.common.exceptions import TimeoutException
+from base.step_retry import MUTATING
+from utils import command_events
+from utils.driver_factory import DriverFactory
+
+# Commands a read-only check must not send: they change page state or move focus off its tab
+FORBIDDEN = MUTATING | {"get", "switchToWindow", "newWindow", "closeWindow"}
+# Start loading a URL without waiting for it; the old document keeps the marker until it is replaced
+_NAVIGATE = "window.__tabSchedulerPending = true; window.location.href = arguments[0];"
+_LOADED = "return !window.__tabSchedulerPending && document.readyState === 'complete';"
+
+
+class ReadOnlyViolation(RuntimeError):
+    """A check run by TabScheduler sent a command that changes state or window focus"""
+
+
+class TabScheduler:
+    """Run independent read-only page-object checks across K tabs of one session.
+
+    ``run`` starts loading up to ``tabs`` URLs at once, one per tab, with a
+    non-blocking navigation, then visits the tabs round-robin: whichever has
+    finished loading gets its check run and its next URL started, so page
+    loads overlap while checks run one at a time on the session. The
+    scheduler owns window focus while it runs: it switches only when the
+    next tab differs from the active one, pins ``BasePage`` window switching
+    to that tab, and rejects checks that navigate, click, type or switch
+    windows: such a command raises ``ReadOnlyViolation`` before it is sent,
+    and the check still fails if it catches the error. The original window
+    is active again when ``run`` returns.
+    """
+
+    def __init__(self, driver, tabs=None, load_timeout=None, poll_interval=None):
+        settings = DriverFactory().get_tab_config()
+        self.driver = command_events.attach(driver)
+        self.tabs = tabs or settings['tabs']
+        self.load_timeout = load_timeout or settings['load_timeout']
+        self.poll_interval = poll_interval or settings['poll_interval']
+        self.handles = []
+        self.home = None
+        self.active = None
+        self.checks = 0
+        self.switches = 0
+        self._checking = None
+        self._violation = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def run(self, page_class, urls, check):
+        """Open every URL in a tab, call check(page) once it has loaded, and return the results in order"""
+        original = self.home = self.active = self.driver.current_window_handle
+        pending = deque(enumerate(urls))
+        results = [None] * len(pending)
+        loading = {}
+        command_events.add_guard(self._guard)
+        try:
+            self._open_tabs(min(self.tabs, len(pending)))
+            for handle in self.handles:
+                if pending:
+                    loading[handle] = self._navigate(handle, *pending.popleft())
+            pages = {handle: page_class(self.driver) for handle in self.handles}
+            while loading:
+                progressed = False
+                for handle in list(loading):
+                    index, url, started = loading[handle]
+                    self._activate(handle)
+                    if not self.driver.execute_script(_LOADED):
+                        if time.monotonic() - started > self.load_timeout:
+                            raise TimeoutException(f"{url} did not load in tab {handle} within {self.load_timeout}s")
+                        continue
+                    progressed = True
+                    results[index] = self._check(pages[handle], handle, check)
+                    del loading[handle]
+                    if pending:
+                        loading[handle] = self._navigate(handle, *pending.popleft())
+                if not progressed:
+                    time.sleep(self.poll_interval)
+        finally:
+            command_events.remove_guard(self._guard)
+            self._activate(original)
+        return results
+
+    def close(self):
+        """Close the scheduler's tabs, leaving the window it started from active"""
+        if not self.handles:
+            return
+        for handle in self.handles:
+            self._activate(handle)
+            self.driver.close()
+        self.handles = []
+        self.driver.switch_to.window(self.home)
+        self.active = self.home
+
+    def stats(self):
+        """Get the number of tabs, checks run and window switches made"""
+        return {"tabs": len(self.handles), "checks": self.checks, "switches": self.switches}
+
+    def _open_tabs(self, count):
+        while len(self.handles) < count:
+            self.driver.switch_to.new_window('tab')
+            self.handles.append(self.driver.current_window_handle)
+            self.active = self.handles[-1]
+            self.switches += 1
+
+    def _activate(self, handle):
+        if handle != self.active:
+            self.driver.switch_to.window(handle)
+            self.active = handle
+            self.switches += 1
+
+    def _navigate(self, handle, index, url):
+        self._activate(handle)
+        self.driver.execute_script(_NAVIGATE, url)
+        return index, url, time.monotonic()
+
+    def _check(self, page, handle, check):
+        page.page_changed()
+        self._checking = handle
+        self._violation = None
+        self.driver._pinned_window = handle
+        try:
+            result = check(page)
+        finally:
+            self._checking = None
+            self.driver._pinned_window = None
+        if self._violation is not None:
+            # The check caught the rejected command; it is still not read-only
+            raise ReadOnlyViolation(f"{getattr(check, '__name__', check)} tried to send {self._violation}; "
+                                    "only read-only checks can share tabs")
+        self.checks += 1
+        return result
+
+    def _guard(self, driver, command, params):
+        if driver is self.driver and self._checking is not None and command in FORBIDDEN:
+            self._violation = self._violation or command
+            raise ReadOnlyViolation(f"Check on tab {self._checking} tried to send {command}; "
+                                    "only read-only checks can share tabs")
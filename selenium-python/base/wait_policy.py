@@ -0,0 +1,140 @@
+import time
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (TimeoutException, NoSuchElementException, StaleElementReferenceException,
+                                        JavascriptException)
+from base.scripts import load_script
+from utils.driver_factory import DriverFactory
+from locators.registry import compile_locator
+
+# Called as listener(policy, duration_s, timed_out) after every wait
+_wait_listeners = []
+
+
+def add_wait_listener(listener):
+    """Observe how long every WaitPolicy wait took"""
+    if listener not in _wait_listeners:
+        _wait_listeners.append(listener)
+
+
+def remove_wait_listener(listener):
+    """Stop observing waits"""
+    if listener in _wait_listeners:
+        _wait_listeners.remove(listener)
+
+
+class WaitCancelled(TimeoutException):
+    """Raised when a pending wait is cancelled because the page navigated away"""
+
+
+class WaitPolicy:
+    """Single owner of element waits for one WebDriver session.
+
+    Implicit waits are switched off so explicit waits never stack on top of
+    them. Positive queries ("expect present") poll up to ``timeout`` and return
+    as soon as the condition holds; negative queries ("expect absent/empty")
+    check once and only wait ``negative_timeout`` for a match to go away.
+    Every call accepts its own timeout. ``dom_change`` waits inside the page on
+    a MutationObserver, so it returns the moment the DOM changes and costs one
+    command however long it takes; it raises ``WaitCancelled`` if the page
+    navigates away meanwhile.
+    """
+
+    def __init__(self, driver, timeout=10, negative_timeout=0.5, poll_frequency=0.1):
+        self.driver = driver
+        self.timeout = timeout
+        self.negative_timeout = negative_timeout
+        self.poll_frequency = poll_frequency
+        driver.implicitly_wait(0)
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Get the policy shared by every page object using this driver"""
+        policy = getattr(driver, '_wait_policy', None)
+        if policy is None:
+            settings = DriverFactory().get_wait_config()
+            policy = cls(driver, timeout=settings['explicit_wait'],
+                         negative_timeout=settings['negative_wait'],
+                         poll_frequency=settings['poll_frequency'])
+            driver._wait_policy = policy
+        return policy
+
+    def until(self, condition, timeout=None, message=""):
+        """Wait until condition(driver) is truthy and return its value"""
+        wait = WebDriverWait(self.driver, self.timeout if timeout is None else timeout,
+                             poll_frequency=self.poll_frequency,
+                             ignored_exceptions=(NoSuchElementException, StaleElementReferenceException))
+        if not _wait_listeners:
+            return wait.until(condition, message)
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return wait.until(condition, message)
+        except TimeoutException:
+            timed_out = True
+            raise
+        finally:
+            self._notify(start, timed_out)
+
+    def dom_change(self, locator, condition, timeout=None):
+        """Expect a DOM change: one async script that a MutationObserver resolves when condition holds.
+
+        condition is ("present",), ("absent",), ("count_below", n),
+        ("count_at_least", n) or ("text_matches", regex) for the text of the
+        first match. Returns {"met", "count", "text"} for the matches at that
+        moment; met is False when timeout passed first.
+        """
+        by, value = compile_locator(locator)
+        timeout = self.timeout if timeout is None else timeout
+        start = time.perf_counter()
+        state = None
+        try:
+            state = self.driver.execute_async_script(load_script('wait_for_change'), by, value,
+                                                     list(condition), int(timeout * 1000))
+        except JavascriptException as e:
+            # Navigation unloads the document the observer was watching
+            raise WaitCancelled(f"Wait cancelled: {e.msg}")
+        finally:
+            self._notify(start, state is None or not state["met"])
+        return state
+
+    def _notify(self, start, timed_out):
+        duration = time.perf_counter() - start
+        for listener in list(_wait_listeners):
+            listener(self, duration, timed_out)
+
+    def present(self, locator, timeout=None):
+        """Expect present: return the element as soon as it is in the DOM"""
+        return self.until(EC.presence_of_element_located(compile_locator(locator)), timeout,
+                          f"Element not found: {locator}")
+
+    def all_present(self, locator, timeout=None):
+        """Expect present: return all matches as soon as there is at least one"""
+        return self.until(EC.presence_of_all_elements_located(compile_locator(locator)), timeout,
+                          f"Elements not found: {locator}")
+
+    def visible(self, locator, timeout=None):
+        """Expect present: return the element as soon as it is visible"""
+        return self.until(EC.visibility_of_element_located(compile_locator(locator)), timeout,
+                          f"Element not visible: {locator}")
+
+    def clickable(self, locator, timeout=None):
+        """Expect present: return the element as soon as it can be clicked"""
+        return self.until(EC.element_to_be_clickable(compile_locator(locator)), timeout,
+                          f"Element not clickable: {locator}")
+
+    def current(self, locator):
+        """Expect empty: return the matches right now without waiting"""
+        return self.driver.find_elements(*compile_locator(locator))
+
+    def absent(self, locator, timeout=None):
+        """Expect absent: True at once if nothing matches, else wait briefly for matches to go away"""
+        locator = compile_locator(locator)
+        if not self.current(locator):
+            return True
+        try:
+            self.until(lambda driver: not driver.find_elements(*locator),
+                       self.negative_timeout if timeout is None else timeout)
+            return True
+        except TimeoutException:
+            return False
@@ -0,0 +1,58 @@
+import os
+import pytest
+from pages.cart_page import CartPage
+from pages.home_page import HomePage
+from pages.product_page import ProductPage
+from utils.benchmark import Benchmark, append_history, load_baseline, load_history, save_baseline, trend
+from utils.demoblaze_server import DemoBlazeServer
+from utils.driver_factory import BASE_URL_ENV, DriverFactory
+
+
+@pytest.fixture(scope="session", autouse=True)
+def stand_in_server():
+    """Benchmarks always run against the local stand-in so network latency stays out of the numbers"""
+    server = DemoBlazeServer(host=DriverFactory().get_stand_in_config()["host"])
+    os.environ[BASE_URL_ENV] = server.start()
+    yield server
+    server.stop()
+    os.environ.pop(BASE_URL_ENV, None)
+
+
+@pytest.fixture(scope="session")
+def baseline(request):
+    """Committed baseline results; None when this run is recording a new baseline"""
+    if request.config.getoption("update_baseline"):
+        return None
+    return load_baseline(DriverFactory().get_benchmark_config()["baseline"])
+
+
+@pytest.fixture(scope="session")
+def bench(request):
+    """Session benchmark recorder; writes history, trend and (on request) the baseline at the end"""
+    settings = DriverFactory().get_benchmark_config()
+    benchmark = Benchmark(settings)
+    yield benchmark
+    benchmark.close()
+    if not benchmark.results:
+        return
+    append_history(settings["history"], benchmark.results)
+    if request.config.getoption("update_baseline"):
+        save_baseline(settings["baseline"], benchmark.results, load_baseline(settings["baseline"]))
+    os.makedirs(os.path.dirname(settings["trend"]) or ".", exist_ok=True)
+    with open(settings["trend"], "w") as f:
+        f.write(trend(load_history(settings["history"])) + "\n")
+
+
+@pytest.fixture()
+def home_page(driver):
+    return HomePage(driver)
+
+
+@pytest.fixture()
+def product_page(driver):
+    return ProductPage(driver)
+
+
+@pytest.fixture()
+def cart_page(driver):
+    return CartPage(driver)
@@ -0,0 +1,130 @@
+import pytest
+import allure
+from helpers.test_data import TestData
+
+
+def assert_no_regression(bench, baseline, name):
+    if baseline is None:
+        # Recording a new baseline; there is nothing to compare with
+        return
+    regressions = bench.regressions(baseline, [name])
+    assert not regressions, "\n".join(regressions)
+
+
+@allure.epic("DemoBlaze E-commerce")
+@allure.feature("Benchmarks")
+class TestHomePageBenchmarks:
+
+    @pytest.mark.parametrize("method", [
+        "get_product_titles",
+        "get_product_prices",
+        "get_product_count",
+        "verify_navigation_elements",
+        "verify_footer_present",
+        "get_copyright_text",
+    ])
+    def test_read_methods(self, bench, baseline, base_url, home_page, method):
+        """Read-only home page methods on a freshly loaded page"""
+        name = f"HomePage.{method}"
+        bench.run(name, getattr(home_page, method), setup=lambda: home_page.open(base_url))
+        assert_no_regression(bench, baseline, name)
+
+    def test_click_product_by_name(self, bench, baseline, base_url, home_page):
+        name = "HomePage.click_product_by_name"
+        bench.run(name, home_page.click_product_by_name, "Nexus 6", setup=lambda: home_page.open(base_url))
+        assert_no_regression(bench, baseline, name)
+
+    def test_click_category(self, bench, baseline, base_url, home_page):
+        name = "HomePage.click_category"
+        bench.run(name, home_page.click_category, "Laptops", setup=lambda: home_page.open(base_url))
+        assert_no_regression(bench, baseline, name)
+
+    def test_open_cart(self, bench, baseline, base_url, home_page):
+        name = "HomePage.open_cart"
+        bench.run(name, home_page.open_cart, setup=lambda: home_page.open(base_url))
+        assert_no_regression(bench, baseline, name)
+
+
+@allure.epic("DemoBlaze E-commerce")
+@allure.feature("Benchmarks")
+class TestProductPageBenchmarks:
+
+    @pytest.mark.parametrize("method", [
+        "get_product_name",
+        "get_product_price",
+        "get_product_description",
+        "verify_product_details_loaded",
+        "verify_add_to_cart_button_present",
+    ])
+    def test_read_methods(self, bench, baseline, base_url, product_page, method):
+        """Read-only product page methods on a freshly loaded product"""
+        name = f"ProductPage.{method}"
+        bench.run(name, getattr(product_page, method), setup=lambda: product_page.open(f"{base_url}/prod.html?idp_=1"))
+        assert_no_regression(bench, baseline, name)
+
+    def test_add_to_cart(self, bench, baseline, base_url, product_page, seeder):
+        name = "ProductPage.add_to_cart"
+        bench.run(name, product_page.add_to_cart, setup=lambda: product_page.open(f"{base_url}/prod.html?idp_=1"))
+        assert_no_regression(bench, baseline, name)
+
+    def test_go_back_to_products(self, bench, baseline, base_url, product_page):
+        def setup():
+            product_page.open(base_url)
+            product_page.open(f"{base_url}/prod.html?idp_=1")
+
+        name = "ProductPage.go_back_to_products"
+        bench.run(name, product_page.go_back_to_products, setup=setup)
+        assert_no_regression(bench, baseline, name)
+
+
+@allure.epic("DemoBlaze E-commerce")
+@allure.feature("Benchmarks")
+class TestCartPageBenchmarks:
+
+    @pytest.mark.parametrize("method", [
+        "get_cart_rows",
+        "get_cart_item_names",
+        "get_cart_item_prices",
+        "get_cart_item_count",
+        "get_cart_total",
+    ])
+    def test_read_methods(self, bench, baseline, base_url, cart_page, seeder, method):
+        """Read-only cart methods on a cart seeded with three products"""
+        seeder.add_first_products(3)
+        name = f"CartPage.{method}"
+        bench.run(name, getattr(cart_page, method), setup=lambda: cart_page.open(f"{base_url}/cart.html"))
+        assert_no_regression(bench, baseline, name)
+
+    def test_fill_order_form(self, bench, baseline, base_url, cart_page, seeder):
+        seeder.add_first_products(1)
+        order = TestData.ORDER_DATA["valid_order"]
+
+        def setup():
+            cart_page.open(f"{base_url}/cart.html")
+            cart_page.click_place_order()
+
+        name = "CartPage.fill_order_form"
+        bench.run(name, cart_page.fill_order_form, order["name"], order["country"], order["city"],
+                  order["credit_card"], order["month"], order["year"], setup=setup)
+        assert_no_regression(bench, baseline, name)
+
+    def test_delete_item_from_cart(self, bench, baseline, base_url, cart_page, seeder):
+        def setup():
+            seeder.clear_cart()
+            seeder.add_first_products(2)
+            cart_page.open(f"{base_url}/cart.html")
+            cart_page.get_cart_rows()
+
+        name = "CartPage.delete_item_from_cart"
+        bench.run(name, cart_page.delete_item_from_cart, 0, setup=setup)
+        assert_no_regression(bench, baseline, name)
+
+    def test_clear_cart(self, bench, baseline, base_url, cart_page, seeder):
+        def setup():
+            seeder.clear_cart()
+            seeder.add_first_products(3)
+            cart_page.open(f"{base_url}/cart.html")
+
+        name = "CartPage.clear_cart"
+        bench.run(name, cart_page.clear_cart, setup=setup)
+        assert_no_regression(bench, baseline, name)
@@ -0,0 +1,172 @@
+import os
+import pytest
+from base.step_retry import StepRetry
+from utils.demoblaze_server import DemoBlazeServer
+from utils.driver_factory import BASE_URL_ENV, DriverFactory, DriverPool
+from utils.network_policy import NetworkPolicy, format_bytes, known_sizes, remember_sizes
+from utils.session_hub import running_hub
+from utils.shared_service import running_services
+from utils.state_seeder import StateSeeder
+from utils import wire_profiler
+
+pytest_plugins = ["plugins.parallel", "plugins.step_timing", "plugins.asyncio_tests", "plugins.screenshots",
+                  "plugins.step_retry", "plugins.test_impact", "plugins.data_provider",
+                  "plugins.result_cache"]
+
+driver_pool_key = pytest.StashKey()
+NETWORK_SIZES_KEY = "network_policy/sizes"
+
+
+def pytest_addoption(parser):
+    parser.addoption("--stand-in", action="store_true", default=False,
+                     help="Run against the local DemoBlaze stand-in server instead of config.json base_url")
+    parser.addoption("--update-baseline", action="store_true", default=False,
+                     help="Store this run's benchmark results as the new baseline instead of gating on it")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "network_policy(**rules): override config.json network_policy for "
+                                       "one test, e.g. allow_types=['image'] or enabled=False")
+    if getattr(config, "cache", None) is not None:
+        # Sizes seen on earlier runs value the requests blocked on this one
+        remember_sizes(config.cache.get(NETWORK_SIZES_KEY, {}))
+
+
+def pytest_sessionstart(session):
+    profiler = DriverFactory().get_profiler_config()
+    if profiler["enabled"] and not session.config.pluginmanager.has_plugin("parallel-worker"):
+        wire_profiler.discard_worker_profiles(profiler["output"])
+
+
+def pytest_sessionfinish(session):
+    cache = getattr(session.config, "cache", None)
+    if cache is not None and known_sizes():
+        sizes = cache.get(NETWORK_SIZES_KEY, {})
+        sizes.update(known_sizes())
+        cache.set(NETWORK_SIZES_KEY, sizes)
+    profiler = DriverFactory().get_profiler_config()
+    if profiler["enabled"] and not session.config.pluginmanager.has_plugin("parallel-worker"):
+        # With --workers the commands were profiled in the worker processes
+        wire_profiler.merge_worker_profiles(profiler["output"], profiler["top"])
+
+
+@pytest.fixture(scope="session", autouse=True)
+def stand_in_server(request):
+    """Start the local DemoBlaze stand-in once per session when enabled"""
+    settings = DriverFactory().get_stand_in_config()
+    if not (settings["enabled"] or request.config.getoption("stand_in")):
+        yield None
+        return
+    server = DemoBlazeServer(host=settings["host"])
+    os.environ[BASE_URL_ENV] = server.start()
+    yield server
+    server.stop()
+    os.environ.pop(BASE_URL_ENV, None)
+
+
+@pytest.fixture(scope="session")
+def base_url(stand_in_server):
+    """Base URL of the site under test"""
+    return DriverFactory().get_base_url()
+
+
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    """Session-wide pool of reusable WebDriver sessions"""
+    pool = DriverPool()
+    request.config.stash[driver_pool_key] = pool
+    yield pool
+    pool.shutdown()
+
+
+def _lease(request, driver_pool):
+    """Acquire a pooled driver with the test's network policy applied"""
+    driver = driver_pool.acquire()
+    policy = NetworkPolicy.for_driver(driver)
+    marker = request.node.get_closest_marker("network_policy")
+    policy.configure(**(marker.kwargs if marker else {}))
+    policy.reset_stats()
+    return driver
+
+
+@pytest.fixture()
+def driver(request, driver_pool):
+    """Lease a pooled driver for one test and hand it back after a reset"""
+    driver = _lease(request, driver_pool)
+
+    def replace(lost):
+        driver_pool.release(lost, healthy=False)
+        return _lease(request, driver_pool)
+
+    retry = StepRetry.for_driver(driver)
+    quarantined = request.node.get_closest_marker("quarantined") is not None
+    retry.begin(retries=0 if quarantined else None, replace=replace, reset=driver_pool.reset_driver)
+    yield driver
+    # Step retries may have swapped a lost session for a fresh one
+    driver = retry.driver
+    policy = NetworkPolicy.for_driver(driver)
+    if policy.installed:
+        request.node.user_properties.append(("network_policy", dict(policy.stats)))
+    if retry.events:
+        request.node.user_properties.append(("step_retries", list(retry.events)))
+    driver_pool.release(driver)
+
+
+@pytest.fixture()
+def seeder(driver, base_url):
+    """API state seeder whose shopper session is already injected into the driver"""
+    seeder = StateSeeder()
+    seeder.inject_session(driver, base_url)
+    # Step retries that restore the checkpoint put the seeded cart back first
+    StepRetry.for_driver(driver).on_restore(lambda current: seeder.reseed(current, base_url))
+    yield seeder
+    try:
+        seeder.clear_cart()
+    except Exception:
+        pass
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report driver pool savings, session hub queueing and, when profiling, the costliest wire-command call sites"""
+    pool = config.stash.get(driver_pool_key, None)
+    if pool is not None and pool.leases:
+        terminalreporter.write_sep("-", "driver pool")
+        terminalreporter.write_line(pool.report())
+        for service in running_services():
+            terminalreporter.write_line(service.report())
+    hub = running_hub()
+    if hub is not None and hub.created:
+        terminalreporter.write_sep("-", "session hub")
+        terminalreporter.write_line(hub.report())
+    _report_network_savings(terminalreporter)
+    profiler = wire_profiler.get_profiler()
+    if profiler is not None and profiler.commands:
+        terminalreporter.write_sep("-", "wire profile")
+        terminalreporter.write_line(profiler.report())
+        terminalreporter.write_line(f"Collapsed stacks written to {profiler.save()}")
+
+
+def _report_network_savings(terminalreporter):
+    """Summarize requests and bytes the network policy saved, per test and in total"""
+    savings = {}
+    for reports in terminalreporter.stats.values():
+        for report in reports:
+            if getattr(report, "when", None) != "teardown":
+                continue
+            for name, value in getattr(report, "user_properties", []):
+                if name == "network_policy":
+                    savings[report.nodeid] = value
+    if not savings:
+        return
+    terminalreporter.write_sep("-", "network policy")
+    for nodeid, stats in sorted(savings.items(), key=lambda entry: entry[1]["bytes_saved"], reverse=True):
+        terminalreporter.write_line(f"{nodeid}: blocked {stats['blocked']}/{stats['requests']} requests, "
+                                    f"saved {format_bytes(stats['bytes_saved'])}")
+    blocked = sum(stats["blocked"] for stats in savings.values())
+    requests = sum(stats["requests"] for stats in savings.values())
+    saved = sum(stats["bytes_saved"] for stats in savings.values())
+    unsized = sum(stats["unsized_blocked"] for stats in savings.values())
+    line = f"Total: blocked {blocked}/{requests} requests, saved {format_bytes(saved)}"
+    if unsized:
+        line += f" (+{unsized} blocked requests never seen unblocked, so not sized)"
+    terminalreporter.write_line(line)
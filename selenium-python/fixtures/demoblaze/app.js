@@ -0,0 +1,163 @@
+// Client script for the local DemoBlaze stand-in. Mirrors the live site's
+// behaviour closely enough for the page objects: content is rendered from XHR
+// responses after `load`, and the cart is keyed by the `user` cookie.
+
+function getCookie(name) {
+  var match = document.cookie.match(new RegExp('(?:^|; )' + name + '=([^;]*)'));
+  return match ? decodeURIComponent(match[1]) : null;
+}
+
+function guid() {
+  return 'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, function (c) {
+    var r = Math.random() * 16 | 0;
+    return (c === 'x' ? r : (r & 0x3 | 0x8)).toString(16);
+  });
+}
+
+function userCookie() {
+  var user = getCookie('user');
+  if (!user) {
+    user = guid();
+    document.cookie = 'user=' + user + '; path=/';
+  }
+  return user;
+}
+
+function api(path, body) {
+  var init = body === undefined ? {method: 'GET'} : {
+    method: 'POST',
+    headers: {'Content-Type': 'application/json'},
+    body: JSON.stringify(body)
+  };
+  return fetch('/' + path, init).then(function (response) {
+    var type = response.headers.get('Content-Type') || '';
+    return type.indexOf('json') >= 0 ? response.json() : response.text();
+  });
+}
+
+function escapeHtml(text) {
+  var div = document.createElement('div');
+  div.textContent = text;
+  return div.innerHTML;
+}
+
+// Modals: data-toggle="modal" opens the target, .close / data-dismiss closes it
+function showModal(id) {
+  var modal = document.getElementById(id);
+  if (modal) {
+    modal.classList.add('show');
+    modal.style.display = 'block';
+  }
+}
+
+function hideModal(modal) {
+  modal.classList.remove('show');
+  modal.style.display = 'none';
+}
+
+document.addEventListener('click', function (event) {
+  var toggle = event.target.closest('[data-toggle="modal"]');
+  if (toggle) {
+    event.preventDefault();
+    showModal(toggle.getAttribute('data-target').replace('#', ''));
+    return;
+  }
+  var dismiss = event.target.closest('[data-dismiss="modal"], .modal .close');
+  if (dismiss) {
+    hideModal(dismiss.closest('.modal'));
+  }
+});
+
+// Home page
+function renderCards(items) {
+  var html = items.map(function (item) {
+    var href = 'prod.html?idp_=' + item.id;
+    return '<div class="col-lg-4 col-md-6 mb-4"><div class="card h-100">' +
+      '<a href="' + href + '" class="hrefch"><img class="card-img-top img-fluid" src="' + item.img + '" alt=""></a>' +
+      '<div class="card-block"><h4 class="card-title"><a href="' + href + '" class="hrefch">' +
+      escapeHtml(item.title) + '</a></h4><h5>$' + item.price + '</h5>' +
+      '<p id="article" class="card-text">' + escapeHtml(item.desc) + '</p></div></div></div>';
+  });
+  document.getElementById('tbodyid').innerHTML = html.join('');
+}
+
+function loadEntries() {
+  api('entries').then(function (data) { renderCards(data.Items); });
+}
+
+function byCat(cat) {
+  api('bycat', {cat: cat}).then(function (data) { renderCards(data.Items); });
+}
+
+// Product page
+function productId() {
+  var match = window.location.search.match(/idp_=(\d+)/);
+  return match ? match[1] : '1';
+}
+
+function loadProduct() {
+  api('view', {id: productId()}).then(function (item) {
+    document.getElementById('imgp').innerHTML =
+      '<div class="item active"><img src="' + item.img + '" width="400" height="400" alt=""></div>';
+    document.getElementById('tbodyid').innerHTML =
+      '<h2 class="name">' + escapeHtml(item.title) + '</h2>' +
+      '<h3 class="price-container">$' + item.price + ' <small>*includes tax</small></h3><hr>' +
+      '<div id="more-information"><strong>Product description</strong><p>' + escapeHtml(item.desc) + '</p></div>' +
+      '<div class="row"><div class="col-sm-12 col-md-6 col-lg-6">' +
+      '<a href="#" onclick="addToCart(' + item.id + '); return false;" class="btn btn-success btn-lg">Add to cart</a>' +
+      '</div></div>';
+  });
+}
+
+function addToCart(id) {
+  api('addtocart', {id: guid(), cookie: userCookie(), prod_id: id, flag: false}).then(function () {
+    alert('Product added');
+  });
+}
+
+// Cart page
+function loadCart() {
+  api('viewcart', {cookie: userCookie(), flag: false}).then(function (data) {
+    return Promise.all(data.Items.map(function (entry) {
+      return api('view', {id: entry.prod_id}).then(function (item) {
+        return {entry: entry, item: item};
+      });
+    }));
+  }).then(function (rows) {
+    var total = 0;
+    document.getElementById('tbodyid').innerHTML = rows.map(function (row) {
+      total += row.item.price;
+      return '<tr class="success"><td><img width="100" height="100" src="' + row.item.img + '" alt=""></td>' +
+        '<td>' + escapeHtml(row.item.title) + '</td><td>' + row.item.price + '</td>' +
+        '<td><a href="#" onclick="deleteItem(\'' + row.entry.id + '\'); return false;">Delete</a></td></tr>';
+    }).join('');
+    document.getElementById('totalp').textContent = rows.length ? String(total) : '';
+  });
+}
+
+function deleteItem(id) {
+  api('deleteitem', {id: id}).then(loadCart);
+}
+
+function purchaseOrder() {
+  var name = document.getElementById('name').value;
+  var card = document.getElementById('card').value;
+  if (!name || !card) {
+    alert('Please fill out Name and Creditcard.');
+    return;
+  }
+  api('deletecart', {cookie: userCookie()}).then(function () {
+    hideModal(document.getElementById('orderModal'));
+    var confirm = document.getElementById('purchaseConfirm');
+    confirm.querySelector('p').textContent = 'Amount: ' + (document.getElementById('totalp').textContent || '0') +
+      ' USD\nCard Number: ' + card + '\nName: ' + name;
+    confirm.style.display = 'block';
+  });
+}
+
+function confirmPurchase() {
+  document.getElementById('purchaseConfirm').style.display = 'none';
+  window.location.href = 'index.html';
+}
+
+userCookie();
@@ -0,0 +1,144 @@
+import csv
+import os
+import re
+import threading
+from datetime import date, datetime
+
+try:
+    import openpyxl
+except ImportError:
+    # CSV datasets work without openpyxl; Excel ones raise when opened
+    openpyxl = None
+
+# Arguments of CartPage.complete_purchase, in order
+PURCHASE_FIELDS = ("name", "country", "city", "credit_card", "month", "year")
+
+_datasets = {}
+_datasets_lock = threading.Lock()
+
+
+def argument_name(header):
+    """Turn a column header like 'Credit Card' into an argument name like 'credit_card'"""
+    return re.sub(r"\W+", "_", str(header).strip()).strip("_").lower()
+
+
+def cell_text(value):
+    """Render a cell the way a user would type it: 12.0 -> '12', empty -> ''"""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime):
+        return value.date().isoformat() if value.time() == datetime.min.time() else value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+class Dataset:
+    """Rows of a CSV file or an Excel sheet, read as a stream and never held in memory as a whole.
+
+    The first row is the header. Headers become argument names
+    (``argument_name``) unless ``columns`` maps them explicitly, e.g.
+    ``{"Card": "credit_card"}``; with ``fields`` the rows carry exactly those
+    arguments, in that order, and a missing column is an error. Rows are
+    numbered from 1 below the header; blank rows are skipped but keep their
+    number. ``row(number)`` reads forward from the last row it returned, so
+    rows requested in order cost one pass over the file in total.
+    """
+
+    def __init__(self, path, sheet=None, columns=None, fields=None):
+        self.path = path
+        self.sheet = sheet
+        self.columns = dict(columns or {})
+        self.fields = tuple(fields) if fields else None
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self._numbers = None
+        self._cursor = None
+        self._position = 0
+        self._lock = threading.Lock()
+
+    def rows(self):
+        """Yield (number, {argument: text}) for every non-blank row"""
+        records = self._records()
+        try:
+            names = self._names(next(records, None) or [])
+            for number, values in enumerate(records, start=1):
+                texts = [cell_text(value) for value in values]
+                if not any(texts):
+                    continue
+                row = dict(zip(names, texts + [""] * (len(names) - len(texts))))
+                yield number, {field: row[field] for field in self.fields} if self.fields else row
+        finally:
+            records.close()
+
+    def row_numbers(self):
+        """Numbers of the non-blank rows, found with one streaming pass and remembered"""
+        if self._numbers is None:
+            records = self._records()
+            try:
+                self._names(next(records, None) or [])
+                # Only blankness matters here; rows are rendered when a test reads them
+                self._numbers = [number for number, values in enumerate(records, start=1)
+                                 if any(value is not None and value != "" for value in values)]
+            finally:
+                records.close()
+        return self._numbers
+
+    def row(self, number):
+        """The row with this number"""
+        with self._lock:
+            if self._cursor is None or self._position >= number:
+                self.close()
+                self._cursor = self.rows()
+            for position, row in self._cursor:
+                self._position = position
+                if position == number:
+                    return row
+                if position > number:
+                    break
+            self.close()
+            raise LookupError(f"{self.path} has no row {number}")
+
+    def close(self):
+        """Release the open file behind the cursor"""
+        if self._cursor is not None:
+            self._cursor.close()
+        self._cursor = None
+        self._position = 0
+
+    def _names(self, header):
+        names = [self.columns.get(str(cell), argument_name(cell)) if cell is not None else "" for cell in header]
+        missing = [field for field in self.fields or () if field not in names]
+        if missing:
+            raise ValueError(f"{self.path} has no column for {', '.join(missing)} (header: {list(header)})")
+        return names
+
+    def _records(self):
+        if self.path.lower().endswith((".xlsx", ".xlsm")):
+            return self._excel_records()
+        return self._csv_records()
+
+    def _csv_records(self):
+        with open(self.path, newline="", encoding="utf-8-sig") as f:
+            yield from csv.reader(f)
+
+    def _excel_records(self):
+        if openpyxl is None:
+            raise ImportError(f"openpyxl is required to read {self.path}")
+        # read_only streams the sheet XML row by row instead of building the whole workbook
+        workbook = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            worksheet = workbook[self.sheet] if self.sheet else workbook.active
+            yield from worksheet.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+
+
+def load(path, sheet=None, columns=None, fields=None):
+    """Get the process-wide Dataset for a file, sheet and column mapping"""
+    key = (os.path.abspath(path), sheet, tuple(sorted((columns or {}).items())), tuple(fields or ()))
+    with _datasets_lock:
+        if key not in _datasets:
+            _datasets[key] = Dataset(key[0], sheet, columns, fields)
+        return _datasets[key]
@@ -6,6 +6,12 @@ class CartPageLocators:
     CART_ITEM_NAME_CELLS = (By.XPATH, "//tr[@class='success']/td[2]")
     CART_ITEM_PRICE_CELLS = (By.XPATH, "//tr[@class='success']/td[3]")
     DELETE_BUTTONS = (By.XPATH, "//tr[@class='success']/td[4]//a[contains(text(), 'Delete')]")
+    # Fields read per CART_ITEM_ROWS row by BasePage.extract_rows: (selector, source[, pattern])
+    CART_ITEM_ROW_FIELDS = {
+        "name": ("td:nth-child(2)", "text"),
+        "price": ("td:nth-child(3)", "text"),
+        "delete_id": ("td:nth-child(4) a", "onclick", r"deleteItem\('([^']+)'\)"),
+    }
 
     # Cart actions
     PLACE_ORDER_BUTTON = (By.XPATH, "//button[contains(text(), 'Place Order')]")
@@ -20,6 +20,13 @@ class HomePageLocators:
     PRODUCT_TITLES = (By.CLASS_NAME, "card-title")
     PRODUCT_PRICES = (By.CLASS_NAME, "card-text")
     PRODUCT_IMAGES = (By.CLASS_NAME, "card-img-top")
+    # Fields read per PRODUCT_CARDS card by BasePage.extract_rows: (selector, source[, pattern])
+    PRODUCT_CARD_FIELDS = {
+        "title": (".card-title", "text"),
+        "price": (".card-block h5", "text"),
+        "href": (".card-title a", "href"),
+        "image": (".card-img-top", "src"),
+    }
     
     # Categories
     PHONES_CATEGORY = (By.XPATH, "//a[contains(text(), 'Phones')]")
@@ -0,0 +1,207 @@
+import importlib
+import pkgutil
+import re
+import threading
+from selenium.webdriver.common.by import By
+
+STRATEGIES = {value for name, value in vars(By).items() if name.isupper()}
+
+_NAME = r"(?:\*|[A-Za-z_][\w-]*)"
+_STEP = re.compile(rf"(//|/)({_NAME})((?:\[[^\[\]]*\])*)")
+_PREDICATE = re.compile(r"\[([^\[\]]*)\]")
+_LITERAL = r"""(?:'([^']*)'|"([^"]*)")"""
+_CONDITIONS = [
+    (re.compile(rf"^@([\w-]+)\s*=\s*{_LITERAL}$"), "[{attr}='{value}']"),
+    (re.compile(rf"^contains\(\s*@([\w-]+)\s*,\s*{_LITERAL}\s*\)$"), "[{attr}*='{value}']"),
+    (re.compile(rf"^starts-with\(\s*@([\w-]+)\s*,\s*{_LITERAL}\s*\)$"), "[{attr}^='{value}']"),
+    (re.compile(r"^@([\w-]+)$"), "[{attr}]"),
+]
+_IDENTIFIER = re.compile(r"^[A-Za-z][\w-]*$")
+
+
+def xpath_to_css(xpath):
+    """Translate an XPath to an equivalent CSS selector, or return None when CSS can't express it.
+
+    Handles descendant/child steps over element names with attribute equality,
+    contains()/starts-with() on attributes, attribute existence and positional
+    predicates. Anything touching text(), axes or functions stays XPath.
+    """
+    if not xpath.startswith("//"):
+        return None
+    parts = []
+    position = 0
+    while position < len(xpath):
+        match = _STEP.match(xpath, position)
+        if match is None:
+            return None
+        axis, name, predicates = match.groups()
+        css = "" if name == "*" else name
+        for index, predicate in enumerate(_PREDICATE.findall(predicates)):
+            condition = _condition_to_css(predicate, name, index)
+            if condition is None:
+                return None
+            css += condition
+        if position:
+            parts.append(" > " if axis == "/" else " ")
+        parts.append(css or "*")
+        position = match.end()
+    return "".join(parts)
+
+
+def _condition_to_css(predicate, name, index=0):
+    predicate = predicate.strip()
+    if predicate.isdigit():
+        # Position among same-named siblings; meaningless for '*'. After another
+        # predicate it counts only the filtered nodes, which CSS can't express.
+        return None if name == "*" or index else f":nth-of-type({predicate})"
+    css = ""
+    for clause in re.split(r"\s+and\s+", predicate):
+        for pattern, template in _CONDITIONS:
+            match = pattern.match(clause.strip())
+            if match:
+                attr = match.group(1)
+                value = next((group for group in match.groups()[1:] if group is not None), "")
+                if "'" in value or "\\" in value:
+                    return None
+                if attr == "id" and template == "[{attr}='{value}']" and _IDENTIFIER.match(value):
+                    css += f"#{value}"
+                else:
+                    css += template.format(attr=attr, value=value)
+                break
+        else:
+            return None
+    return css
+
+
+def _balanced(selector):
+    depth = {"[": 0, "(": 0}
+    closing = {"]": "[", ")": "("}
+    quote = None
+    for char in selector:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "'\"":
+            quote = char
+        elif char in depth:
+            depth[char] += 1
+        elif char in closing:
+            depth[closing[char]] -= 1
+            if depth[closing[char]] < 0:
+                return False
+    return quote is None and not any(depth.values())
+
+
+class LocatorRegistry:
+    """Validated, compiled view of the locator classes in the locators package.
+
+    Locators are loaded once, checked for a known strategy and well-formed
+    selector, and rewritten to a faster equivalent where the semantics allow:
+    XPaths expressible as CSS become CSS selectors, and ``//*[@id='x']``
+    becomes an ID lookup. Locators not defined in a locator class are compiled
+    on first use.
+    """
+
+    def __init__(self):
+        self._compiled = {}
+        self._names = {}
+        self._lock = threading.Lock()
+
+    def load_package(self, package="locators"):
+        """Register every *Locators class in the package's modules"""
+        module = importlib.import_module(package)
+        for info in pkgutil.iter_modules(module.__path__):
+            if info.name.endswith("_locators"):
+                submodule = importlib.import_module(f"{package}.{info.name}")
+                for name, value in vars(submodule).items():
+                    if isinstance(value, type) and name.endswith("Locators"):
+                        self.load_class(value)
+        return self
+
+    def load_class(self, locator_class):
+        """Register the locator tuples defined on a class"""
+        for name, value in vars(locator_class).items():
+            if name.isupper() and isinstance(value, tuple):
+                self.validate(value, f"{locator_class.__name__}.{name}")
+                with self._lock:
+                    self._names.setdefault(value, f"{locator_class.__name__}.{name}")
+                self.compile(value)
+        return self
+
+    @staticmethod
+    def validate(locator, name=None):
+        """Raise ValueError if the locator is not a well-formed (strategy, selector) pair"""
+        label = name or repr(locator)
+        if len(locator) != 2:
+            raise ValueError(f"Locator {label} must be a (strategy, selector) pair")
+        strategy, selector = locator
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Locator {label} uses unknown strategy {strategy!r}")
+        if not isinstance(selector, str) or not selector.strip():
+            raise ValueError(f"Locator {label} has an empty selector")
+        if strategy in (By.XPATH, By.CSS_SELECTOR) and not _balanced(selector):
+            raise ValueError(f"Locator {label} has unbalanced brackets or quotes: {selector}")
+
+    def compile(self, locator):
+        """Get the fastest equivalent of a locator"""
+        compiled = self._compiled.get(locator)
+        if compiled is None:
+            compiled = self._translate(locator)
+            with self._lock:
+                self._compiled[locator] = compiled
+        return compiled
+
+    def name_of(self, locator):
+        """Get the 'Class.CONSTANT' name a locator was defined under, if any"""
+        return self._names.get(locator)
+
+    def translated(self):
+        """Map of registered locator names to the locators they were rewritten to"""
+        return {name: self._compiled[locator] for locator, name in self._names.items()
+                if self._compiled.get(locator, locator) != locator}
+
+    @staticmethod
+    def _translate(locator):
+        strategy, selector = locator
+        if strategy != By.XPATH:
+            return locator
+        css = xpath_to_css(selector)
+        if css is None:
+            return locator
+        if css.startswith("#") and _IDENTIFIER.match(css[1:]):
+            return (By.ID, css[1:])
+        return (By.CSS_SELECTOR, css)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+# Called with every locator a page object uses, e.g. to record test impact
+_observers = []
+
+
+def add_observer(observer):
+    """Call observer(locator) for every locator compiled through compile_locator"""
+    if observer not in _observers:
+        _observers.append(observer)
+
+
+def remove_observer(observer):
+    """Stop observing locator use"""
+    if observer in _observers:
+        _observers.remove(observer)
+
+
+def get_registry():
+    """Get the process-wide registry, loading the locators package on first use"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = LocatorRegistry().load_package()
+    return _registry
+
+
+def compile_locator(locator):
+    """Get the compiled equivalent of a locator from the shared registry"""
+    for observer in _observers:
+        observer(locator)
+    return get_registry().compile(locator)
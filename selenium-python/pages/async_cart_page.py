@@ -0,0 +1,79 @@
+from base.async_base_page import AsyncBasePage
+from locators.cart_page_locators import CartPageLocators
+
+class AsyncCartPage(AsyncBasePage):
+
+    async def get_cart_rows(self):
+        """Get name, price and delete id of every cart row in one round trip"""
+        return await self.extract_rows(CartPageLocators.CART_ITEM_ROWS, CartPageLocators.CART_ITEM_ROW_FIELDS)
+
+    async def get_cart_item_names(self):
+        """Get names of all items in cart"""
+        return [row["name"] for row in await self.get_cart_rows()]
+
+    async def get_cart_item_prices(self):
+        """Get numeric prices of all items in cart"""
+        return [int(row["price"].strip()) for row in await self.get_cart_rows() if row["price"].strip().isdigit()]
+
+    async def get_cart_item_count(self):
+        """Get the number of items in cart"""
+        return len(await self.find_elements(CartPageLocators.CART_ITEM_ROWS))
+
+    async def get_cart_total(self):
+        """Get the total amount in cart once it has a numeric value"""
+        state = await self.wait_for_dom_change(CartPageLocators.TOTAL_AMOUNT, ("text_matches", r"^\d+$"),
+                                               timeout=10)
+        return state["text"] or ""
+
+    async def click_place_order(self):
+        """Click the place order button"""
+        await self.click_element(CartPageLocators.PLACE_ORDER_BUTTON)
+        await self.wait_for_element_visible(CartPageLocators.ORDER_MODAL)
+
+    async def fill_order_form(self, name, country, city, credit_card, month, year):
+        """Fill the order form with provided details"""
+        await self.send_keys_to_element(CartPageLocators.ORDER_NAME_INPUT, name)
+        await self.send_keys_to_element(CartPageLocators.ORDER_COUNTRY_INPUT, country)
+        await self.send_keys_to_element(CartPageLocators.ORDER_CITY_INPUT, city)
+        await self.send_keys_to_element(CartPageLocators.ORDER_CREDIT_CARD_INPUT, credit_card)
+        await self.send_keys_to_element(CartPageLocators.ORDER_MONTH_INPUT, month)
+        await self.send_keys_to_element(CartPageLocators.ORDER_YEAR_INPUT, year)
+
+    async def click_purchase(self):
+        """Click the purchase button"""
+        await self.click_element(CartPageLocators.PURCHASE_BUTTON)
+        await self.handle_any_alert()
+
+    async def complete_purchase(self, name, country, city, credit_card, month, year):
+        """Complete the entire purchase process"""
+        await self.click_place_order()
+        await self.fill_order_form(name, country, city, credit_card, month, year)
+        await self.click_purchase()
+
+    async def delete_item_from_cart(self, item_index=0):
+        """Delete an item from cart by index, wait for the row to go and return how many are left"""
+        delete_buttons = await self.find_elements(CartPageLocators.DELETE_BUTTONS)
+        if len(delete_buttons) <= item_index:
+            return len(delete_buttons)
+        await delete_buttons[item_index].click()
+        await self.wait_for_dom_change(CartPageLocators.CART_ITEM_ROWS, ("count_below", len(delete_buttons)),
+                                       timeout=10)
+        # The table is emptied and refilled from the viewcart request; count the rows once that has settled
+        await self.wait_for_network_idle(timeout=10)
+        return len(await self.find_elements(CartPageLocators.CART_ITEM_ROWS, expect_empty=True))
+
+    async def verify_cart_is_empty(self):
+        """Verify that the cart is empty (no item rows)"""
+        return await self.is_element_absent(CartPageLocators.CART_ITEM_ROWS)
+
+    async def verify_place_order_button_present(self):
+        """Verify place order button is present"""
+        return await self.is_element_displayed(CartPageLocators.PLACE_ORDER_BUTTON)
+
+    async def clear_cart(self):
+        """Remove all items from cart"""
+        remaining = len(await self.find_elements(CartPageLocators.CART_ITEM_ROWS, timeout=self.negative_timeout))
+        safety_cap = 20
+        while remaining and safety_cap > 0:
+            remaining = await self.delete_item_from_cart(0)
+            safety_cap -= 1
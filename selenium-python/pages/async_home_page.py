@@ -0,0 +1,76 @@
+from base.async_base_page import AsyncBasePage
+from locators.home_page_locators import HomePageLocators
+from locators.product_page_locators import ProductPageLocators
+
+class AsyncHomePage(AsyncBasePage):
+
+    async def get_product_cards(self):
+        """Get all product cards on the page"""
+        return await self.find_elements(HomePageLocators.PRODUCT_CARDS)
+
+    async def get_product_rows(self):
+        """Get title, price, href and image of every product card in one round trip"""
+        return await self.extract_rows(HomePageLocators.PRODUCT_CARDS, HomePageLocators.PRODUCT_CARD_FIELDS)
+
+    async def get_product_titles(self):
+        """Get all product titles"""
+        return [row["title"] for row in await self.get_product_rows()]
+
+    async def get_product_prices(self):
+        """Get all product prices"""
+        return [row["price"] for row in await self.get_product_rows()]
+
+    async def get_product_count(self):
+        """Get the total number of products displayed"""
+        return len(await self.get_product_cards())
+
+    async def click_product_by_name(self, product_name):
+        """Click on a specific product by name and wait for its page"""
+        fields = dict(HomePageLocators.PRODUCT_CARD_FIELDS, link=(".card-title a", "element"))
+        for row in await self.extract_rows(HomePageLocators.PRODUCT_CARDS, fields):
+            if product_name.lower() in row["title"].lower():
+                await row["link"].click()
+                if not await self.wait_for_url_contains("prod.html", timeout=5):
+                    await self.wait_for_element_visible(ProductPageLocators.PRODUCT_NAME, timeout=10)
+                return True
+        return False
+
+    async def click_category(self, category_name):
+        """Click on a specific category"""
+        categories = {
+            "phones": HomePageLocators.PHONES_CATEGORY,
+            "laptops": HomePageLocators.LAPTOPS_CATEGORY,
+            "monitors": HomePageLocators.MONITORS_CATEGORY,
+        }
+        if category_name.lower() in categories:
+            await self.click_element(categories[category_name.lower()])
+
+    async def open_cart(self):
+        """Open the shopping cart"""
+        await self.handle_any_alert()
+        await self.click_element(HomePageLocators.CART_LINK)
+
+    async def verify_navigation_elements(self):
+        """Verify all navigation elements are present"""
+        elements_to_check = [
+            HomePageLocators.NAVBAR_BRAND,
+            HomePageLocators.HOME_LINK,
+            HomePageLocators.CONTACT_LINK,
+            HomePageLocators.ABOUT_US_LINK,
+            HomePageLocators.CART_LINK,
+            HomePageLocators.LOGIN_LINK,
+            HomePageLocators.SIGNUP_LINK
+        ]
+        for locator in elements_to_check:
+            if not await self.is_element_displayed(locator):
+                return False
+        return True
+
+    async def verify_footer_present(self):
+        """Verify footer is present on the page"""
+        await self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        return await self.is_element_displayed(HomePageLocators.FOOTER)
+
+    async def get_copyright_text(self):
+        """Get copyright text from footer"""
+        return await self.get_element_text(HomePageLocators.COPYRIGHT_TEXT)
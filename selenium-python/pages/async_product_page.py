@@ -0,0 +1,44 @@
+from base.async_base_page import AsyncBasePage
+from locators.home_page_locators import HomePageLocators
+from locators.product_page_locators import ProductPageLocators
+
+class AsyncProductPage(AsyncBasePage):
+
+    async def get_product_name(self):
+        """Get the product name"""
+        await self.wait_for_element_visible(ProductPageLocators.PRODUCT_NAME, timeout=10)
+        return await self.get_element_text(ProductPageLocators.PRODUCT_NAME)
+
+    async def get_product_price(self):
+        """Get the product price"""
+        await self.wait_for_element_visible(ProductPageLocators.PRODUCT_PRICE, timeout=10)
+        return await self.get_element_text(ProductPageLocators.PRODUCT_PRICE)
+
+    async def get_product_description(self):
+        """Get the product description"""
+        return await self.get_element_text(ProductPageLocators.PRODUCT_DESCRIPTION)
+
+    async def add_to_cart(self):
+        """Add the current product to cart and accept the confirmation"""
+        await self.click_element(ProductPageLocators.ADD_TO_CART_BUTTON)
+        return await self.wait_for_alert_and_accept(timeout=10)
+
+    async def go_back_to_products(self):
+        """Go back to the products list"""
+        await self.handle_any_alert()
+        await self.go_back()
+        if not await self.wait_for_url_contains("index.html", timeout=5):
+            await self.wait_for_element_visible(HomePageLocators.PRODUCT_CARDS, timeout=10)
+
+    async def verify_add_to_cart_button_present(self):
+        """Verify add to cart button is present"""
+        return await self.is_element_displayed(ProductPageLocators.ADD_TO_CART_BUTTON)
+
+    async def verify_product_details_loaded(self):
+        """Verify all product details are loaded"""
+        await self.wait_for_url_contains("prod.html", timeout=10)
+        for locator in (ProductPageLocators.PRODUCT_NAME, ProductPageLocators.PRODUCT_PRICE,
+                        ProductPageLocators.ADD_TO_CART_BUTTON):
+            if not await self.wait_for_element_visible(locator, timeout=10):
+                return False
+        return True
@@ -1,41 +1,44 @@
-import allure
 from base.base_page import BasePage
+from base.step_retry import page_step
 from locators.home_page_locators import HomePageLocators
 from locators.product_page_locators import ProductPageLocators
-from selenium.webdriver.common.alert import Alert
 
 class HomePage(BasePage):
 
-    @allure.step('Verify page title')
+    @page_step('Verify page title')
     def get_title(self):
         return self.driver.title
 
-    @allure.step('Get all product cards')
+    @page_step('Get all product cards')
     def get_product_cards(self):
         """Get all product cards on the page"""
         return self.find_elements(HomePageLocators.PRODUCT_CARDS)
 
-    @allure.step('Get product titles')
-    def get_product_titles(self):
-        """Get all product titles"""
+    @page_step('Get product rows')
+    def get_product_rows(self):
+        """Get title, price, href and image of every product card in one round trip"""
         # Clear any unexpected alert before reading the list
         self.handle_any_alert()
-        elements = self.find_elements(HomePageLocators.PRODUCT_TITLES)
-        return [element.text for element in elements]
+        return self.extract_rows(HomePageLocators.PRODUCT_CARDS, HomePageLocators.PRODUCT_CARD_FIELDS)
+
+    @page_step('Get product titles')
+    def get_product_titles(self):
+        """Get all product titles"""
+        return [row["title"] for row in self.get_product_rows()]
 
-    @allure.step('Get product prices')
+    @page_step('Get product prices')
     def get_product_prices(self):
         """Get all product prices"""
-        self.handle_any_alert()
-        elements = self.find_elements(HomePageLocators.PRODUCT_PRICES)
-        return [element.text for element in elements]
+        return [row["price"] for row in self.get_product_rows()]
 
-    @allure.step('Click on product by name')
+    @page_step('Click on product by name')
     def click_product_by_name(self, product_name):
         """Click on a specific product by name"""
-        products = self.find_elements(HomePageLocators.PRODUCT_TITLES)
-        for product in products:
-            if product_name.lower() in product.text.lower():
+        fields = dict(HomePageLocators.PRODUCT_CARD_FIELDS, link=(".card-title a", "element"))
+        rows = self.extract_rows(HomePageLocators.PRODUCT_CARDS, fields)
+        for row in rows:
+            if product_name.lower() in row["title"].lower():
+                product = row["link"]
                 original_handles = self.driver.window_handles[:]
                 # Clear any alert before navigation
                 self.handle_any_alert()
@@ -45,16 +48,20 @@ class HomePage(BasePage):
                     # scroll and JS click fallback
                     self.driver.execute_script("arguments[0].scrollIntoView(true);", product)
                     self.driver.execute_script("arguments[0].click();", product)
+                self.page_changed()
                 # If click opened a new window/tab, switch to it
                 self.wait_for_new_window_and_switch(original_handles, timeout=5)
                 # Clear any alert that might have popped during navigation
-                self.wait_for_alert_and_accept(timeout=2)
+                if self.dialogs.supported:
+                    self.handle_any_alert()
+                else:
+                    self.wait_for_alert_and_accept(timeout=2)
                 # wait for product page to load by waiting for product name or URL
                 if not self.wait_for_url_contains("prod.html", timeout=5):
                     self.wait_for_element_visible(ProductPageLocators.PRODUCT_NAME, timeout=10)
                 break
 
-    @allure.step('Click on category')
+    @page_step('Click on category')
     def click_category(self, category_name):
         """Click on a specific category"""
         if category_name.lower() == "phones":
@@ -64,15 +71,15 @@ class HomePage(BasePage):
         elif category_name.lower() == "monitors":
             self.click_element(HomePageLocators.MONITORS_CATEGORY)
 
-    @allure.step('Open login modal')
+    @page_step('Open login modal')
     def open_login_modal(self):
-        """Open the login modal"""
+        """Open the login modal; True once it is visible"""
         self.click_element(HomePageLocators.LOGIN_LINK)
-        self.wait_for_element_visible(HomePageLocators.LOGIN_MODAL)
+        return self.wait_for_element_visible(HomePageLocators.LOGIN_MODAL)
 
-    @allure.step('Open signup modal')
+    @page_step('Open signup modal')
     def open_signup_modal(self):
-        """Open the signup modal"""
+        """Open the signup modal; True once it is visible"""
         # Close login modal first if open to avoid intercepted click
         if self.is_element_displayed(HomePageLocators.LOGIN_MODAL):
             # Try close X first, then secondary button
@@ -81,21 +88,16 @@ class HomePage(BasePage):
             except Exception:
                 self.click_element(HomePageLocators.MODAL_CLOSE_BUTTON)
         self.click_element(HomePageLocators.SIGNUP_LINK)
-        self.wait_for_element_visible(HomePageLocators.SIGNUP_MODAL)
+        return self.wait_for_element_visible(HomePageLocators.SIGNUP_MODAL)
 
-    @allure.step('Open cart')
+    @page_step('Open cart')
     def open_cart(self):
         """Open the shopping cart"""
-        # Dismiss possible alert leftovers
-        try:
-            Alert(self.driver).dismiss()
-        except Exception:
-            pass
-        # Also use base alert handler to ensure no blocking alert
+        # Clear possible alert leftovers so they don't block the click
         self.handle_any_alert()
         self.click_element(HomePageLocators.CART_LINK)
 
-    @allure.step('Navigate to contact page')
+    @page_step('Navigate to contact page')
     def navigate_to_contact(self):
         """Navigate to contact page"""
         self.click_element(HomePageLocators.CONTACT_LINK)
@@ -109,7 +111,7 @@ class HomePage(BasePage):
                 except Exception:
                     pass
 
-    @allure.step('Navigate to about us page')
+    @page_step('Navigate to about us page')
     def navigate_to_about_us(self):
         """Navigate to about us page"""
         self.click_element(HomePageLocators.ABOUT_US_LINK)
@@ -120,7 +122,7 @@ class HomePage(BasePage):
             except Exception:
                 pass
 
-    @allure.step('Verify navigation elements are present')
+    @page_step('Verify navigation elements are present')
     def verify_navigation_elements(self):
         """Verify all navigation elements are present"""
         elements_to_check = [
@@ -138,20 +140,20 @@ class HomePage(BasePage):
                 return False
         return True
 
-    @allure.step('Get product count')
+    @page_step('Get product count')
     def get_product_count(self):
         """Get the total number of products displayed"""
         products = self.get_product_cards()
         return len(products)
 
-    @allure.step('Verify footer is present')
+    @page_step('Verify footer is present')
     def verify_footer_present(self):
         """Verify footer is present on the page"""
         # Scroll to bottom to ensure footer is in viewport
         self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
         return self.is_element_displayed(HomePageLocators.FOOTER)
 
-    @allure.step('Get copyright text')
+    @page_step('Get copyright text')
     def get_copyright_text(self):
         """Get copyright text from footer"""
         return self.get_element_text(HomePageLocators.COPYRIGHT_TEXT)
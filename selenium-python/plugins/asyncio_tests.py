@@ -0,0 +1,72 @@
+"""Run ``async def`` tests and drive async browser sessions on one event loop.
+
+Coroutine test functions are awaited on a session-wide event loop, so async
+page objects from ``pages/async_*`` can be used directly in tests. The
+``async_drivers`` factory launches any number of browsers through one
+shared driver executable; all of them are quit when the test ends.
+"""
+import asyncio
+import inspect
+
+import pytest
+
+from base.async_webdriver import AsyncDriverService
+
+event_loop_key = pytest.StashKey()
+
+
+def pytest_configure(config):
+    config.stash[event_loop_key] = asyncio.new_event_loop()
+
+
+def pytest_unconfigure(config):
+    loop = config.stash.get(event_loop_key, None)
+    if loop is not None and not loop.is_closed():
+        loop.close()
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+    arguments = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+    pyfuncitem.config.stash[event_loop_key].run_until_complete(pyfuncitem.obj(**arguments))
+    return True
+
+
+@pytest.fixture(scope="session")
+def event_loop(pytestconfig):
+    """The event loop async tests and async fixtures run on"""
+    return pytestconfig.stash[event_loop_key]
+
+
+@pytest.fixture(scope="session")
+def async_service(event_loop):
+    """One driver executable shared by every async browser session"""
+    service = event_loop.run_until_complete(AsyncDriverService().start())
+    yield service
+    event_loop.run_until_complete(service.stop())
+
+
+@pytest.fixture()
+def async_drivers(event_loop, async_service):
+    """Factory: ``drivers = await async_drivers(10)`` launches browsers concurrently"""
+    launched = []
+
+    async def launch(count=1):
+        drivers = await async_service.new_sessions(count)
+        launched.extend(drivers)
+        return drivers
+
+    yield launch
+    event_loop.run_until_complete(asyncio.gather(*(driver.quit() for driver in launched),
+                                                 return_exceptions=True))
+    for driver in launched:
+        if driver in async_service.sessions:
+            async_service.sessions.remove(driver)
+
+
+@pytest.fixture()
+def async_driver(event_loop, async_drivers):
+    """A single async browser session for one test"""
+    return event_loop.run_until_complete(async_drivers(1))[0]
@@ -0,0 +1,121 @@
+"""Data-driven parametrization from CSV files and Excel sheets.
+
+``@pytest.mark.dataset(path, sheet=None, columns=None, fields=None)``
+parametrizes a test with one case per dataset row, handed to it as the
+``row`` fixture. Only row numbers are collected (ids like ``orders-row42``);
+each case reads its row when it runs (``helpers.data_provider.Dataset``),
+so a 100k-row sheet costs one streaming pass while running and never the
+whole workbook in memory. The row numbers found at collection are kept in
+the pytest cache until the file changes, so only the first collection of a
+new or edited dataset reads it. Relative paths are resolved against the test
+module's directory. A parallel worker only generates the rows in its plan,
+so rows are sharded across workers without each of them building every case.
+"""
+import os
+import re
+
+import pytest
+
+from helpers import data_provider
+from plugins.parallel import WORKER_ENV
+
+ROWS_KEY = "data_provider/rows"
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "dataset(path, sheet=None, columns=None, fields=None): "
+                                       "one test case per row of a CSV file or Excel sheet")
+
+
+class RowRef:
+    """A dataset row by number, read on first use"""
+
+    def __init__(self, dataset, number):
+        self.dataset = dataset
+        self.number = number
+
+    def load(self):
+        return self.dataset.row(self.number)
+
+    def __repr__(self):
+        return f"{self.dataset.name}-row{self.number}"
+
+
+def planned_rows(nodeid, name, plan):
+    """Row numbers of dataset name that a worker's plan holds for the test function nodeid.
+
+    Ids are joined with "-", so this may over-match; extra cases are deselected by the worker plan anyway.
+    """
+    pattern = re.compile(rf"(?:^|-){re.escape(name)}-row(\d+)(?=-|$)")
+    numbers = set()
+    prefix = nodeid + "["
+    for planned in plan:
+        if planned.startswith(prefix) and planned.endswith("]"):
+            numbers.update(int(number) for number in pattern.findall(planned[len(prefix):-1]))
+    return numbers
+
+
+def to_ranges(numbers):
+    """Compress ascending numbers into [first, last] runs"""
+    ranges = []
+    for number in numbers:
+        if ranges and ranges[-1][1] == number - 1:
+            ranges[-1][1] = number
+        else:
+            ranges.append([number, number])
+    return ranges
+
+
+def from_ranges(ranges):
+    return [number for first, last in ranges for number in range(first, last + 1)]
+
+
+def row_numbers(config, dataset):
+    """Non-blank row numbers of a dataset, from the pytest cache while the file is unchanged"""
+    cache = getattr(config, "cache", None)
+    if cache is None:
+        return dataset.row_numbers()
+    stat = os.stat(dataset.path)
+    stamp = [stat.st_size, stat.st_mtime_ns]
+    key = f"{dataset.path}|{dataset.sheet or ''}"
+    known = cache.get(ROWS_KEY, {})
+    if key in known and known[key]["stamp"] == stamp:
+        return from_ranges(known[key]["rows"])
+    numbers = dataset.row_numbers()
+    if os.environ.get(WORKER_ENV) is None:
+        known[key] = {"stamp": stamp, "rows": to_ranges(numbers)}
+        cache.set(ROWS_KEY, known)
+    return numbers
+
+
+def dataset_path(node):
+    """Absolute path of the file a node's @pytest.mark.dataset reads, or None"""
+    marker = node.get_closest_marker("dataset")
+    if marker is None:
+        return None
+    path, = marker.args
+    if not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(str(node.path)), path)
+    return path
+
+
+def pytest_generate_tests(metafunc):
+    path = dataset_path(metafunc.definition)
+    if path is None:
+        return
+    marker = metafunc.definition.get_closest_marker("dataset")
+    dataset = data_provider.load(path, sheet=marker.kwargs.get("sheet"), columns=marker.kwargs.get("columns"),
+                                 fields=marker.kwargs.get("fields"))
+    numbers = row_numbers(metafunc.config, dataset)
+    worker = metafunc.config.pluginmanager.get_plugin("parallel-worker")
+    if worker is not None:
+        wanted = planned_rows(metafunc.definition.nodeid, dataset.name, worker.plan)
+        numbers = [number for number in numbers if number in wanted]
+    refs = [RowRef(dataset, number) for number in numbers]
+    metafunc.parametrize("row", refs, ids=[repr(ref) for ref in refs], indirect=True)
+
+
+@pytest.fixture
+def row(request):
+    """The dataset row of a @pytest.mark.dataset case, as {argument: text}"""
+    return request.param.load()
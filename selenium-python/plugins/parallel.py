@@ -0,0 +1,273 @@
+"""Duration-aware parallel scheduler for the pytest suite.
+
+Run with ``pytest --workers`` (CPU count capped by memory) or ``--workers N``.
+The controller process collects the suite, orders tests longest-first from
+durations recorded on earlier runs, assigns them to N worker processes and
+replays the workers' reports so the terminal output, exit status and cache
+behave as for a serial run. Each worker is a plain pytest process, so it owns
+its own driver pool and ``DriverFactory`` sessions.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import pytest
+from _pytest.reports import TestReport
+
+from utils import session_hub
+from utils.driver_factory import DriverFactory
+from utils.result_cache import is_cached
+
+WORKER_ENV = "PYTEST_PARALLEL_WORKER"
+PLAN_ENV = "PYTEST_PARALLEL_PLAN"
+REPORTS_ENV = "PYTEST_PARALLEL_REPORTS"
+DURATIONS_KEY = "parallel/durations"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("parallel")
+    group.addoption(
+        "--workers",
+        action="store",
+        nargs="?",
+        const="auto",
+        default=None,
+        help="Run tests across N worker processes; 'auto' (or no value) uses the CPU count "
+             "capped by available memory for each worker's browsers",
+    )
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(DurationRecorder(config), "parallel-durations")
+    if os.environ.get(WORKER_ENV) is not None:
+        config.pluginmanager.register(WorkerPlugin(config), "parallel-worker")
+        return
+    workers = config.getoption("workers")
+    if workers is None or config.getoption("collectonly"):
+        return
+    count = default_worker_count() if workers == "auto" else int(workers)
+    if count > 1:
+        config.pluginmanager.register(ControllerPlugin(config, count), "parallel-controller")
+
+
+def get_parallel_config():
+    """Get parallel execution settings from configuration"""
+    defaults = {"memory_per_browser_mb": 600, "default_duration": 5.0}
+    defaults.update(DriverFactory().config.get("parallel", {}))
+    return defaults
+
+
+def available_memory_mb():
+    """Best-effort available physical memory in MB, or None if unknown"""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def browsers_per_worker():
+    """Browsers one worker keeps running: its pooled sessions plus the driver pool's warm spares"""
+    pool = DriverFactory().get_pool_config()
+    if not pool["enabled"]:
+        return 1
+    return max(pool["size"], 1) + pool["spares"]
+
+
+def default_worker_count(memory_per_browser_mb=None, browsers=None):
+    """CPU count capped by how many workers' browsers fit in available memory"""
+    if memory_per_browser_mb is None:
+        memory_per_browser_mb = get_parallel_config()["memory_per_browser_mb"]
+    browsers = browsers_per_worker() if browsers is None else browsers
+    count = os.cpu_count() or 1
+    memory = available_memory_mb()
+    if memory is not None and memory_per_browser_mb:
+        count = min(count, memory // (memory_per_browser_mb * browsers))
+    return max(1, count)
+
+
+def order_longest_first(nodeids, durations, default_duration=5.0):
+    """Order node ids by recorded duration, slowest first; unknown tests use default_duration"""
+    return sorted(nodeids, key=lambda nodeid: durations.get(nodeid, default_duration), reverse=True)
+
+
+def partition(nodeids, durations, workers, default_duration=5.0):
+    """Assign tests to workers longest-first, each to the least loaded worker (LPT)"""
+    plans = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    for nodeid in order_longest_first(nodeids, durations, default_duration):
+        target = loads.index(min(loads))
+        plans[target].append(nodeid)
+        loads[target] += durations.get(nodeid, default_duration)
+    return plans
+
+
+class DurationRecorder:
+    """Record per-test wall time in the pytest cache for later scheduling"""
+
+    def __init__(self, config):
+        self.config = config
+        self.durations = {}
+
+    def pytest_runtest_logreport(self, report):
+        if is_cached(report):
+            # A replayed pass says nothing about how long the test takes to run
+            return
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0.0) + report.duration
+
+    def pytest_sessionfinish(self, session):
+        cache = getattr(self.config, "cache", None)
+        if cache is None or not self.durations or os.environ.get(WORKER_ENV) is not None:
+            return
+        stored = cache.get(DURATIONS_KEY, {})
+        stored.update(self.durations)
+        cache.set(DURATIONS_KEY, stored)
+
+
+class WorkerPlugin:
+    """Run only the tests planned for this worker and stream reports to the controller"""
+
+    def __init__(self, config):
+        self.config = config
+        with open(os.environ[PLAN_ENV]) as f:
+            self.plan = json.load(f)
+        self.reports = open(os.environ[REPORTS_ENV], "a", buffering=1)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        position = {nodeid: index for index, nodeid in enumerate(self.plan)}
+        selected = [item for item in items if item.nodeid in position]
+        selected.sort(key=lambda item: position[item.nodeid])
+        deselected = [item for item in items if item.nodeid not in position]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+    def pytest_runtest_logreport(self, report):
+        data = self.config.hook.pytest_report_to_serializable(config=self.config, report=report)
+        self.reports.write(json.dumps(data) + "\n")
+
+    def pytest_unconfigure(self):
+        self.reports.close()
+
+
+class ControllerPlugin:
+    """Distribute collected tests to worker processes and replay their reports"""
+
+    def __init__(self, config, workers):
+        self.config = config
+        self.workers = workers
+        self.settings = get_parallel_config()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        if session.testsfailed and not session.config.option.continue_on_collection_errors:
+            return None
+        items = {item.nodeid: item for item in session.items}
+        durations = self.config.cache.get(DURATIONS_KEY, {}) if hasattr(self.config, "cache") else {}
+        plans = [plan for plan in partition(list(items), durations, min(self.workers, len(items)) or 1,
+                                            self.settings["default_duration"]) if plan]
+        factory = DriverFactory()
+        if factory.get_remote_config()['enabled']:
+            # Start the hub here so every worker's sessions queue on one set of nodes
+            session_hub.hub_url(factory)
+        workdir = tempfile.mkdtemp(prefix="pytest-parallel-")
+        try:
+            workers = [self._spawn(index, plan, workdir) for index, plan in enumerate(plans)]
+            self._replay(session, workers, items)
+        finally:
+            self._merge_allure_results(len(plans))
+            shutil.rmtree(workdir, ignore_errors=True)
+        return True
+
+    def _spawn(self, index, plan, workdir):
+        plan_path = os.path.join(workdir, f"plan-{index}.json")
+        reports_path = os.path.join(workdir, f"reports-{index}.jsonl")
+        with open(plan_path, "w") as f:
+            json.dump(plan, f)
+        open(reports_path, "w").close()
+        env = dict(os.environ, **{WORKER_ENV: str(index), PLAN_ENV: plan_path, REPORTS_ENV: reports_path})
+        args = [sys.executable, "-m", "pytest", *self.config.invocation_params.args]
+        allure_dir = self._allure_dir()
+        if allure_dir:
+            args.append(f"--alluredir={self._worker_allure_dir(index)}")
+        log = open(os.path.join(workdir, f"worker-{index}.log"), "w")
+        process = subprocess.Popen(args, cwd=str(self.config.invocation_params.dir), env=env,
+                                   stdout=log, stderr=subprocess.STDOUT)
+        return {"index": index, "plan": plan, "process": process, "reports": open(reports_path),
+                "log": log, "seen": set(), "partial": ""}
+
+    def _replay(self, session, workers, items):
+        running = list(workers)
+        while running:
+            for worker in list(running):
+                finished = worker["process"].poll() is not None
+                self._drain(worker)
+                if finished:
+                    self._drain(worker)
+                    self._report_lost_tests(session, worker, items)
+                    worker["reports"].close()
+                    worker["log"].close()
+                    running.remove(worker)
+            if session.shouldfail or session.shouldstop:
+                for worker in running:
+                    worker["process"].terminate()
+            time.sleep(0.05)
+
+    def _drain(self, worker):
+        hook = self.config.hook
+        chunk = worker["partial"] + worker["reports"].read()
+        lines = chunk.split("\n")
+        # The last element is empty or a line the worker has not finished writing
+        worker["partial"] = lines.pop()
+        for line in lines:
+            report = hook.pytest_report_from_serializable(config=self.config, data=json.loads(line))
+            if report.when == "setup":
+                hook.pytest_runtest_logstart(nodeid=report.nodeid, location=report.location)
+            hook.pytest_runtest_logreport(report=report)
+            if report.when == "teardown":
+                worker["seen"].add(report.nodeid)
+                hook.pytest_runtest_logfinish(nodeid=report.nodeid, location=report.location)
+
+    def _report_lost_tests(self, session, worker, items):
+        if session.shouldfail or session.shouldstop:
+            # -x or --maxfail stopped the run; the tests left were never meant to run
+            return
+        exit_code = worker["process"].returncode
+        for nodeid in worker["plan"]:
+            if nodeid in worker["seen"] or nodeid not in items:
+                continue
+            item = items[nodeid]
+            report = TestReport(nodeid, item.location, {}, "failed",
+                                f"worker {worker['index']} exited with code {exit_code} before finishing",
+                                "call")
+            self.config.hook.pytest_runtest_logreport(report=report)
+
+    def _allure_dir(self):
+        return getattr(self.config.option, "allure_report_dir", None)
+
+    def _worker_allure_dir(self, index):
+        return os.path.join(self._allure_dir(), f".worker-{index}")
+
+    def _merge_allure_results(self, workers):
+        """Move every worker's Allure results into the main results directory"""
+        allure_dir = self._allure_dir()
+        if not allure_dir:
+            return
+        for index in range(workers):
+            worker_dir = self._worker_allure_dir(index)
+            if not os.path.isdir(worker_dir):
+                continue
+            for name in os.listdir(worker_dir):
+                os.replace(os.path.join(worker_dir, name), os.path.join(allure_dir, name))
+            shutil.rmtree(worker_dir, ignore_errors=True)
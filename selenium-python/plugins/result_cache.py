@@ -0,0 +1,115 @@
+"""Reuse passing results of tests whose inputs have not changed.
+
+Against the hermetic stand-in site a test's outcome depends only on the
+framework code and the fixture data, so a pass is stored in the pytest cache
+under the test's fingerprint (``utils.result_cache.Fingerprinter``). On the
+next run a test with the same fingerprint is reported as passed without
+running; editing a page object, a locator, ``TestData``, config.json, a
+fixture file, a page script or a test's dataset file changes the fingerprint
+of every test that depends on it.
+``--no-result-cache`` runs everything. Only clean passes are stored: a test
+that needed a step retry, or that failed, always runs again.
+"""
+import os
+
+import pytest
+
+from plugins.data_provider import dataset_path
+from plugins.parallel import WORKER_ENV
+from utils.driver_factory import DriverFactory
+from utils.result_cache import CACHED_PROPERTY, Fingerprinter, ResultCache, is_cached
+
+ENTRIES_KEY = "result_cache/passes"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("result cache")
+    group.addoption(
+        "--no-result-cache",
+        action="store_true",
+        default=False,
+        help="Run every test even when a pass with the same inputs is cached",
+    )
+
+
+def pytest_configure(config):
+    factory = DriverFactory()
+    settings = factory.get_result_cache_config()
+    hermetic = factory.get_stand_in_config()["enabled"] or config.getoption("stand_in", False)
+    cache = getattr(config, "cache", None)
+    if not settings["enabled"] or cache is None or (settings["hermetic_only"] and not hermetic):
+        return
+    entries = ResultCache(cache.get(ENTRIES_KEY, {}), settings["max_entries"])
+    config.pluginmanager.register(ResultCachePlugin(config, settings, entries), "result-cache")
+
+
+class ResultCachePlugin:
+
+    def __init__(self, config, settings, cache):
+        self.config = config
+        self.settings = settings
+        self.cache = cache
+        self.bypass = config.getoption("no_result_cache")
+        self.fingerprinter = Fingerprinter()
+        self.fingerprints = {}
+        self.outcomes = {}
+        self.replayed = []
+
+    def pytest_collection_modifyitems(self, config, items):
+        for item in items:
+            if item.nodeid.startswith(tuple(self.settings["paths"])):
+                dataset = dataset_path(item)
+                self.fingerprints[item.nodeid] = self.fingerprinter.fingerprint(
+                    str(item.path), inputs=[dataset] if dataset else ())
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        fingerprint = self.fingerprints.get(item.nodeid)
+        if self.bypass or fingerprint is None or self.cache.lookup(item.nodeid, fingerprint) is None:
+            return None
+        item.ihook.pytest_runtest_logstart(nodeid=item.nodeid, location=item.location)
+        # Fixtures the previous test left set up for this one are torn down as the runner would
+        teardown = pytest.CallInfo.from_call(lambda: item.session._setupstate.teardown_exact(nextitem), "teardown")
+        keywords = {name: 1 for name in item.keywords}
+        for when in ("setup", "call", "teardown"):
+            failed = when == "teardown" and teardown.excinfo is not None
+            report = pytest.TestReport(item.nodeid, item.location, keywords, "failed" if failed else "passed",
+                                       str(teardown.excinfo.value) if failed else None, when,
+                                       user_properties=[(CACHED_PROPERTY, fingerprint)])
+            item.ihook.pytest_runtest_logreport(report=report)
+        item.ihook.pytest_runtest_logfinish(nodeid=item.nodeid, location=item.location)
+        return True
+
+    def pytest_runtest_logreport(self, report):
+        if report.nodeid not in self.fingerprints:
+            return
+        if is_cached(report):
+            if report.when == "teardown":
+                self.replayed.append(report.nodeid)
+            return
+        outcome = self.outcomes.setdefault(report.nodeid, {"passed": True, "duration": 0.0})
+        outcome["duration"] += report.duration
+        retried = any(name == "step_retries" for name, _ in report.user_properties)
+        if not report.passed or hasattr(report, "wasxfail") or retried:
+            outcome["passed"] = False
+
+    def pytest_sessionfinish(self, session):
+        if os.environ.get(WORKER_ENV) is not None:
+            return
+        for nodeid in self.replayed:
+            self.cache.touch(nodeid)
+        for nodeid, outcome in self.outcomes.items():
+            if outcome["passed"]:
+                self.cache.store(nodeid, self.fingerprints[nodeid], outcome["duration"])
+            else:
+                self.cache.forget(nodeid)
+        self.config.cache.set(ENTRIES_KEY, self.cache.entries)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.replayed:
+            return
+        terminalreporter.write_sep("-", "result cache")
+        terminalreporter.write_line(
+            f"{len(self.replayed)} cached passes reused, ~{self.cache.saved_seconds(self.replayed):.1f}s saved; "
+            f"{len(self.outcomes)} tests ran, {len(self.cache.entries)}/{self.cache.max_entries} entries"
+            + (f", {self.cache.evicted} evicted" if self.cache.evicted else ""))
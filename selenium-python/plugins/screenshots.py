@@ -0,0 +1,61 @@
+"""Failure and success screenshots through the background screenshot pipeline.
+
+Honors ``test_config.screenshot_on_failure`` and ``screenshot_on_success``
+in config.json. The screenshot is taken when the test's outcome is known and
+handed to ``utils.screenshots``; hashing, compression and the disk write
+happen on the pipeline's writer thread. Every stored frame of a test
+(including ``BasePage.take_screenshot`` ones) is attached to its Allure
+result in the teardown report; teardown waits at most ``attach_timeout`` in
+all, and frames stored after that are counted as late in the summary.
+"""
+import os
+
+import allure
+import pytest
+
+from utils.driver_factory import DriverFactory
+from utils.screenshots import get_pipeline, running_pipeline
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(ScreenshotPlugin(DriverFactory().get_screenshot_config()), "screenshots")
+
+
+class ScreenshotPlugin:
+
+    def __init__(self, settings):
+        self.settings = settings
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        # Frames taken by page objects during this test belong to it
+        get_pipeline().stream = item.nodeid
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        report = (yield).get_result()
+        if report.when == "call" or (report.when == "setup" and report.failed):
+            wanted = self.settings["on_failure"] if report.failed else self.settings["on_success"] and report.passed
+            driver = item.funcargs.get("driver")
+            if wanted and driver is not None:
+                try:
+                    get_pipeline().capture(driver, f"{item.name} {report.outcome}", item.nodeid)
+                except Exception:
+                    # The session may be what broke; the report matters more than the picture
+                    pass
+        if report.when == "teardown":
+            for frame in get_pipeline().collect(item.nodeid):
+                allure.attach.file(frame.path, name=frame.name, attachment_type=frame.mime_type,
+                                   extension=os.path.splitext(frame.path)[1][1:])
+
+    def pytest_terminal_summary(self, terminalreporter):
+        pipeline = running_pipeline()
+        if pipeline is not None and pipeline.captured:
+            pipeline.flush()
+            terminalreporter.write_sep("-", "screenshots")
+            terminalreporter.write_line(pipeline.report())
+
+    def pytest_unconfigure(self, config):
+        pipeline = running_pipeline()
+        if pipeline is not None:
+            pipeline.close()
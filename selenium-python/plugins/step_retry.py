@@ -0,0 +1,107 @@
+"""Flakiness statistics and quarantine for the step retry engine.
+
+Every test run is classified as clean, flaky (it passed only because
+``base.step_retry`` re-ran a step) or failed, and the last
+``step_retry.quarantine_window`` classifications per test are kept in the
+pytest cache. A test that was flaky in ``quarantine_after`` of them is
+quarantined: it still runs, but without step retries and as a non-strict
+xfail, so it cannot fail the build or spend time on retries until clean runs
+push its flakes out of the window. A quarantined failure counts as failed, and
+a test that failed its last ``quarantine_after`` runs leaves quarantine: that
+is a regression, not flakiness.
+"""
+import os
+
+import pytest
+
+from plugins.parallel import WORKER_ENV
+from utils.driver_factory import DriverFactory
+from utils.result_cache import is_cached
+
+HISTORY_KEY = "step_retry/history"
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "quarantined: flaky test that runs without step retries as a non-strict xfail")
+    config.pluginmanager.register(FlakeTracker(config, DriverFactory().get_retry_config()), "step-retry")
+
+
+def is_failing(history, settings):
+    """Whether a test failed each of its last quarantine_after runs"""
+    recent = history[-settings["quarantine_after"]:]
+    return len(recent) == settings["quarantine_after"] and all(run == "failed" for run in recent)
+
+
+def is_quarantined(history, settings):
+    """Whether a test's recent classifications hold enough flakes to quarantine it"""
+    return history.count("flaky") >= settings["quarantine_after"] and not is_failing(history, settings)
+
+
+def classify(outcome, retried):
+    """Classify one run as clean, flaky or failed"""
+    if outcome == "failed":
+        return "failed"
+    return "flaky" if retried else "clean"
+
+
+class FlakeTracker:
+
+    def __init__(self, config, settings):
+        self.config = config
+        self.settings = settings
+        cache = getattr(config, "cache", None)
+        self.history = cache.get(HISTORY_KEY, {}) if cache is not None else {}
+        self.outcomes = {}
+        self.retries = {}
+
+    def pytest_collection_modifyitems(self, config, items):
+        for item in items:
+            history = self.history.get(item.nodeid, [])
+            if is_quarantined(history, self.settings):
+                reason = f"quarantined: flaky in {history.count('flaky')} of its last {len(history)} runs"
+                item.add_marker(pytest.mark.quarantined)
+                item.add_marker(pytest.mark.xfail(reason=reason, strict=False))
+
+    def pytest_runtest_logreport(self, report):
+        if is_cached(report):
+            return
+        if report.failed or (report.skipped and hasattr(report, "wasxfail")):
+            self.outcomes[report.nodeid] = "failed"
+        elif report.when == "call" and report.passed:
+            self.outcomes.setdefault(report.nodeid, "passed")
+        if report.when == "teardown":
+            for name, value in report.user_properties:
+                if name == "step_retries":
+                    self.retries[report.nodeid] = value
+
+    def classifications(self):
+        """Classify this session's runs by nodeid"""
+        return {nodeid: classify(outcome, nodeid in self.retries) for nodeid, outcome in self.outcomes.items()}
+
+    def pytest_sessionfinish(self, session):
+        cache = getattr(self.config, "cache", None)
+        if cache is None or not self.outcomes or os.environ.get(WORKER_ENV) is not None:
+            return
+        window = self.settings["quarantine_window"]
+        for nodeid, classification in self.classifications().items():
+            self.history[nodeid] = (self.history.get(nodeid, []) + [classification])[-window:]
+        cache.set(HISTORY_KEY, self.history)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        quarantined = sorted(nodeid for nodeid in self.outcomes
+                             if is_quarantined(self.history.get(nodeid, []), self.settings))
+        # Flaky enough to be quarantined, but failing every time lately
+        failing = sorted(nodeid for nodeid in self.outcomes
+                         if self.history.get(nodeid, []).count("flaky") >= self.settings["quarantine_after"]
+                         and is_failing(self.history.get(nodeid, []), self.settings))
+        if not self.retries and not quarantined and not failing:
+            return
+        terminalreporter.write_sep("-", "step retries")
+        for nodeid, events in sorted(self.retries.items()):
+            steps = ", ".join(f"{event['step']} ({event['error']}, {event['action']})" for event in events)
+            terminalreporter.write_line(f"{nodeid} [{self.outcomes.get(nodeid, 'unknown')}]: {steps}")
+        for nodeid in quarantined:
+            terminalreporter.write_line(f"{nodeid}: quarantined")
+        for nodeid in failing:
+            terminalreporter.write_line(f"{nodeid}: out of quarantine, failed its last "
+                                        f"{self.settings['quarantine_after']} runs")
@@ -0,0 +1,278 @@
+"""Per-step latency instrumentation for the page-object suite.
+
+Every ``allure.step`` (page-object methods and ``BasePage`` actions alike) is
+timed with a monotonic nanosecond clock, together with the number of
+WebDriver commands and the time spent in ``WaitPolicy`` waits while it was
+open. Page-object steps are keyed ``Page.method`` as recorded by the
+``base.step_retry`` wrapper, other steps by their title. At session end the
+records are aggregated into per-test and per-method p50/p95/p99 histograms
+plus a per-page-class total, and written as JSON. Enabled by ``reporting.json`` in config.json or ``--step-timings``.
+"""
+import glob
+import json
+import math
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import allure_commons
+import pytest
+
+from base import wait_policy
+from base.step_retry import step_owner
+from plugins.parallel import WORKER_ENV
+from utils import command_events
+from utils.driver_factory import DriverFactory
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("step timings")
+    group.addoption(
+        "--step-timings",
+        action="store",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="Write per-step latency histograms as JSON (default path from config.json reporting.json_path)",
+    )
+
+
+def pytest_configure(config):
+    settings = DriverFactory().get_reporting_config()
+    path = config.getoption("step_timings")
+    if path is None and not settings["json"]:
+        return
+    plugin = StepTimingPlugin(config, path or settings["json_path"])
+    config.pluginmanager.register(plugin, "step-timings")
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def histogram(values):
+    """p50/p95/p99/max summary of durations in milliseconds"""
+    return {
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "max_ms": round(max(values), 3) if values else 0.0,
+    }
+
+
+class StepRecorder:
+    """Allure step listener that times steps and counts the driver work done inside them"""
+
+    def __init__(self):
+        self.records = []
+        self.tests = {}
+        self.current_test = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _test_totals(self):
+        return self.tests.setdefault(self.current_test, {"duration_ms": 0.0, "commands": 0, "wait_ms": 0.0})
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        stack = self._stack()
+        page, method = step_owner(uuid)
+        inside_page = any(step["page"] for step in stack)
+        stack.append({
+            "uuid": uuid,
+            "step": f"{page}.{method}" if page else title.split(":", 1)[0].strip(),
+            "page": page,
+            "top_level": page is not None and not inside_page,
+            "depth": len(stack),
+            "start": time.perf_counter_ns(),
+            "commands": 0,
+            "wait_ns": 0,
+        })
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        end = time.perf_counter_ns()
+        stack = self._stack()
+        for index in range(len(stack) - 1, -1, -1):
+            if stack[index]["uuid"] == uuid:
+                step = stack.pop(index)
+                break
+        else:
+            return
+        with self._lock:
+            self.records.append({
+                "test": self.current_test,
+                "step": step["step"],
+                "page": step["page"],
+                "top_level": step["top_level"],
+                "depth": step["depth"],
+                "duration_ms": (end - step["start"]) / 1e6,
+                "commands": step["commands"],
+                "wait_ms": step["wait_ns"] / 1e6,
+                "failed": exc_type is not None,
+            })
+
+    def on_command(self, driver, command, params, duration, error):
+        for step in self._stack():
+            step["commands"] += 1
+        if self.current_test is not None:
+            with self._lock:
+                self._test_totals()["commands"] += 1
+
+    def on_wait(self, policy, duration, timed_out):
+        for step in self._stack():
+            step["wait_ns"] += int(duration * 1e9)
+        if self.current_test is not None:
+            with self._lock:
+                self._test_totals()["wait_ms"] += duration * 1000
+
+    def start_test(self, nodeid):
+        self.current_test = nodeid
+        with self._lock:
+            self._test_totals()
+
+    def finish_test(self, duration):
+        with self._lock:
+            self._test_totals()["duration_ms"] += duration * 1000
+        self.current_test = None
+
+    def raw(self):
+        with self._lock:
+            return {"records": list(self.records), "tests": dict(self.tests)}
+
+
+def summarize(records, tests):
+    """Aggregate raw step records into the per-page, per-method and per-test report"""
+    methods = {}
+    pages = {}
+    per_test = {nodeid: dict(totals, steps=0, step_durations=[], pages={}) for nodeid, totals in tests.items()}
+    for record in records:
+        methods.setdefault(record["step"], []).append(record)
+        if record["test"] is not None:
+            test = per_test.setdefault(record["test"], {"duration_ms": 0.0, "commands": 0, "wait_ms": 0.0,
+                                                        "steps": 0, "step_durations": [], "pages": {}})
+            test["steps"] += 1
+            test["step_durations"].append(record["duration_ms"])
+        if record["top_level"]:
+            page = pages.setdefault(record["page"], {"total_ms": 0.0, "steps": 0, "commands": 0, "wait_ms": 0.0})
+            page["total_ms"] += record["duration_ms"]
+            page["steps"] += 1
+            page["commands"] += record["commands"]
+            page["wait_ms"] += record["wait_ms"]
+            if record["test"] is not None:
+                test_pages = per_test[record["test"]]["pages"]
+                test_pages[record["page"]] = round(test_pages.get(record["page"], 0.0) + record["duration_ms"], 3)
+
+    page_time = sum(page["total_ms"] for page in pages.values()) or 1.0
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "steps": len(records),
+        "pages": {},
+        "methods": {},
+        "tests": {},
+    }
+    for name, page in sorted(pages.items(), key=lambda entry: entry[1]["total_ms"], reverse=True):
+        report["pages"][name] = {
+            "total_ms": round(page["total_ms"], 3),
+            "share": round(page["total_ms"] / page_time, 4),
+            "steps": page["steps"],
+            "commands": page["commands"],
+            "wait_ms": round(page["wait_ms"], 3),
+        }
+    for name, entries in sorted(methods.items(), key=lambda entry: sum(r["duration_ms"] for r in entry[1]),
+                                reverse=True):
+        durations = [entry["duration_ms"] for entry in entries]
+        report["methods"][name] = dict(
+            count=len(entries),
+            total_ms=round(sum(durations), 3),
+            **histogram(durations),
+            commands=sum(entry["commands"] for entry in entries),
+            wait_ms=round(sum(entry["wait_ms"] for entry in entries), 3),
+            failed=sum(1 for entry in entries if entry["failed"]),
+        )
+    for nodeid, test in sorted(per_test.items()):
+        report["tests"][nodeid] = dict(
+            duration_ms=round(test["duration_ms"], 3),
+            commands=test["commands"],
+            wait_ms=round(test["wait_ms"], 3),
+            steps=test["steps"],
+            **histogram(test["step_durations"]),
+            pages=test["pages"],
+        )
+    return report
+
+
+class StepTimingPlugin:
+    """Wire the recorder into allure, the driver command stream and pytest's test lifecycle"""
+
+    def __init__(self, config, path):
+        self.config = config
+        self.path = path
+        self.worker = os.environ.get(WORKER_ENV)
+        self.recorder = StepRecorder()
+        self.report = None
+        allure_commons.plugin_manager.register(self.recorder)
+        command_events.add_listener(self.recorder.on_command)
+        wait_policy.add_wait_listener(self.recorder.on_wait)
+        if self.worker is None:
+            for stale in glob.glob(f"{self.path}.worker-*"):
+                os.remove(stale)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self.recorder.start_test(item.nodeid)
+        start = time.perf_counter()
+        yield
+        self.recorder.finish_test(time.perf_counter() - start)
+
+    def pytest_sessionfinish(self, session):
+        raw = self.recorder.raw()
+        if self.worker is not None:
+            self._write(f"{self.path}.worker-{self.worker}", raw)
+            return
+        # Merge what parallel workers recorded, if the suite ran in worker processes
+        for part in sorted(glob.glob(f"{self.path}.worker-*")):
+            with open(part) as f:
+                data = json.load(f)
+            raw["records"].extend(data["records"])
+            raw["tests"].update(data["tests"])
+            os.remove(part)
+        if not raw["records"] and not raw["tests"]:
+            return
+        self.report = summarize(raw["records"], raw["tests"])
+        self._write(self.path, self.report)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.report or not self.report["pages"]:
+            return
+        terminalreporter.write_sep("-", "step timings")
+        for name, page in self.report["pages"].items():
+            terminalreporter.write_line(
+                f"{name:<14} {page['total_ms'] / 1000:8.2f}s {page['share']:6.1%}  "
+                f"{page['steps']} steps, {page['commands']} commands, {page['wait_ms'] / 1000:.2f}s waiting")
+        terminalreporter.write_line(f"Step timings written to {self.path}")
+
+    def pytest_unconfigure(self):
+        allure_commons.plugin_manager.unregister(self.recorder)
+        command_events.remove_listener(self.recorder.on_command)
+        wait_policy.remove_wait_listener(self.recorder.on_wait)
+
+    @staticmethod
+    def _write(path, data):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
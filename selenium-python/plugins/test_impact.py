@@ -0,0 +1,157 @@
+"""Test-impact index: record what each test exercised, run only what a diff affects.
+
+With ``--record-impact`` (or ``test_impact.record``) each test's page-object
+method calls (``Page.method``, any method of a class in ``pages/``, seen by a
+profile hook while the test runs) and locator constants
+(``Locators.CONSTANT``, from ``compile_locator``) are collected and written to
+the SQLite index at ``test_impact.database``. ``--affected-by REF`` maps ``git diff REF`` onto
+those symbols and deselects the tests it cannot affect; changes to anything
+but page objects, locator classes and test files (``base/``, ``utils/``,
+conftest, config.json, ...) select every test.
+"""
+import importlib
+import inspect
+import os
+import pkgutil
+import sys
+
+import pytest
+
+import pages
+from locators import registry
+from plugins.parallel import WORKER_ENV
+from utils import impact_index
+from utils.result_cache import is_cached
+from utils.driver_factory import DriverFactory
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("test impact")
+    group.addoption(
+        "--affected-by",
+        action="store",
+        default=None,
+        metavar="REF",
+        help="Run only tests affected by changes since git REF, per the recorded test-impact index",
+    )
+    group.addoption(
+        "--record-impact",
+        action="store_true",
+        default=False,
+        help="Record which page-object methods and locators each test uses in the test-impact index",
+    )
+
+
+def pytest_configure(config):
+    settings = DriverFactory().get_impact_config()
+    settings["record"] = settings["record"] or config.getoption("record_impact")
+    if not settings["record"] and config.getoption("affected_by") is None:
+        return
+    plugin = ImpactRecorder(config, settings)
+    config.pluginmanager.register(plugin, "test-impact")
+    registry.add_observer(plugin.on_locator)
+
+
+def page_methods():
+    """Map the code of every method defined by a class in ``pages/`` to its 'Page.method' name"""
+    methods = {}
+    for module_info in pkgutil.iter_modules(pages.__path__):
+        module = importlib.import_module(f"{pages.__name__}.{module_info.name}")
+        for page in vars(module).values():
+            if not inspect.isclass(page) or page.__module__ != module.__name__:
+                continue
+            for name, member in vars(page).items():
+                if inspect.isfunction(member):
+                    # Look through @page_step and the retry wrapper to the method's own code
+                    methods[inspect.unwrap(member).__code__] = f"{page.__name__}.{name}"
+    return methods
+
+
+class ImpactRecorder:
+    """Collect the page-object methods and locators each test uses and keep the index"""
+
+    def __init__(self, config, settings):
+        self.config = config
+        self.settings = settings
+        self.current = None
+        self.runs = {}
+        self.deselected = 0
+        self.selected_by = None
+        self.methods = page_methods() if settings["record"] else {}
+
+    def on_call(self, frame, event, arg):
+        # Helpers and async page objects have no Allure step, so watch the calls themselves
+        if event == "call" and self.current is not None:
+            method = self.methods.get(frame.f_code)
+            if method is not None:
+                self.current[1].add(("method", method))
+
+    def on_locator(self, locator):
+        if self.current is not None:
+            name = registry.get_registry().name_of(locator)
+            if name is not None:
+                self.current[1].add(("locator", name))
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        ref = config.getoption("affected_by")
+        if ref is None or os.environ.get(WORKER_ENV) is not None:
+            return
+        change = impact_index.changes_since(ref)
+        index = impact_index.ImpactIndex(self.settings["database"])
+        try:
+            selected = set(impact_index.select([item.nodeid for item in items], change, index))
+        finally:
+            index.close()
+        deselected = [item for item in items if item.nodeid not in selected]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if item.nodeid in selected]
+        self.deselected = len(deselected)
+        self.selected_by = change
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self.current = self.runs[item.nodeid] = ["passed", set()]
+        previous = sys.getprofile()
+        if self.methods:
+            sys.setprofile(self.on_call)
+        try:
+            yield
+        finally:
+            if self.methods:
+                sys.setprofile(previous)
+            self.current = None
+
+    def pytest_runtest_logreport(self, report):
+        if is_cached(report):
+            # Nothing ran, so the recorded symbols stay as they are
+            self.runs.pop(report.nodeid, None)
+            return
+        run = self.runs.get(report.nodeid)
+        if run is not None and (report.failed or report.skipped):
+            # A run that stopped early may not have reached everything the test uses
+            run[0] = "failed"
+
+    def pytest_sessionfinish(self, session):
+        if not self.settings["record"] or not self.runs:
+            return
+        index = impact_index.ImpactIndex(self.settings["database"])
+        try:
+            index.record(self.runs)
+        finally:
+            index.close()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        change = self.selected_by
+        if change is None:
+            return
+        terminalreporter.write_sep("-", "test impact")
+        if change.everything:
+            terminalreporter.write_line(f"all tests selected: {', '.join(change.everything[:5])} changed")
+        else:
+            terminalreporter.write_line(f"{self.deselected} tests deselected; changed: "
+                                        f"{', '.join(sorted(name for _, name in change.symbols)) or 'tests only'}")
+
+    def pytest_unconfigure(self, config):
+        registry.remove_observer(self.on_locator)
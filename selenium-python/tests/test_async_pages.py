@@ -0,0 +1,40 @@
+import asyncio
+import allure
+from pages.async_home_page import AsyncHomePage
+from pages.async_product_page import AsyncProductPage
+from helpers.test_data import TestData
+
+SESSIONS = 4
+
+
+@allure.epic("DemoBlaze E-commerce")
+@allure.feature("Async Sessions")
+class TestAsyncPages:
+
+    @allure.story("Concurrent Sessions")
+    @allure.severity(allure.severity_level.NORMAL)
+    async def test_home_page_in_many_sessions(self, base_url, async_drivers):
+        """Test that several browsers driven from one event loop all load the catalog"""
+        pages = [AsyncHomePage(driver) for driver in await async_drivers(SESSIONS)]
+        await asyncio.gather(*(page.open(base_url) for page in pages))
+        titles = await asyncio.gather(*(page.get_title() for page in pages))
+        products = await asyncio.gather(*(page.get_product_titles() for page in pages))
+        assert all(TestData.PAGE_TITLES["home"] in title for title in titles)
+        assert all(product_titles == products[0] and product_titles for product_titles in products)
+
+    @allure.story("Concurrent Sessions")
+    @allure.severity(allure.severity_level.NORMAL)
+    async def test_product_details_in_each_session(self, base_url, async_drivers):
+        """Test opening a different product in each session concurrently"""
+        drivers = await async_drivers(2)
+
+        async def open_product(driver, name):
+            home_page = AsyncHomePage(driver)
+            await home_page.open(base_url)
+            assert await home_page.click_product_by_name(name)
+            product_page = AsyncProductPage(driver)
+            assert await product_page.verify_product_details_loaded()
+            return await product_page.get_product_name()
+
+        names = await asyncio.gather(open_product(drivers[0], "Nexus 6"), open_product(drivers[1], "Sony vaio i5"))
+        assert names == ["Nexus 6", "Sony vaio i5"]
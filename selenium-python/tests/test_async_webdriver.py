@@ -0,0 +1,122 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from selenium.common.exceptions import NoAlertPresentException, NoSuchElementException
+from base.async_webdriver import ELEMENT_KEY, AsyncDriverService, AsyncHttpClient, AsyncWebDriver, AsyncWebElement
+from pages.async_home_page import AsyncHomePage
+
+
+class FakeDriverHandler(BaseHTTPRequestHandler):
+    """Just enough of the W3C WebDriver protocol to exercise the async client"""
+    protocol_version = "HTTP/1.1"
+    sessions = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, value):
+        body = json.dumps({"value": value}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _route(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        path = self.path
+        if method == "POST" and path == "/session":
+            FakeDriverHandler.sessions += 1
+            return self._reply(200, {"sessionId": f"s{FakeDriverHandler.sessions}", "capabilities": {}})
+        command = path.split("/", 3)[3] if path.count("/") >= 3 else ""
+        if method == "GET" and command == "title":
+            return self._reply(200, "STORE")
+        if method == "POST" and command == "element":
+            if body["value"] == ".missing":
+                return self._reply(404, {"error": "no such element", "message": "no such element", "stacktrace": ""})
+            return self._reply(200, {ELEMENT_KEY: "e1"})
+        if method == "GET" and command == "element/e1/text":
+            return self._reply(200, "Samsung galaxy s6")
+        if method == "POST" and command == "execute/sync":
+            return self._reply(200, [{"title": "Samsung galaxy s6", "price": "$360"},
+                                     {"title": "Nokia lumia 1520", "price": "$820"}])
+        if method == "GET" and command == "alert/text":
+            return self._reply(404, {"error": "no such alert", "message": "no such alert", "stacktrace": ""})
+        if method in ("POST", "DELETE"):
+            return self._reply(200, None)
+        return self._reply(404, {"error": "unknown command", "message": path, "stacktrace": ""})
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    def do_DELETE(self):
+        self._route("DELETE")
+
+
+@pytest.fixture(scope="module")
+def fake_driver_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeDriverHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestAsyncWebDriver:
+
+    async def test_commands_and_elements(self, fake_driver_url):
+        client = AsyncHttpClient(fake_driver_url)
+        driver = await AsyncWebDriver.start(client, {"browserName": "chrome"})
+        await driver.get("http://shop.test/")
+        assert await driver.title() == "STORE"
+        element = await driver.find_element("id", "tbodyid")
+        assert isinstance(element, AsyncWebElement)
+        assert await element.text() == "Samsung galaxy s6"
+        await driver.quit()
+        await client.close()
+        # Every command went over one keep-alive connection
+        assert client.requests == 6
+        assert client.connections == 1
+
+    async def test_errors_raise_selenium_exceptions(self, fake_driver_url):
+        client = AsyncHttpClient(fake_driver_url)
+        driver = await AsyncWebDriver.start(client, {})
+        with pytest.raises(NoSuchElementException):
+            await driver.find_element("css selector", ".missing")
+        with pytest.raises(NoAlertPresentException):
+            await driver.alert_text()
+        await client.close()
+
+    async def test_many_sessions_share_a_bounded_pool(self, fake_driver_url):
+        client = AsyncHttpClient(fake_driver_url, connections=4)
+        drivers = await asyncio.gather(*(AsyncWebDriver.start(client, {}) for _ in range(20)))
+        titles = await asyncio.gather(*(driver.title() for driver in drivers))
+        assert titles == ["STORE"] * 20
+        assert len({driver.session_id for driver in drivers}) == 20
+        assert client.connections <= 4
+        await client.close()
+
+    async def test_concurrent_launches_respect_the_session_limit(self, fake_driver_url):
+        service = await AsyncDriverService(url=fake_driver_url).start()
+        service.settings = dict(service.settings, max_sessions=2)
+        results = await asyncio.gather(*(service.new_session() for _ in range(3)), return_exceptions=True)
+        assert sum(isinstance(result, AsyncWebDriver) for result in results) == 2
+        assert "session limit" in str(next(result for result in results if isinstance(result, Exception)))
+        assert len(service.sessions) == 2
+        await service.stop()
+
+    async def test_async_page_object_reuses_locators(self, fake_driver_url):
+        client = AsyncHttpClient(fake_driver_url)
+        page = AsyncHomePage(await AsyncWebDriver.start(client, {}))
+        page.timeout = 0.2
+        assert await page.get_product_titles() == ["Samsung galaxy s6", "Nokia lumia 1520"]
+        assert await page.get_element_text(("css selector", "#tbodyid")) == "Samsung galaxy s6"
+        assert not await page.is_element_present(("css selector", ".missing"), timeout=0.2)
+        await client.close()
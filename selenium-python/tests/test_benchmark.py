@@ -0,0 +1,66 @@
+from utils import command_events
+from utils.benchmark import Benchmark, append_history, load_baseline, load_history, save_baseline, trend
+
+SETTINGS = {"rounds": 3, "warmup": 1, "time_tolerance": 0.25, "command_tolerance": 0.0, "min_regression_ms": 5}
+
+
+class FakeDriver:
+
+    def execute(self, driver_command, params=None):
+        return {"value": None}
+
+
+def run_method(bench, driver, commands):
+    def method():
+        for _ in range(commands):
+            driver.execute("findElement")
+    bench.run("HomePage.get_product_titles", method, setup=lambda: driver.execute("get"))
+
+
+class TestBenchmark:
+
+    def test_counts_commands_of_timed_rounds_only(self):
+        bench = Benchmark(SETTINGS)
+        try:
+            run_method(bench, command_events.attach(FakeDriver()), 4)
+        finally:
+            bench.close()
+        result = bench.results["HomePage.get_product_titles"]
+        assert result["rounds"] == 3
+        assert result["commands"] == 4
+
+    def test_command_and_time_regressions(self):
+        bench = Benchmark(SETTINGS)
+        bench.close()
+        bench.results = {
+            "A.fast": {"median_ms": 12.0, "commands": 3},
+            "A.slow": {"median_ms": 200.0, "commands": 3},
+            "A.chatty": {"median_ms": 10.0, "commands": 9},
+            "A.new": {"median_ms": 10.0, "commands": 9},
+        }
+        baseline = {"methods": {
+            "A.fast": {"median_ms": 10.0, "commands": 3},
+            "A.slow": {"median_ms": 100.0, "commands": 3},
+            "A.chatty": {"median_ms": 10.0, "commands": 3},
+        }}
+        messages = bench.regressions(baseline)
+        assert len(messages) == 3
+        assert messages[0].startswith("A.slow: median")
+        assert messages[1] == "A.chatty: 9 WebDriver commands, baseline 3"
+        assert messages[2] == "A.new: no baseline entry; record one with --update-baseline"
+        assert bench.regressions(baseline, ["A.fast"]) == []
+
+    def test_baseline_history_and_trend(self, tmp_path):
+        baseline_path = str(tmp_path / "baseline.json")
+        history_path = str(tmp_path / "history.jsonl")
+        assert load_baseline(baseline_path) == {"methods": {}}
+
+        save_baseline(baseline_path, {"A.x": {"median_ms": 10.0, "commands": 2}},
+                      {"methods": {"A.y": {"median_ms": 1.0, "commands": 1}}})
+        assert sorted(load_baseline(baseline_path)["methods"]) == ["A.x", "A.y"]
+
+        append_history(history_path, {"A.x": {"median_ms": 10.0, "commands": 2}})
+        append_history(history_path, {"A.x": {"median_ms": 15.0, "commands": 2}})
+        table = trend(load_history(history_path))
+        assert "| A.x | 10.0ms / 2 | 15.0ms / 2 | +50% |" in table
+        assert trend([]) == "No benchmark runs recorded yet."
@@ -0,0 +1,72 @@
+import pytest
+import allure
+from pages.cart_page import CartPage
+from helpers.assertions import Assertions
+from helpers.data_provider import PURCHASE_FIELDS
+
+@pytest.fixture()
+def cart_page(driver):
+    return CartPage(driver)
+
+@allure.epic("DemoBlaze E-commerce")
+@allure.feature("Cart Page")
+class TestCartPage:
+
+    @allure.story("Cart Contents")
+    @allure.severity(allure.severity_level.CRITICAL)
+    def test_seeded_items_are_listed(self, driver, base_url, seeder, cart_page):
+        """Test that items added through the API are listed in the cart"""
+        with allure.step("Seed cart with two products"):
+            seeder.add_products_by_name(["Samsung galaxy s6", "Nokia lumia 1520"])
+
+        with allure.step("Open cart"):
+            cart_page.open(f"{base_url}/cart.html")
+
+        with allure.step("Verify cart rows and total"):
+            names = cart_page.get_cart_item_names()
+            Assertions.assert_list_length(names, 2)
+            assert sorted(names) == ["Nokia lumia 1520", "Samsung galaxy s6"]
+            Assertions.assert_text_equals(cart_page.get_cart_total(), str(sum(cart_page.get_cart_item_prices())))
+
+    @allure.story("Cart Contents")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_delete_item_from_cart(self, driver, base_url, seeder, cart_page):
+        """Test deleting one item from a seeded cart"""
+        with allure.step("Seed cart with three products"):
+            seeder.add_first_products(3)
+
+        with allure.step("Open cart and delete first item"):
+            cart_page.open(f"{base_url}/cart.html")
+            Assertions.assert_list_length(cart_page.get_cart_rows(), 3)
+            cart_page.delete_item_from_cart(0)
+
+        with allure.step("Verify one item was removed"):
+            Assertions.assert_list_length(seeder.view_cart(), 2)
+
+    @allure.story("Place Order")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_place_order_button_present(self, driver, base_url, seeder, cart_page):
+        """Test that place order is offered for a non-empty cart"""
+        with allure.step("Seed cart with one product"):
+            seeder.add_first_products(1)
+
+        with allure.step("Open cart"):
+            cart_page.open(f"{base_url}/cart.html")
+
+        with allure.step("Verify place order button is present"):
+            assert cart_page.verify_place_order_button_present(), "Place order button not present"
+
+    @allure.story("Place Order")
+    @allure.severity(allure.severity_level.CRITICAL)
+    @pytest.mark.dataset("data/orders.csv", fields=PURCHASE_FIELDS)
+    def test_purchase_order_from_dataset(self, driver, base_url, seeder, cart_page, row):
+        """Test completing a purchase with each order in tests/data/orders.csv"""
+        with allure.step("Seed cart with one product"):
+            seeder.add_first_products(1)
+
+        with allure.step(f"Purchase as {row['name']}"):
+            cart_page.open(f"{base_url}/cart.html")
+            cart_page.complete_purchase(**row)
+
+        with allure.step("Verify the cart was emptied by the order"):
+            Assertions.assert_list_length(seeder.view_cart(), 0)
@@ -0,0 +1,77 @@
+import openpyxl
+import pytest
+from helpers.data_provider import PURCHASE_FIELDS, Dataset, argument_name, cell_text
+from plugins.data_provider import from_ranges, planned_rows, to_ranges
+
+HEADER = ["Name", "Country", "City", "Card", "Month", "Year", "Notes"]
+ORDERS = [
+    ["John Doe", "United States", "New York", 1234567890123456, 12, 2025, "first"],
+    [None, None, None, None, None, None, None],
+    ["Ana Silva", "Portugal", "Lisbon", 4111111111111111, 3.0, 2027, None],
+]
+
+
+def _workbook(path):
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Orders")
+    sheet.append(HEADER)
+    for order in ORDERS:
+        sheet.append(order)
+    workbook.save(path)
+    return str(path)
+
+
+def _csv(path):
+    path.write_text("\n".join(",".join(cell_text(cell) for cell in line)
+                              for line in [HEADER] + ORDERS) + "\n")
+    return str(path)
+
+
+def test_headers_and_cells_become_typed_text():
+    assert argument_name(" Credit Card ") == "credit_card"
+    assert [cell_text(value) for value in (None, 12.0, 3, "x")] == ["", "12", "3", "x"]
+
+
+@pytest.mark.parametrize("make", [_workbook, _csv], ids=["xlsx", "csv"])
+def test_rows_stream_with_column_mapping(tmp_path, make):
+    path = make(tmp_path / ("orders.xlsx" if make is _workbook else "orders.csv"))
+    dataset = Dataset(path, sheet="Orders", columns={"Card": "credit_card"}, fields=PURCHASE_FIELDS)
+    rows = list(dataset.rows())
+    # The blank row is skipped but keeps its number
+    assert [number for number, _ in rows] == [1, 3]
+    assert rows[1][1] == {"name": "Ana Silva", "country": "Portugal", "city": "Lisbon",
+                          "credit_card": "4111111111111111", "month": "3", "year": "2027"}
+    assert dataset.row_numbers() == [1, 3]
+    assert dataset.row(3)["name"] == "Ana Silva"
+    assert dataset.row(1)["name"] == "John Doe"
+    dataset.close()
+
+
+def test_missing_field_is_reported(tmp_path):
+    dataset = Dataset(_csv(tmp_path / "orders.csv"), fields=PURCHASE_FIELDS)
+    with pytest.raises(ValueError, match="credit_card"):
+        dataset.row_numbers()
+
+
+def test_row_reads_forward_from_the_cursor(tmp_path):
+    path = tmp_path / "orders.csv"
+    path.write_text("name\n" + "".join(f"user{number}\n" for number in range(1, 1001)))
+    dataset = Dataset(str(path))
+    assert [dataset.row(number)["name"] for number in (10, 11, 500)] == ["user10", "user11", "user500"]
+    assert dataset._position == 500
+    assert dataset.row(2)["name"] == "user2"
+    with pytest.raises(LookupError):
+        dataset.row(1001)
+
+
+def test_worker_generates_only_planned_rows():
+    plan = ["tests/test_cart_page.py::TestCartPage::test_purchase[orders-row7]",
+            "tests/test_cart_page.py::TestCartPage::test_purchase[orders-row12-chrome]",
+            "tests/test_cart_page.py::TestCartPage::test_other[orders-row3]"]
+    assert planned_rows("tests/test_cart_page.py::TestCartPage::test_purchase", "orders", plan) == {7, 12}
+
+
+def test_row_numbers_compress_to_ranges():
+    numbers = [1, 2, 3, 5, 8, 9]
+    assert to_ranges(numbers) == [[1, 3], [5, 5], [8, 9]]
+    assert from_ranges(to_ranges(numbers)) == numbers
@@ -0,0 +1,60 @@
+import json
+import urllib.request
+import pytest
+from utils.demoblaze_server import DemoBlazeServer
+
+
+@pytest.fixture(scope="module")
+def server():
+    with DemoBlazeServer() as server:
+        yield server
+
+
+def call(server, path, body=None):
+    data = None if body is None else json.dumps(body).encode()
+    request = urllib.request.Request(server.base_url + path, data=data,
+                                     headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+class TestDemoBlazeServer:
+
+    def test_serves_pages_with_shared_layout(self, server):
+        with urllib.request.urlopen(server.base_url + "/index.html") as response:
+            page = response.read().decode()
+        assert "<title>STORE</title>" in page
+        assert 'id="cartur"' in page and 'id="fotcont"' in page
+        assert "{{header}}" not in page
+
+    def test_entries_returns_first_page_of_catalog(self, server):
+        items = call(server, "/entries")["Items"]
+        assert len(items) == 9
+        assert items[0]["title"] == "Samsung galaxy s6"
+
+    def test_bycat_and_view(self, server):
+        monitors = call(server, "/bycat", {"cat": "monitor"})["Items"]
+        assert {item["title"] for item in monitors} == {"Apple monitor 24", "ASUS Full HD"}
+        assert call(server, "/view", {"id": "3"})["title"] == "Nexus 6"
+
+    def test_cart_round_trip(self, server):
+        call(server, "/addtocart", {"id": "a", "cookie": "shopper", "prod_id": 1, "flag": False})
+        call(server, "/addtocart", {"id": "b", "cookie": "shopper", "prod_id": 2, "flag": False})
+        call(server, "/addtocart", {"id": "c", "cookie": "someone-else", "prod_id": 3, "flag": False})
+        assert [item["prod_id"] for item in call(server, "/viewcart", {"cookie": "shopper"})["Items"]] == [1, 2]
+        call(server, "/deleteitem", {"id": "a"})
+        assert [item["id"] for item in call(server, "/viewcart", {"cookie": "shopper"})["Items"]] == ["b"]
+        call(server, "/deletecart", {"cookie": "shopper"})
+        assert call(server, "/viewcart", {"cookie": "shopper"})["Items"] == []
+        assert len(call(server, "/viewcart", {"cookie": "someone-else"})["Items"]) == 1
+
+    def test_partials_are_not_served(self, server):
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(server.base_url + "/_header.html")
+
+    def test_non_numeric_product_id_is_a_bad_request(self, server):
+        for path, body in (("/view", {"id": "abc"}), ("/addtocart", {"id": "x", "cookie": "c", "prod_id": None})):
+            with pytest.raises(urllib.error.HTTPError) as error:
+                call(server, path, body)
+            assert error.value.code == 400
+        assert call(server, "/view", {"id": "3"})["title"] == "Nexus 6"
@@ -0,0 +1,88 @@
+import threading
+import pytest
+from base.dialogs import DialogWatcher
+
+
+class FakeBrowsingContext:
+    """Keeps the BiDi event handlers and closes a prompt when it is handled, like the browser"""
+
+    def __init__(self, close_on_handle=True):
+        self.handlers = {}
+        self.handled = []
+        self.close_on_handle = close_on_handle
+
+    def add_event_handler(self, event, handler):
+        self.handlers[event] = handler
+
+    def open(self, message, context="ctx", type="alert"):
+        self.handlers["user_prompt_opened"]({"context": context, "message": message, "type": type})
+
+    def handle_user_prompt(self, context, accept):
+        self.handled.append((context, accept))
+        if self.close_on_handle:
+            self.handlers["user_prompt_closed"]({"context": context, "accepted": accept})
+
+
+class FakeDriver:
+
+    def __init__(self, bidi=True, close_on_handle=True):
+        self.caps = {"webSocketUrl": "ws://localhost/session"} if bidi else {}
+        self.browsing_context = FakeBrowsingContext(close_on_handle)
+
+
+def test_without_bidi_the_watcher_is_unsupported():
+    assert not DialogWatcher(FakeDriver(bidi=False)).supported
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError, match="Dialog policy"):
+        DialogWatcher(FakeDriver(), policy="ignore")
+
+
+def test_accept_policy_answers_a_dialog_the_moment_it_opens():
+    driver = FakeDriver()
+    watcher = DialogWatcher(driver)
+    driver.browsing_context.open("Product added")
+    assert driver.browsing_context.handled == [("ctx", True)]
+    assert watcher.open_dialog() is None
+    dialog = watcher.next_dialog(timeout=0)
+    assert (dialog.message, dialog.handled, dialog.accepted) == ("Product added", True, True)
+
+
+def test_manual_policy_leaves_the_dialog_open_for_the_caller():
+    driver = FakeDriver()
+    watcher = DialogWatcher(driver, policy="manual")
+    driver.browsing_context.open("Delete item?", type="confirm")
+    dialog = watcher.open_dialog()
+    assert dialog.type == "confirm" and not dialog.handled
+    assert watcher.dismiss()
+    assert driver.browsing_context.handled == [("ctx", False)]
+    assert watcher.open_dialog() is None
+    assert not watcher.dismiss(dialog)
+
+
+def test_next_dialog_skips_dialogs_up_to_the_mark():
+    driver = FakeDriver()
+    watcher = DialogWatcher(driver)
+    driver.browsing_context.open("Old alert")
+    mark = watcher.mark()
+    driver.browsing_context.open("New alert")
+    assert watcher.next_dialog(timeout=0, after=mark).message == "New alert"
+    assert watcher.next_dialog(timeout=0) is None
+
+
+def test_next_dialog_wakes_up_when_a_dialog_opens():
+    driver = FakeDriver()
+    watcher = DialogWatcher(driver)
+    threading.Timer(0.05, driver.browsing_context.open, ["Sign up successful."]).start()
+    assert watcher.next_dialog(timeout=5).message == "Sign up successful."
+
+
+def test_wait_until_closed_times_out_while_a_dialog_stays_open():
+    driver = FakeDriver(close_on_handle=False)
+    watcher = DialogWatcher(driver, policy="manual")
+    driver.browsing_context.open("Still here")
+    assert not watcher.wait_until_closed(timeout=0.05)
+    watcher.clear()
+    assert watcher.wait_until_closed(timeout=0)
+    assert watcher.next_dialog(timeout=0) is None
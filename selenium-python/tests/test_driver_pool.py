@@ -0,0 +1,173 @@
+import threading
+import time
+from utils.driver_factory import DriverPool
+
+
+class FakeDriver:
+
+    def __init__(self, number):
+        self.number = number
+        self.quit_called = False
+
+    @property
+    def window_handles(self):
+        if self.quit_called:
+            raise Exception("session deleted")
+        return ["main"]
+
+    def maximize_window(self):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeFactory:
+    """Counts launches; each one takes launch_time seconds"""
+    config = {"browser": "chrome"}
+
+    def __init__(self, launch_time=0.0):
+        self.launch_time = launch_time
+        self.drivers = []
+        self._lock = threading.Lock()
+
+    def get_pool_config(self):
+        return {"enabled": False, "size": 1, "max_reuse": 25, "health_check": True,
+                "spares": 1, "spare_max_idle": 300, "spare_wait": 30}
+
+    def get_driver(self, browser=None, instrument=True):
+        time.sleep(self.launch_time)
+        with self._lock:
+            driver = FakeDriver(len(self.drivers))
+            self.drivers.append(driver)
+        return self.instrument(driver) if instrument else driver
+
+    def instrument(self, driver):
+        driver.instrumented_on = threading.current_thread().name
+        return driver
+
+
+def wait_for_spares(pool, count, browser="chrome"):
+    deadline = time.monotonic() + 5
+    while len(pool._spares.get(browser, [])) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+class TestWarmSpares:
+
+    def test_replacement_comes_from_a_warm_spare(self):
+        factory = FakeFactory(launch_time=0.2)
+        pool = DriverPool(factory)
+        first = pool.acquire()
+        wait_for_spares(pool, 1)
+        pool.release(first)
+
+        started = time.monotonic()
+        second = pool.acquire()
+        assert time.monotonic() - started < 0.1
+        assert second is not first and first.quit_called
+        assert pool.spares_used == 1
+        pool.shutdown()
+        assert all(driver.quit_called for driver in factory.drivers)
+
+    def test_lease_waits_for_a_spare_already_starting(self):
+        factory = FakeFactory(launch_time=0.2)
+        pool = DriverPool(factory)
+        pool.release(pool.acquire())
+        # A spare is starting in the background; the lease takes it instead of launching another
+        pool.acquire()
+        assert pool.spares_used == 1
+        pool.shutdown()
+
+    def test_idle_spares_are_retired(self):
+        factory = FakeFactory()
+        pool = DriverPool(factory, spares=2, spare_max_idle=0.05)
+        driver = pool.acquire()
+        wait_for_spares(pool, 2)
+        time.sleep(0.1)
+        pool.release(driver)
+        assert pool.spares_expired == 2
+        assert sum(driver.quit_called for driver in factory.drivers) == 3
+        pool.shutdown()
+
+    def test_no_spares_when_disabled(self):
+        factory = FakeFactory()
+        pool = DriverPool(factory, spares=0)
+        pool.release(pool.acquire())
+        pool.acquire()
+        assert len(factory.drivers) == 2 and pool.spares_used == 0
+        pool.shutdown()
+
+    def test_lease_stops_waiting_for_a_slow_spare(self):
+        factory = FakeFactory(launch_time=0.3)
+        pool = DriverPool(factory, spare_wait=0.05)
+        pool.release(pool.acquire())
+        started = time.monotonic()
+        pool.acquire()
+        # Waited spare_wait, then launched in the foreground rather than for as long as the spare takes
+        assert pool.spares_used == 0
+        assert time.monotonic() - started < 0.55
+        pool.shutdown()
+
+    def test_spares_are_instrumented_by_the_thread_that_leases_them(self):
+        factory = FakeFactory()
+        pool = DriverPool(factory)
+        first = pool.acquire()
+        wait_for_spares(pool, 1)
+        spare = pool._spares["chrome"][0][0]
+        assert not hasattr(spare, "instrumented_on")
+        pool.release(first)
+        assert pool.acquire() is spare
+        assert spare.instrumented_on == threading.current_thread().name
+        pool.shutdown()
+
+    def test_launches_saved_counts_reused_sessions_only(self):
+        factory = FakeFactory()
+        pool = DriverPool(factory, enabled=True)
+        pool.reset_driver = lambda driver: True
+        for _ in range(3):
+            pool.release(pool.acquire())
+        wait_for_spares(pool, 1)
+        # One browser served all three leases; the spare launched beside it saved nothing
+        assert pool.launches == 2
+        assert pool.launches_saved == 2
+        pool.shutdown()
+
+
+class FakeSwitch:
+
+    alert = None
+
+    def window(self, handle):
+        pass
+
+
+class CdpDriver(FakeDriver):
+    """Records the CDP commands a reset sends"""
+
+    def __init__(self):
+        super().__init__(0)
+        self.switch_to = FakeSwitch()
+        self.cdp = []
+
+    def execute_script(self, script):
+        pass
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp.append((command, params.get("origin")))
+
+    def get(self, url):
+        pass
+
+
+class TestReset:
+
+    def test_reset_clears_storage_of_the_site_origins(self):
+        factory = FakeFactory()
+        factory.get_base_url = lambda: "http://127.0.0.1:8000"
+        factory.get_api_url = lambda: "https://api.demoblaze.com/"
+        driver = CdpDriver()
+        assert DriverPool(factory, spares=0).reset_driver(driver)
+        assert driver.cdp == [("Network.clearBrowserCookies", None),
+                              ("Storage.clearDataForOrigin", "http://127.0.0.1:8000"),
+                              ("Storage.clearDataForOrigin", "https://api.demoblaze.com")]
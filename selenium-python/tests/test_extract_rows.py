@@ -0,0 +1,92 @@
+import json
+import shutil
+import subprocess
+import pytest
+from selenium.webdriver.common.by import By
+from base.base_page import BasePage
+from base.scripts import load_script
+from locators.cart_page_locators import CartPageLocators
+from locators.home_page_locators import HomePageLocators
+
+# A document of two cart rows: each row maps a CSS selector to the element it finds
+FAKE_DOM = """
+function element(props) {
+  return {innerText: props.text, innerHTML: props.html || '', href: props.href,
+          getAttribute: function (name) { return (props.attrs || {})[name] || null; }};
+}
+function row(cells) {
+  var el = element({text: 'row'});
+  el.querySelector = function (selector) { return cells[selector] ? element(cells[selector]) : null; };
+  return el;
+}
+var rows = [
+  row({'td:nth-child(2)': {text: ' Nokia lumia 1520 '}, 'td:nth-child(3)': {text: '820'},
+       'td:nth-child(4) a': {attrs: {onclick: "deleteItem('a1-b2')"}}}),
+  row({'td:nth-child(2)': {text: 'Sony vaio i5'}, 'td:nth-child(3)': {text: '790'}})
+];
+var document = {querySelectorAll: function (selector) { return selector === '#tbodyid > tr' ? rows : []; }};
+"""
+
+
+class FakeDriver:
+    """Returns the queued extract_rows results in order and answers everything else as an empty page"""
+
+    def __init__(self, *results, matches=()):
+        self.results = list(results)
+        self.matches = list(matches)
+        self.scripts = []
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def execute_script(self, script, *args):
+        self.scripts.append(args)
+        return self.results.pop(0)
+
+    def execute_async_script(self, script, *args):
+        return {"met": True, "inflight": 0, "seq": 0, "request": None}
+
+    def find_elements(self, by, value):
+        return list(self.matches)
+
+
+def _run_in_node(by, value, fields):
+    program = (FAKE_DOM + "var result = (function () {" + load_script('extract_rows') + "}).apply(null, "
+               + json.dumps([by, value, fields]) + ");\nconsole.log(JSON.stringify(result));")
+    output = subprocess.run(["node", "-e", program], capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node to run the page script")
+def test_script_reads_each_field_relative_to_its_row():
+    fields = {name: list(field) + [None] * (3 - len(field))
+              for name, field in CartPageLocators.CART_ITEM_ROW_FIELDS.items()}
+    rows = _run_in_node("css selector", "#tbodyid > tr", fields)
+    assert rows == [{"name": "Nokia lumia 1520", "price": "820", "delete_id": "a1-b2"},
+                    {"name": "Sony vaio i5", "price": "790", "delete_id": None}]
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="needs node to run the page script")
+def test_script_returns_no_rows_when_nothing_matches():
+    assert _run_in_node("css selector", ".card", {"title": [".card-title", "text", None]}) == []
+
+
+def test_fields_are_padded_and_the_locator_is_compiled():
+    driver = FakeDriver([{"title": "Nexus 6"}])
+    rows = BasePage(driver).extract_rows((By.XPATH, "//div[@class='card']"), {"title": (".card-title", "text")})
+    assert rows == [{"title": "Nexus 6"}]
+    assert driver.scripts == [("css selector", "div[class='card']", {"title": [".card-title", "text", None]})]
+
+
+def test_rows_are_read_again_once_they_render():
+    driver = FakeDriver([], [{"title": "Nexus 6"}], matches=[object()])
+    page = BasePage(driver)
+    assert page.extract_rows(HomePageLocators.PRODUCT_CARDS, HomePageLocators.PRODUCT_CARD_FIELDS) == \
+        [{"title": "Nexus 6"}]
+    assert len(driver.scripts) == 2
+
+
+def test_an_empty_list_costs_one_read():
+    driver = FakeDriver([])
+    assert BasePage(driver).extract_rows(CartPageLocators.CART_ITEM_ROWS, CartPageLocators.CART_ITEM_ROW_FIELDS) == []
+    assert len(driver.scripts) == 1
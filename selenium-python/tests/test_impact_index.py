@@ -0,0 +1,147 @@
+import subprocess
+from types import SimpleNamespace
+import pytest
+from locators.product_page_locators import ProductPageLocators
+from pages.product_page import ProductPage
+from plugins.test_impact import ImpactRecorder
+from utils.impact_index import ImpactIndex, changes_since, parse_diff, select, touched
+
+PAGE = '''from locators.home_page_locators import HomePageLocators
+
+
+class HomePage:
+
+    def open(self):
+        self.click_element(HomePageLocators.HOME_LINK)
+
+    def get_products(self):
+        return self.find_elements(HomePageLocators.PRODUCTS)
+
+    def _wait_for_products(self):
+        return self.wait_for_dom_change(HomePageLocators.PRODUCTS, ("present",))
+'''
+
+LOCATORS = '''class HomePageLocators:
+    HOME_LINK = ("id", "home")
+    PRODUCTS = ("css selector", ".card")
+'''
+
+TEST = '''class TestHome:
+
+    def test_open(self, home_page):
+        home_page.open()
+
+    def test_products(self, home_page):
+        assert home_page.get_products()
+'''
+
+
+def _git(cwd, *args):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+
+def _repo(tmp_path):
+    for path, source in {"pages/home_page.py": PAGE, "locators/home_page_locators.py": LOCATORS,
+                         "tests/test_home.py": TEST, "base/base_page.py": "class BasePage:\n    pass\n"}.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(source)
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "base")
+    return tmp_path
+
+
+def _index(tmp_path):
+    index = ImpactIndex(str(tmp_path / "impact.sqlite"))
+    index.record({
+        "tests/test_home.py::TestHome::test_open": ("passed", {("method", "HomePage.open"),
+                                                               ("locator", "HomePageLocators.HOME_LINK")}),
+        "tests/test_home.py::TestHome::test_products": ("passed", {("method", "HomePage.get_products"),
+                                                                   ("method", "HomePage._wait_for_products")}),
+    })
+    return index
+
+
+def test_parse_diff_maps_hunks_to_old_and_new_lines():
+    diff = ("--- a/pages/home_page.py\n+++ b/pages/home_page.py\n"
+            "@@ -7 +7,2 @@ class HomePage:\n-x\n+y\n+z\n"
+            "@@ -12,2 +13,0 @@\n-a\n-b\n"
+            "--- a/old.py\n+++ /dev/null\n@@ -1,3 +0,0 @@\n")
+    files = parse_diff(diff)
+    assert files["pages/home_page.py"] == ({7, 12, 13}, {7, 8, 13, 14})
+    assert files["old.py"] == ({1, 2, 3}, None)
+
+
+def test_touched_names_methods_locators_and_whole_classes():
+    assert touched(PAGE, {7}) == {("method", "HomePage.open")}
+    assert touched(LOCATORS, {3}) == {("locator", "HomePageLocators.PRODUCTS")}
+    # An import can change every class in the module
+    assert touched(PAGE, {1}) == {("class", "HomePage")}
+
+
+def test_selects_tests_that_used_changed_symbols(tmp_path):
+    repo = _repo(tmp_path / "repo")
+    index = _index(tmp_path)
+    nodeids = ["tests/test_home.py::TestHome::test_open", "tests/test_home.py::TestHome::test_products",
+               "tests/test_new.py::test_unrecorded"]
+
+    (repo / "pages/home_page.py").write_text(PAGE.replace("find_elements(", "find_elements_quickly("))
+    change = changes_since("HEAD", cwd=repo)
+    assert select(nodeids, change, index, references={}) == nodeids[1:]
+
+
+def test_locator_change_selects_tests_through_static_references(tmp_path):
+    repo = _repo(tmp_path / "repo")
+    index = _index(tmp_path)
+    (repo / "locators/home_page_locators.py").write_text(LOCATORS.replace(".card", ".card-block"))
+    change = changes_since("HEAD", cwd=repo)
+    assert change.symbols == {("locator", "HomePageLocators.PRODUCTS")}
+    # test_products never compiled PRODUCTS itself, but get_products refers to it
+    references = {"HomePageLocators.PRODUCTS": {"HomePage.get_products"}}
+    assert select(["tests/test_home.py::TestHome::test_open", "tests/test_home.py::TestHome::test_products"],
+                  change, index, references) == ["tests/test_home.py::TestHome::test_products"]
+
+
+def test_changed_test_function_and_shared_code(tmp_path):
+    repo = _repo(tmp_path / "repo")
+    index = _index(tmp_path)
+    nodeids = ["tests/test_home.py::TestHome::test_open", "tests/test_home.py::TestHome::test_products"]
+    (repo / "tests/test_home.py").write_text(TEST.replace("home_page.open()", "home_page.open()\n        pass"))
+    assert select(nodeids, changes_since("HEAD", cwd=repo), index, references={}) == nodeids[:1]
+
+    (repo / "base/base_page.py").write_text("class BasePage:\n    timeout = 5\n")
+    change = changes_since("HEAD", cwd=repo)
+    assert change.everything == ["base/base_page.py"]
+    assert select(nodeids, change, index, references={}) == nodeids
+
+
+def test_failed_run_adds_to_recorded_symbols(tmp_path):
+    index = _index(tmp_path)
+    nodeid = "tests/test_home.py::TestHome::test_open"
+    index.record({nodeid: ("failed", {("method", "HomePage.get_products")})})
+    assert ("method", "HomePage.open") in index.symbols_of(nodeid)
+    index.record({nodeid: ("passed", {("method", "HomePage.get_products")})})
+    assert index.symbols_of(nodeid) == {("method", "HomePage.get_products")}
+    index.close()
+
+
+def test_recorder_sees_page_helpers_without_a_step(tmp_path):
+    recorder = ImpactRecorder(None, {"record": True, "database": str(tmp_path / "impact.sqlite")})
+    page = ProductPage.__new__(ProductPage)
+    page.wait_for_request = lambda *args, **kwargs: {"url": "http://shop.test/view", "status": 200}
+    protocol = recorder.pytest_runtest_protocol(SimpleNamespace(nodeid="tests/test_product.py::test_name"), None)
+    next(protocol)
+    page._wait_for_details(ProductPageLocators.PRODUCT_NAME)
+    with pytest.raises(StopIteration):
+        next(protocol)
+    assert recorder.runs["tests/test_product.py::test_name"][1] == {("method", "ProductPage._wait_for_details")}
+
+
+def test_helper_change_selects_the_tests_that_called_it(tmp_path):
+    repo = _repo(tmp_path / "repo")
+    index = _index(tmp_path)
+    (repo / "pages/home_page.py").write_text(PAGE.replace('("present",)', '("count_at_least", 1)'))
+    change = changes_since("HEAD", cwd=repo)
+    assert change.symbols == {("method", "HomePage._wait_for_products")}
+    assert select(["tests/test_home.py::TestHome::test_open", "tests/test_home.py::TestHome::test_products"],
+                  change, index, references={}) == ["tests/test_home.py::TestHome::test_products"]
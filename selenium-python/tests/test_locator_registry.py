@@ -0,0 +1,48 @@
+import pytest
+from selenium.webdriver.common.by import By
+from locators.cart_page_locators import CartPageLocators
+from locators.home_page_locators import HomePageLocators
+from locators.registry import LocatorRegistry, get_registry, xpath_to_css
+
+
+class TestLocatorRegistry:
+
+    @pytest.mark.parametrize("xpath, css", [
+        ("//tr[@class='success']", "tr[class='success']"),
+        ("//tr[@class='success']/td[2]", "tr[class='success'] > td:nth-of-type(2)"),
+        ("//div[@id='logInModal']//button[@class='close']", "div#logInModal button[class='close']"),
+        ("//div[contains(@class,'modal') and contains(@class,'show')]", "div[class*='modal'][class*='show']"),
+        ("//input[starts-with(@name, 'user')]", "input[name^='user']"),
+        ("//tr/td[2][@class='x']", "tr > td:nth-of-type(2)[class='x']"),
+    ])
+    def test_translates_attribute_xpaths_to_css(self, xpath, css):
+        assert xpath_to_css(xpath) == css
+
+    @pytest.mark.parametrize("xpath", [
+        "//a[contains(text(), 'Home')]",
+        "//a[contains(text(), 'Add to cart')]/following-sibling::a",
+        "//div[@id='fotcont']//*[contains(.,'Copyright') or self::p]",
+        "//*[2]",
+        "//td[@class='x'][2]",
+        "/html/body",
+    ])
+    def test_keeps_xpaths_css_cannot_express(self, xpath):
+        assert xpath_to_css(xpath) is None
+
+    def test_id_xpath_becomes_id_lookup(self):
+        assert LocatorRegistry().compile((By.XPATH, "//*[@id='totalp']")) == (By.ID, "totalp")
+
+    def test_registry_loads_locator_classes(self):
+        registry = get_registry()
+        assert registry.name_of(CartPageLocators.CART_ITEM_ROWS) == "CartPageLocators.CART_ITEM_ROWS"
+        assert registry.compile(CartPageLocators.CART_ITEM_ROWS) == (By.CSS_SELECTOR, "tr[class='success']")
+        assert registry.compile(HomePageLocators.HOME_LINK) == HomePageLocators.HOME_LINK
+
+    @pytest.mark.parametrize("locator", [
+        ("nonsense", "x"),
+        (By.ID, ""),
+        (By.XPATH, "//a[contains(text(), 'Home')"),
+    ])
+    def test_validation_rejects_malformed_locators(self, locator):
+        with pytest.raises(ValueError):
+            LocatorRegistry.validate(locator)
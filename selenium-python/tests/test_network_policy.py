@@ -0,0 +1,81 @@
+from utils.network_policy import NetworkPolicy, format_bytes, resource_type
+
+SETTINGS = {
+    "enabled": True,
+    "block_types": ["image", "media"],
+    "deny": ["*://*.youtube.com/*"],
+    "allow": ["*://shop.test/imgs/logo.png"],
+    "rewrite": [{"pattern": "*://cdn.test/app.js", "url": "http://shop.test/app.js"}],
+}
+
+
+class FakeDriver:
+    caps = {}
+
+
+class FakeRequest:
+
+    def __init__(self, url, resource_type=None):
+        self.url = url
+        self.resource_type = resource_type
+        self.failed = False
+        self.new_url = None
+
+    def fail(self):
+        self.failed = True
+
+    def set_url(self, url):
+        self.new_url = url
+
+
+def make_policy():
+    return NetworkPolicy.for_driver(FakeDriver()).install(SETTINGS)
+
+
+class TestNetworkPolicy:
+
+    def test_resource_type_prefers_reported_destination(self):
+        assert resource_type("http://shop.test/a.PNG?v=2") == "image"
+        assert resource_type("http://shop.test/front.mp4") == "media"
+        assert resource_type("http://shop.test/api", "video") == "media"
+        assert resource_type("http://shop.test/") is None
+
+    def test_rules_in_order(self):
+        policy = make_policy()
+        assert policy.decide("http://shop.test/imgs/galaxy_s6.jpg") == ("block", "http://shop.test/imgs/galaxy_s6.jpg")
+        assert policy.decide("http://shop.test/imgs/logo.png")[0] == "allow"
+        assert policy.decide("https://www.youtube.com/embed/x")[0] == "block"
+        assert policy.decide("https://cdn.test/app.js") == ("rewrite", "http://shop.test/app.js")
+        assert policy.decide("http://shop.test/index.html", "document")[0] == "allow"
+        assert policy.decide("http://shop.test/app.js")[0] == "allow"
+
+    def test_marker_overrides_then_restore_defaults(self):
+        policy = make_policy()
+        policy.configure(allow_types=["image"])
+        assert policy.decide("http://shop.test/imgs/galaxy_s6.jpg")[0] == "allow"
+        assert policy.decide("http://shop.test/front.mp4")[0] == "block"
+        policy.configure(enabled=False)
+        assert policy.decide("https://www.youtube.com/embed/x")[0] == "allow"
+        policy.configure()
+        assert policy.decide("http://shop.test/imgs/galaxy_s6.jpg")[0] == "block"
+
+    def test_blocked_requests_and_bytes_saved(self):
+        policy = make_policy()
+        policy._on_response({"response": {"url": "http://shop.test/imgs/nexus.jpg", "bytesReceived": 2048}})
+        policy.reset_stats()
+
+        image = FakeRequest("http://shop.test/imgs/nexus.jpg", "image")
+        unseen = FakeRequest("http://shop.test/imgs/new.jpg", "image")
+        rewritten = FakeRequest("https://cdn.test/app.js", "script")
+        for request in (image, unseen, rewritten, FakeRequest("http://shop.test/app.js", "script")):
+            policy._on_request(request)
+
+        assert image.failed and unseen.failed
+        assert rewritten.new_url == "http://shop.test/app.js" and not rewritten.failed
+        assert policy.stats == {"requests": 4, "blocked": 2, "rewritten": 1, "bytes_loaded": 0,
+                                "bytes_saved": 2048, "unsized_blocked": 1}
+
+    def test_install_is_a_no_op_without_bidi(self):
+        assert not make_policy().installed
+        assert format_bytes(512) == "512B"
+        assert format_bytes(2048) == "2.0KB"
@@ -0,0 +1,110 @@
+import io
+import json
+import os
+from types import SimpleNamespace
+from plugins import parallel
+from plugins.parallel import ControllerPlugin, order_longest_first, partition, default_worker_count
+from utils.driver_factory import DriverFactory
+
+
+class FakeProcess:
+    """A worker process that exits on its own with exit_code, or with -15 once terminated"""
+
+    def __init__(self, exit_code=None):
+        self.returncode = exit_code
+
+    def poll(self):
+        return self.returncode
+
+    def terminate(self):
+        self.returncode = -15
+
+
+class FakeHook:
+    """Replays serialized reports and stops the session on a failure, like -x"""
+
+    def __init__(self, session, exitfirst):
+        self.session = session
+        self.exitfirst = exitfirst
+        self.reports = []
+
+    def pytest_report_from_serializable(self, config, data):
+        return SimpleNamespace(**data)
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        pass
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        pass
+
+    def pytest_runtest_logreport(self, report):
+        self.reports.append((report.nodeid, report.outcome))
+        if report.outcome == "failed" and self.exitfirst:
+            self.session.shouldstop = "Interrupted: 1 failed"
+
+
+def _worker(index, plan, lines, exit_code=None):
+    reports = io.StringIO("".join(json.dumps(line) + "\n" for line in lines))
+    return {"index": index, "plan": plan, "process": FakeProcess(exit_code), "reports": reports,
+            "log": io.StringIO(), "seen": set(), "partial": ""}
+
+
+def _replay(workers, exitfirst):
+    session = SimpleNamespace(shouldfail=False, shouldstop=False)
+    controller = ControllerPlugin.__new__(ControllerPlugin)
+    controller.config = SimpleNamespace(hook=FakeHook(session, exitfirst))
+    items = {nodeid: SimpleNamespace(location=(nodeid, 0, nodeid)) for worker in workers for nodeid in worker["plan"]}
+    controller._replay(session, workers, items)
+    return controller.config.hook.reports
+
+
+def _phases(nodeid, outcome):
+    return [{"nodeid": nodeid, "location": (nodeid, 0, nodeid), "when": when,
+             "outcome": outcome if when == "call" else "passed"} for when in ("setup", "call", "teardown")]
+
+
+class TestParallelScheduler:
+
+    def test_orders_longest_first(self):
+        durations = {"a": 1.0, "b": 9.0, "c": 4.0}
+        assert order_longest_first(["a", "b", "c"], durations) == ["b", "c", "a"]
+
+    def test_unknown_tests_use_default_duration(self):
+        durations = {"fast": 0.5, "slow": 20.0}
+        ordered = order_longest_first(["fast", "new", "slow"], durations, default_duration=5.0)
+        assert ordered == ["slow", "new", "fast"]
+
+    def test_partition_balances_slow_tests_across_workers(self):
+        durations = {"p1": 30.0, "p2": 30.0, "p3": 30.0, "h1": 2.0, "h2": 2.0, "h3": 2.0}
+        plans = partition(list(durations), durations, 3)
+        assert sorted(plan[0] for plan in plans) == ["p1", "p2", "p3"]
+        assert sorted(nodeid for plan in plans for nodeid in plan) == sorted(durations)
+
+    def test_partition_with_more_workers_than_tests(self):
+        plans = partition(["only"], {}, 4)
+        assert [plan for plan in plans if plan] == [["only"]]
+
+    def test_worker_count_is_capped_by_memory(self):
+        assert default_worker_count(memory_per_browser_mb=10 ** 9) == 1
+        assert default_worker_count(memory_per_browser_mb=1) >= 1
+
+    def test_worker_count_allows_for_every_browser_a_worker_keeps(self, monkeypatch):
+        monkeypatch.setattr(os, "cpu_count", lambda: 16)
+        monkeypatch.setattr(parallel, "available_memory_mb", lambda: 6000)
+        assert default_worker_count(memory_per_browser_mb=600, browsers=1) == 10
+        assert default_worker_count(memory_per_browser_mb=600, browsers=2) == 5
+        monkeypatch.setattr(DriverFactory, "get_pool_config",
+                            lambda self: {"enabled": True, "size": 1, "spares": 2})
+        assert default_worker_count(memory_per_browser_mb=600) == 3
+
+    def test_tests_left_when_exitfirst_stops_the_run_are_not_reported(self):
+        failing = _worker(0, ["t::fail", "t::a", "t::b"], _phases("t::fail", "failed"), exit_code=1)
+        running = _worker(1, ["t::c", "t::d"], _phases("t::c", "passed"))
+        reports = _replay([failing, running], exitfirst=True)
+        assert running["process"].returncode == -15
+        assert [report for report in reports if report[1] == "failed"] == [("t::fail", "failed")]
+
+    def test_tests_lost_when_a_worker_exits_on_its_own_are_failed(self):
+        crashed = _worker(0, ["t::a", "t::b"], _phases("t::a", "passed"), exit_code=-9)
+        reports = _replay([crashed], exitfirst=False)
+        assert reports[-1] == ("t::b", "failed")
@@ -1,18 +1,11 @@
 import pytest
 import allure
-from utils.driver_factory import DriverFactory
 from pages.home_page import HomePage
 from pages.product_page import ProductPage
+from base.tab_scheduler import TabScheduler
 from helpers.test_data import TestData
 from helpers.assertions import Assertions
 
-@pytest.fixture()
-def driver():
-    driver = DriverFactory().get_driver()
-    driver.maximize_window()
-    yield driver
-    driver.quit()
-
 @pytest.fixture()
 def home_page(driver):
     return HomePage(driver)
@@ -21,25 +14,25 @@ def home_page(driver):
 def product_page(driver):
     return ProductPage(driver)
 
+@pytest.fixture()
+def first_product(base_url, home_page):
+    """Name of the first listed product, with its page open; set up once per worker and restored after"""
+    def open_first_product():
+        home_page.open(base_url)
+        product_titles = home_page.get_product_titles()
+        Assertions.assert_list_not_empty(product_titles)
+        home_page.click_product_by_name(product_titles[0])
+        return product_titles[0]
+    return home_page.start_from_snapshot("first_product_page", open_first_product)
+
 @allure.epic("DemoBlaze E-commerce")
 @allure.feature("Product Page")
 class TestProductPage:
     
     @allure.story("Product Details")
     @allure.severity(allure.severity_level.CRITICAL)
-    def test_product_details_displayed(self, driver, home_page, product_page):
+    def test_product_details_displayed(self, driver, first_product, product_page):
         """Test that product details are properly displayed"""
-        with allure.step("Open home page"):
-            home_page.open('https://www.demoblaze.com')
-        
-        with allure.step("Get first product name"):
-            product_titles = home_page.get_product_titles()
-            Assertions.assert_list_not_empty(product_titles)
-            first_product = product_titles[0]
-        
-        with allure.step("Click on first product"):
-            home_page.click_product_by_name(first_product)
-        
         with allure.step("Verify product details are loaded"):
             assert product_page.verify_product_details_loaded(), "Product details not loaded properly"
         
@@ -52,38 +45,26 @@ class TestProductPage:
 
     @allure.story("Product Image")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_product_image_displayed(self, driver, home_page, product_page):
+    @pytest.mark.network_policy(allow_types=["image"])
+    def test_product_image_displayed(self, driver, first_product, product_page):
         """Test that product image is displayed"""
-        with allure.step("Open home page"):
-            home_page.open('https://www.demoblaze.com')
-        
-        with allure.step("Click on first product"):
-            product_titles = home_page.get_product_titles()
-            home_page.click_product_by_name(product_titles[0])
-        
         with allure.step("Verify product image is displayed"):
             assert product_page.verify_product_image_displayed(), "Product image not displayed"
 
     @allure.story("Add to Cart Functionality")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_add_to_cart_button_present(self, driver, home_page, product_page):
+    def test_add_to_cart_button_present(self, driver, first_product, product_page):
         """Test that add to cart button is present on product page"""
-        with allure.step("Open home page"):
-            home_page.open('https://www.demoblaze.com')
-        
-        with allure.step("Click on first product"):
-            product_titles = home_page.get_product_titles()
-            home_page.click_product_by_name(product_titles[0])
-        
         with allure.step("Verify add to cart button is present"):
             assert product_page.verify_add_to_cart_button_present(), "Add to cart button not present"
 
     @allure.story("Navigation")
     @allure.severity(allure.severity_level.NORMAL)
-    def test_back_to_products_navigation(self, driver, home_page, product_page):
+    def test_back_to_products_navigation(self, driver, base_url, home_page, product_page):
         """Test navigation back to products list"""
+        # Walks the real navigation: history is not part of a snapshot
         with allure.step("Open home page"):
-            home_page.open('https://www.demoblaze.com')
+            home_page.open(base_url)
         
         with allure.step("Click on first product"):
             product_titles = home_page.get_product_titles()
@@ -94,6 +75,23 @@ class TestProductPage:
         
         with allure.step("Verify we're back to home page"):
             current_url = home_page.get_current_url()
-            Assertions.assert_text_contains(current_url, "demoblaze.com")
+            Assertions.assert_text_contains(current_url, base_url)
+
+    @allure.story("Product Details")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_catalog_product_details(self, driver, base_url, home_page):
+        """Test that every listed product opens with its listed name and a price"""
+        with allure.step("Open home page"):
+            home_page.open(base_url)
+            products = home_page.get_product_rows()
+            Assertions.assert_list_not_empty(products)
 
+        with allure.step("Read every product page across several tabs"):
+            with TabScheduler(driver) as tabs:
+                details = tabs.run(ProductPage, [product["href"] for product in products],
+                                   lambda page: (page.get_product_name(), page.get_product_price()))
 
+        with allure.step("Verify names and prices"):
+            for product, (name, price) in zip(products, details):
+                assert name == product["title"], f"{product['href']} shows {name!r}"
+                Assertions.assert_text_contains(price, "$")
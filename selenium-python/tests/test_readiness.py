@@ -0,0 +1,58 @@
+import pytest
+from selenium.common.exceptions import JavascriptException
+from base.readiness import NetworkReadiness
+from base.wait_policy import WaitCancelled
+
+
+class FakeDriver:
+    """Answers readiness scripts with canned results and records the commands sent"""
+
+    def __init__(self, result=None, cdp=True, error=None):
+        self.result = result
+        self.error = error
+        self.commands = []
+        if cdp:
+            self.execute_cdp_cmd = self._cdp
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def execute_script(self, script, *args):
+        self.commands.append(("script", script.rsplit(";", 2)[-2].strip()))
+        return 7
+
+    def execute_async_script(self, script, *args):
+        self.commands.append(("async", list(args)))
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def _cdp(self, command, params):
+        self.commands.append(("cdp", command))
+        return {"identifier": "1"}
+
+
+def test_tracker_is_preloaded_once_and_waits_are_one_script_each():
+    driver = FakeDriver({"met": True, "inflight": 0, "seq": 3,
+                         "request": {"seq": 3, "url": "http://shop.test/view", "status": 200}})
+    readiness = NetworkReadiness(driver, quiet_ms=250)
+    assert readiness.request(r"/view$", timeout=2)["request"]["status"] == 200
+    assert readiness.idle()["met"]
+    assert driver.commands == [("cdp", "Page.addScriptToEvaluateOnNewDocument"),
+                               ("async", [["request", r"/view$", 0], 2000]),
+                               ("async", [["idle", 250], 10000])]
+
+
+def test_mark_limits_a_request_wait_to_later_requests():
+    driver = FakeDriver({"met": False, "inflight": 1, "seq": 7, "request": None}, cdp=False)
+    readiness = NetworkReadiness(driver)
+    after = readiness.mark()
+    assert readiness.request("/deleteitem", timeout=1, after=after)["request"] is None
+    assert driver.commands == [("script", "return window.__networkTracker.seq"),
+                               ("async", [["request", "/deleteitem", 7], 1000])]
+
+
+def test_navigation_during_a_wait_cancels_it():
+    driver = FakeDriver(error=JavascriptException("document unloaded while waiting for result"), cdp=False)
+    with pytest.raises(WaitCancelled):
+        NetworkReadiness(driver).idle()
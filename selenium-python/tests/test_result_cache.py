@@ -0,0 +1,82 @@
+from utils.result_cache import Fingerprinter, ResultCache
+
+
+def _project(tmp_path):
+    files = {
+        "config.json": '{"browser": "chrome"}',
+        "conftest.py": 'from utils.factory import make\npytest_plugins = ["plugins.timing"]\n',
+        "utils/factory.py": "def make():\n    pass\n",
+        "plugins/timing.py": "",
+        "fixtures/demoblaze/entries.json": '{"Items": []}',
+        "base/js/extract_rows.js": "return [];",
+        "tests/data/orders.csv": "name,country\nAnna,PL\n",
+        "pages/home_page.py": "from locators.home_page_locators import HomePageLocators\nimport json\n",
+        "pages/cart_page.py": "",
+        "locators/home_page_locators.py": "class HomePageLocators:\n    LOGO = ('id', 'nava')\n",
+        "helpers/test_data.py": "class TestData:\n    USER = 'a'\n",
+        "tests/test_home.py": "from pages.home_page import HomePage\nfrom helpers import test_data\n",
+        "tests/test_cart.py": "from pages.cart_page import CartPage\n",
+    }
+    for path, source in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(source)
+    return tmp_path
+
+
+def test_closure_follows_project_imports_only(tmp_path):
+    root = _project(tmp_path)
+    closure = Fingerprinter(str(root)).closure(str(root / "tests/test_home.py"))
+    assert {p.replace(str(root) + "/", "") for p in closure} == {
+        "tests/test_home.py", "pages/home_page.py", "locators/home_page_locators.py", "helpers/test_data.py"}
+
+
+def test_fingerprint_changes_only_with_the_tests_inputs(tmp_path):
+    root = _project(tmp_path)
+
+    def fingerprints():
+        fingerprinter = Fingerprinter(str(root))
+        return {name: fingerprinter.fingerprint(str(root / f"tests/{name}.py")) for name in ("test_home", "test_cart")}
+
+    before = fingerprints()
+    assert fingerprints() == before
+    (root / "locators/home_page_locators.py").write_text("class HomePageLocators:\n    LOGO = ('id', 'logo')\n")
+    after = fingerprints()
+    assert after["test_home"] != before["test_home"] and after["test_cart"] == before["test_cart"]
+    # Shared inputs change every fingerprint
+    for shared in ("fixtures/demoblaze/entries.json", "plugins/timing.py", "config.json", "base/js/extract_rows.js"):
+        (root / shared).write_text("changed")
+        changed = fingerprints()
+        assert changed["test_home"] != after["test_home"] and changed["test_cart"] != after["test_cart"]
+        after = changed
+
+
+def test_lookup_requires_matching_fingerprint():
+    cache = ResultCache({}, max_entries=10)
+    cache.store("tests/test_a.py::test_a", "abc", 1.5)
+    assert cache.lookup("tests/test_a.py::test_a", "abc")["duration"] == 1.5
+    assert cache.lookup("tests/test_a.py::test_a", "def") is None
+    assert cache.lookup("tests/test_b.py::test_b", "abc") is None
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResultCache({"a": {"fingerprint": "1", "duration": 1.0, "used": 1.0},
+                         "b": {"fingerprint": "2", "duration": 1.0, "used": 2.0}}, max_entries=2)
+    cache.touch("a")
+    cache.store("c", "3", 1.0)
+    assert set(cache.entries) == {"a", "c"}
+    assert cache.evicted == 1 and cache.hits == 1
+
+
+def test_dataset_file_is_part_of_its_tests_fingerprint(tmp_path):
+    root = _project(tmp_path)
+    dataset = str(root / "tests/data/orders.csv")
+
+    def fingerprints():
+        fingerprinter = Fingerprinter(str(root))
+        return (fingerprinter.fingerprint(str(root / "tests/test_cart.py"), inputs=[dataset]),
+                fingerprinter.fingerprint(str(root / "tests/test_home.py")))
+
+    before = fingerprints()
+    (root / "tests/data/orders.csv").write_text("name,country\nAnna,DE\n")
+    after = fingerprints()
+    assert after[0] != before[0] and after[1] == before[1]
@@ -0,0 +1,77 @@
+import struct
+import threading
+import time
+import zlib
+from utils.screenshots import ScreenshotPipeline, distance
+
+
+def make_png(width, height, color):
+    """Solid-colour RGB PNG built with the standard library"""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    row = b"\x00" + bytes(color) * width
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(row * height)) + chunk(b"IEND", b""))
+
+
+def settings(tmp_path, **overrides):
+    values = {"dir": str(tmp_path), "format": "webp", "quality": 80, "hash_distance": 4,
+              "queue_size": 16, "attach_timeout": 5}
+    values.update(overrides)
+    return values
+
+
+class TestScreenshotPipeline:
+
+    def test_repeated_frames_reuse_the_stored_file(self, tmp_path):
+        pipeline = ScreenshotPipeline(settings(tmp_path))
+        white, black = make_png(32, 32, (255, 255, 255)), make_png(32, 32, (0, 0, 0))
+        for name, png in (("home", white), ("home again", white), ("modal", black)):
+            pipeline.submit(png, name, "test_a")
+        frames = pipeline.collect("test_a")
+        pipeline.close()
+
+        assert [frame.name for frame in frames] == ["home", "home again", "modal"]
+        assert frames[1].duplicate and frames[1].path == frames[0].path
+        assert frames[2].path != frames[0].path
+        assert pipeline.stored == 2 and pipeline.duplicates == 1
+        assert len(list(tmp_path.iterdir())) == 2
+
+    def test_streams_are_deduplicated_separately(self, tmp_path):
+        pipeline = ScreenshotPipeline(settings(tmp_path))
+        png = make_png(16, 16, (10, 20, 30))
+        pipeline.submit(png, "first", "test_a")
+        pipeline.submit(png, "first", "test_b")
+        assert not any(frame.duplicate for frame in pipeline.collect("test_a") + pipeline.collect("test_b"))
+        pipeline.close()
+
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path):
+        pipeline = ScreenshotPipeline(settings(tmp_path, queue_size=1))
+        gate = threading.Event()
+        store = pipeline._store
+        pipeline._store = lambda frame: gate.wait() and store(frame)
+        frames = [pipeline.submit(make_png(8, 8, (shade, 0, 0)), f"frame {shade}", "test_a")
+                  for shade in range(5)]
+        gate.set()
+        pipeline.close()
+        assert frames.count(None) == pipeline.dropped >= 3
+
+    def test_collect_waits_once_and_counts_late_frames(self, tmp_path):
+        pipeline = ScreenshotPipeline(settings(tmp_path, attach_timeout=0.1))
+        gate = threading.Event()
+        store = pipeline._store
+        pipeline._store = lambda frame: gate.wait() and store(frame)
+        for shade in range(3):
+            pipeline.submit(make_png(8, 8, (shade, 0, 0)), f"frame {shade}", "test_a")
+        start = time.monotonic()
+        assert pipeline.collect("test_a") == []
+        assert time.monotonic() - start < 1
+        gate.set()
+        pipeline.close()
+        assert pipeline.stats()["late"] == 3
+        assert "3 stored too late to attach" in pipeline.report()
+
+    def test_hash_distance(self):
+        assert distance(0b1011, 0b0001) == 2
+        assert distance("abc", "abc") == 0
+        assert distance("abc", "abd") == 64
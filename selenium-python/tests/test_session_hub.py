@@ -0,0 +1,119 @@
+import itertools
+import json
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from utils.driver_factory import DriverFactory
+from utils.session_hub import Node, SessionHub, requested_browser
+
+_session_ids = itertools.count(1)
+
+
+class FakeNodeHandler(BaseHTTPRequestHandler):
+    """A driver node that creates sessions and answers getTitle with its own port"""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, value):
+        body = json.dumps({"value": value}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path == "/session":
+            return self._reply({"sessionId": f"s{next(_session_ids)}", "capabilities": {"browserName": "chrome"}})
+        self._reply(None)
+
+    def do_GET(self):
+        self._reply(f"node {self.server.server_address[1]}")
+
+    def do_DELETE(self):
+        self._reply(None)
+
+
+@pytest.fixture()
+def nodes():
+    servers = [ThreadingHTTPServer(("127.0.0.1", 0), FakeNodeHandler) for _ in range(2)]
+    for server in servers:
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield [Node("chrome", 1, url=f"http://127.0.0.1:{server.server_address[1]}") for server in servers]
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _session(hub):
+    return webdriver.Remote(command_executor=hub.url, options=ChromeOptions())
+
+
+def _status(hub):
+    with urllib.request.urlopen(hub.url + "/status") as response:
+        return json.loads(response.read())["value"]
+
+
+def test_sessions_spread_over_nodes_and_queue_when_full(nodes):
+    with SessionHub(DriverFactory(), nodes=nodes, new_session_timeout=10) as hub:
+        first, second = _session(hub), _session(hub)
+        assert {first.title, second.title} == {f"node {node.url.rsplit(':', 1)[1]}" for node in nodes}
+        queued = []
+        waiting = threading.Thread(target=lambda: queued.append(_session(hub)))
+        waiting.start()
+        while hub.stats()["queue"] == 0:
+            time.sleep(0.01)
+        status = _status(hub)
+        assert not status["ready"] and status["hub"]["slots"]["chrome"] == {"used": 2, "total": 2, "nodes": 2}
+        time.sleep(0.1)
+        freed = first.title
+        first.quit()
+        waiting.join(5)
+        assert queued and queued[0].title == freed
+        stats = hub.stats()
+        assert stats["created"] == 3 and stats["queue"] == 0
+        assert stats["wait"]["max"] >= 0.1
+        second.quit()
+        queued[0].quit()
+        assert hub.stats()["slots"]["chrome"]["used"] == 0
+
+
+def test_browser_without_nodes_fails_at_once(nodes):
+    with SessionHub(DriverFactory(), nodes=nodes) as hub:
+        with pytest.raises(SessionNotCreatedException, match="No node serves browser firefox"):
+            webdriver.Remote(command_executor=hub.url, options=FirefoxOptions())
+
+
+def test_request_times_out_when_no_slot_frees(nodes):
+    with SessionHub(DriverFactory(), nodes=nodes[:1], new_session_timeout=0.2) as hub:
+        held = _session(hub)
+        with pytest.raises(SessionNotCreatedException, match="No chrome slot became free"):
+            _session(hub)
+        assert hub.stats()["timeouts"] == 1
+        held.quit()
+
+
+def test_idle_sessions_are_ended(nodes):
+    with SessionHub(DriverFactory(), nodes=nodes[:1], session_timeout=0.2) as hub:
+        _session(hub)
+        deadline = time.monotonic() + 5
+        while hub.stats()["sessions"] and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert hub.stats()["reaped"] == 1 and hub.stats()["slots"]["chrome"]["used"] == 0
+
+
+def test_nodes_are_planned_from_session_counts():
+    hub = SessionHub(DriverFactory(), nodes={"chrome": 10, "firefox": 2}, slots_per_node=4)
+    assert [(node.browser, node.slots) for node in hub.nodes] == [
+        ("chrome", 4), ("chrome", 4), ("chrome", 2), ("firefox", 1), ("firefox", 1)]
+    assert requested_browser({"capabilities": {"firstMatch": [{"browserName": "MicrosoftEdge"}]}}) == "edge"
@@ -0,0 +1,73 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from utils.shared_service import SharedChrome, SharedDriverService
+
+
+class FakeChromedriverHandler(BaseHTTPRequestHandler):
+    """Creates sessions and answers getTitle; counts what it served"""
+    protocol_version = "HTTP/1.1"
+    sessions = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, value):
+        body = json.dumps({"value": value}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.path == "/session":
+            FakeChromedriverHandler.sessions += 1
+            return self._reply({"sessionId": f"s{FakeChromedriverHandler.sessions}",
+                                "capabilities": {"browserName": "chrome"}})
+        self._reply(None)
+
+    def do_GET(self):
+        self._reply("STORE")
+
+    def do_DELETE(self):
+        self._reply(None)
+
+
+@pytest.fixture()
+def fake_chromedriver_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeChromedriverHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestSharedDriverService:
+
+    def test_sessions_share_one_connection_pool(self, fake_chromedriver_url):
+        service = SharedDriverService(None, "chrome", connections=2, url=fake_chromedriver_url).start()
+        drivers = [service.new_driver(ChromeOptions()) for _ in range(3)]
+        assert all(isinstance(driver, SharedChrome) for driver in drivers)
+        assert len({driver.session_id for driver in drivers}) == 3
+        for driver in drivers:
+            assert driver.title == "STORE"
+        # Quitting one session leaves the pool open for the others
+        drivers[0].quit()
+        assert drivers[1].title == "STORE"
+
+        stats = service.stats()
+        assert stats["sessions"] == 3
+        assert stats["requests"] == 8
+        assert stats["connections"] == 1
+        assert stats["connections_reused"] == 7
+        assert "3 sessions on one driver process" in service.report()
+        service.stop()
+
+    def test_firefox_is_not_shareable(self):
+        with pytest.raises(Exception, match="cannot share"):
+            SharedDriverService(None, "firefox", connections=2)
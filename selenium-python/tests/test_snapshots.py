@@ -0,0 +1,165 @@
+from base import snapshots
+from base.base_page import BasePage
+from base.snapshots import PageSnapshot
+from base.step_retry import StepRetry
+
+
+class FakeSwitch:
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.log.append(("switch", handle))
+        self.driver.current_window_handle = handle
+
+    def new_window(self, kind):
+        handle = f"w{len(self.driver.windows)}"
+        self.driver.windows[handle] = {"url": "about:blank", "local": {}, "session": {}}
+        self.window(handle)
+
+
+class FakeDriver:
+    """Windows with URLs and storage, cookies, and a log of the commands that change them"""
+
+    def __init__(self, cdp=True):
+        self.windows = {"w0": {"url": "about:blank", "local": {}, "session": {}}}
+        self.current_window_handle = "w0"
+        self.cookies = []
+        self.preloads = {}
+        self.log = []
+        self.switch_to = FakeSwitch(self)
+        if cdp:
+            self.execute_cdp_cmd = self._cdp
+
+    @property
+    def window_handles(self):
+        return list(self.windows)
+
+    @property
+    def current_url(self):
+        return self.windows[self.current_window_handle]["url"]
+
+    def execute_script(self, script, *args):
+        window = self.windows[self.current_window_handle]
+        if "getItem" in script:
+            return {"url": window["url"], "local": dict(window["local"]), "session": dict(window["session"])}
+        self.log.append(("script", window["url"]))
+        window["local"]["restored"] = "yes"
+
+    def get(self, url):
+        self.log.append(("get", url))
+        window = self.windows[self.current_window_handle]
+        window["url"] = url
+        if self.preloads:
+            window["local"]["restored"] = "yes"
+
+    def refresh(self):
+        self.log.append(("refresh", self.current_url))
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def add_cookie(self, cookie):
+        self.cookies.append(cookie)
+
+    def _cdp(self, command, params):
+        self.log.append(("cdp", command))
+        if command == "Network.getAllCookies":
+            return {"cookies": list(self.cookies)}
+        if command == "Network.setCookies":
+            self.cookies.extend(params["cookies"])
+        elif command == "Page.addScriptToEvaluateOnNewDocument":
+            self.preloads["1"] = params["source"]
+            return {"identifier": "1"}
+        elif command == "Page.removeScriptToEvaluateOnNewDocument":
+            self.preloads.pop(params["identifier"])
+        return {}
+
+
+class FakePage(BasePage):
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def page_changed(self):
+        pass
+
+
+def _set_up(driver):
+    driver.windows["w0"] = {"url": "http://shop.test/prod.html?idp_=1", "local": {"cart": "1"}, "session": {}}
+    driver.windows["w1"] = {"url": "http://shop.test/cart.html", "local": {}, "session": {}}
+    driver.cookies = [{"name": "user", "value": "abc", "domain": "shop.test", "path": "/", "expires": -1,
+                       "session": True, "size": 7}]
+
+
+def test_capture_reads_every_window_and_all_cookies():
+    driver = FakeDriver()
+    _set_up(driver)
+    snapshot = PageSnapshot.capture(driver, "product")
+    assert [window["url"] for window in snapshot.windows] == ["http://shop.test/prod.html?idp_=1",
+                                                             "http://shop.test/cart.html"]
+    assert snapshot.url == "http://shop.test/prod.html?idp_=1"
+    assert driver.current_window_handle == "w0"
+
+
+def test_chromium_restore_costs_one_navigation_per_window():
+    source = FakeDriver()
+    _set_up(source)
+    snapshot = PageSnapshot.capture(source, "product")
+
+    driver = FakeDriver()
+    snapshot.restore(driver)
+    assert [entry for entry in driver.log if entry[0] in ("get", "refresh")] == [
+        ("get", "http://shop.test/prod.html?idp_=1"), ("get", "http://shop.test/cart.html")]
+    assert driver.windows["w0"]["local"] == {"restored": "yes"}
+    # The storage preload is gone once the window has loaded
+    assert driver.preloads == {}
+    assert driver.cookies == [{"name": "user", "value": "abc", "domain": "shop.test", "path": "/"}]
+    assert driver.current_window_handle == "w0"
+
+
+def test_restore_keeps_cookies_the_session_already_has():
+    source = FakeDriver()
+    _set_up(source)
+    snapshot = PageSnapshot.capture(source, "product")
+    for cdp in (True, False):
+        driver = FakeDriver(cdp=cdp)
+        driver.cookies = [{"name": "user", "value": "seeded", "domain": "shop.test", "path": "/"}]
+        snapshot.restore(driver)
+        assert [cookie["value"] for cookie in driver.cookies] == ["seeded"]
+
+
+def test_restore_without_cdp_fills_in_and_reloads():
+    source = FakeDriver()
+    _set_up(source)
+    snapshot = PageSnapshot.capture(source, "product")
+    driver = FakeDriver(cdp=False)
+    snapshot.restore(driver)
+    assert driver.log[:3] == [("get", "http://shop.test/prod.html?idp_=1"),
+                              ("script", "http://shop.test/prod.html?idp_=1"),
+                              ("refresh", "http://shop.test/prod.html?idp_=1")]
+    assert driver.cookies == [{"name": "user", "value": "abc", "domain": "shop.test", "path": "/"}]
+
+
+def test_setup_runs_once_per_session_and_becomes_the_retry_checkpoint():
+    snapshots.clear_snapshots()
+    calls = []
+
+    def setup():
+        calls.append(True)
+        _set_up(page.driver)
+        return "Samsung galaxy s6"
+
+    try:
+        page = FakePage(FakeDriver())
+        assert page.start_from_snapshot("first_product", setup) == "Samsung galaxy s6"
+        page = FakePage(FakeDriver())
+        assert page.start_from_snapshot("first_product", setup) == "Samsung galaxy s6"
+        assert len(calls) == 1
+        assert page.driver.current_url == "http://shop.test/prod.html?idp_=1"
+        engine = StepRetry.for_driver(page.driver)
+        assert engine.url == "http://shop.test/prod.html?idp_=1" and not engine.dirty
+        assert engine.restorers
+    finally:
+        snapshots.clear_snapshots()
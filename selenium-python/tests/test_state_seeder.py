@@ -0,0 +1,36 @@
+import pytest
+from utils.demoblaze_server import DemoBlazeServer
+from utils.state_seeder import StateSeeder
+
+
+@pytest.fixture(scope="module")
+def server():
+    with DemoBlazeServer() as server:
+        yield server
+
+
+class TestStateSeeder:
+
+    def test_bulk_add_and_clear(self, server):
+        seeder = StateSeeder(api_url=server.base_url)
+        entry_ids = seeder.add_first_products(5)
+        assert len(entry_ids) == 5
+        assert sorted(item["prod_id"] for item in seeder.view_cart()) == [1, 2, 3, 4, 5]
+        seeder.clear_cart()
+        assert seeder.view_cart() == []
+
+    def test_add_by_name_and_delete(self, server):
+        seeder = StateSeeder(api_url=server.base_url)
+        first, second = seeder.add_products_by_name(["Nexus 6", "Sony vaio i5"])
+        seeder.delete_item(first)
+        assert [item["id"] for item in seeder.view_cart()] == [second]
+
+    def test_shoppers_are_isolated(self, server):
+        alice = StateSeeder(api_url=server.base_url)
+        bob = StateSeeder(api_url=server.base_url)
+        alice.add_first_products(2)
+        assert bob.view_cart() == []
+
+    def test_unknown_product_name(self, server):
+        with pytest.raises(Exception, match="not found"):
+            StateSeeder(api_url=server.base_url).product_id("Walkman")
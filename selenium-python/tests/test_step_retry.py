@@ -0,0 +1,131 @@
+import pytest
+from selenium.common.exceptions import InvalidSessionIdException, StaleElementReferenceException, TimeoutException
+from base.step_retry import StepRetry, page_step, wrap_steps
+from plugins.step_retry import classify, is_quarantined
+from utils import command_events
+
+
+class FakeDriver:
+
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, command, params=None):
+        self.commands.append((command, params))
+        return {"value": None}
+
+    def get(self, url):
+        self.execute("get", {"url": url})
+
+
+class FakePage:
+    """Just the BasePage surface StepRetry uses"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.failures = []
+
+    def page_changed(self):
+        pass
+
+    def handle_any_alert(self):
+        return False
+
+    def _fail_next(self, *errors):
+        self.failures.extend(errors)
+
+    def _maybe_fail(self):
+        if self.failures:
+            raise self.failures.pop(0)
+
+    @page_step("Read the cart")
+    def read(self):
+        self._maybe_fail()
+        return "read"
+
+    @page_step("Click add to cart")
+    def click(self):
+        self.driver.execute("clickElement", {"id": "e1"})
+        self._maybe_fail()
+        return "clicked"
+
+    @page_step("Open a page")
+    def open(self, url):
+        self.driver.execute("get", {"url": url})
+
+
+wrap_steps(FakePage)
+
+
+@pytest.fixture()
+def engine():
+    driver = command_events.attach(FakeDriver())
+    engine = StepRetry.for_driver(driver)
+    engine.resets, engine.restored = [], []
+    engine.begin(retries=1, reset=engine.resets.append)
+    engine.on_restore(engine.restored.append)
+    return engine
+
+
+class TestStepRetry:
+
+    def test_step_without_side_effects_is_retried_in_place(self, engine):
+        page = FakePage(engine.driver)
+        page._fail_next(StaleElementReferenceException("stale"))
+        assert page.read() == "read"
+        assert engine.events == [{"step": "FakePage.read", "error": "StaleElementReferenceException",
+                                  "action": "retry", "attempt": 1}]
+        assert not engine.resets
+
+    def test_step_that_clicked_restores_the_checkpoint_first(self, engine):
+        page = FakePage(engine.driver)
+        page.open("http://shop.test/prod.html?idp_=1")
+        page._fail_next(TimeoutException("no alert"))
+        assert page.click() == "clicked"
+        assert engine.events[0]["action"] == "restore"
+        assert engine.resets == [engine.driver] and engine.restored == [engine.driver]
+        clicks_and_gets = [command for command, _ in engine.driver.commands]
+        assert clicks_and_gets == ["get", "clickElement", "get", "clickElement"]
+        assert engine.driver.commands[2][1]["url"] == "http://shop.test/prod.html?idp_=1"
+
+    def test_no_restore_once_the_test_changed_state(self, engine):
+        page = FakePage(engine.driver)
+        page.open("http://shop.test/")
+        page.click()
+        page._fail_next(TimeoutException("no alert"))
+        with pytest.raises(TimeoutException):
+            page.click()
+
+    def test_lost_session_moves_pages_to_a_fresh_driver(self, engine):
+        replacement = command_events.attach(FakeDriver())
+        engine.begin(retries=1, replace=lambda lost: replacement, reset=engine.resets.append)
+        page, other_page = FakePage(engine.driver), FakePage(engine.driver)
+        page._fail_next(InvalidSessionIdException("session deleted"))
+        assert page.read() == "read"
+        assert page.driver is replacement and engine.driver is replacement
+        other_page.read()
+        assert other_page.driver is replacement
+
+    def test_real_failures_and_exhausted_retries_are_raised(self, engine):
+        page = FakePage(engine.driver)
+        page._fail_next(AssertionError("wrong total"))
+        with pytest.raises(AssertionError):
+            page.read()
+        page._fail_next(StaleElementReferenceException("stale"), StaleElementReferenceException("stale"))
+        with pytest.raises(StaleElementReferenceException):
+            page.read()
+
+    def test_flake_classification_and_quarantine(self):
+        settings = {"quarantine_after": 2, "quarantine_window": 5}
+        assert classify("passed", retried=True) == "flaky"
+        assert classify("passed", retried=False) == "clean"
+        assert classify("failed", retried=True) == "failed"
+        assert classify("failed", retried=False) == "failed"
+        assert is_quarantined(["clean", "flaky", "clean", "flaky"], settings)
+        assert not is_quarantined(["flaky", "clean", "failed"], settings)
+
+    def test_a_quarantined_test_that_keeps_failing_leaves_quarantine(self):
+        settings = {"quarantine_after": 2, "quarantine_window": 5}
+        assert is_quarantined(["flaky", "flaky", "failed"], settings)
+        assert not is_quarantined(["flaky", "flaky", "failed", "failed"], settings)
+        assert is_quarantined(["flaky", "flaky", "failed", "failed", "flaky"], settings)
@@ -0,0 +1,112 @@
+import allure
+import allure_commons
+import pytest
+from selenium.common.exceptions import StaleElementReferenceException
+from base.base_page import BasePage
+from base.step_retry import StepRetry, page_step
+from plugins.step_timing import StepRecorder, percentile, summarize
+from utils import command_events
+
+
+class FakeDriver:
+
+    def execute(self, driver_command, params=None):
+        return {"value": None}
+
+
+class FakePage(BasePage):
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def page_changed(self):
+        pass
+
+    @page_step('Load things')
+    def load_things(self):
+        self.driver.execute("findElements")
+        self.click()
+
+    def click(self):
+        with allure.step("Clicking element: ('id', 'x')"):
+            self.driver.execute("clickElement")
+
+
+@pytest.fixture()
+def recorder():
+    recorder = StepRecorder()
+    allure_commons.plugin_manager.register(recorder)
+    command_events.add_listener(recorder.on_command)
+    yield recorder
+    command_events.remove_listener(recorder.on_command)
+    allure_commons.plugin_manager.unregister(recorder)
+
+
+class TestStepTiming:
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile(values, 99) == 99
+        assert percentile([], 50) == 0.0
+
+    def test_steps_are_attributed_to_page_methods(self, recorder):
+        page = FakePage(command_events.attach(FakeDriver()))
+        recorder.start_test("tests/test_x.py::test_one")
+        with allure.step("Open home page"):
+            page.load_things()
+        recorder.finish_test(0.5)
+
+        steps = {record["step"]: record for record in recorder.records}
+        assert set(steps) == {"Open home page", "FakePage.load_things", "Clicking element"}
+        assert steps["FakePage.load_things"]["commands"] == 2
+        assert steps["FakePage.load_things"]["top_level"]
+        assert not steps["Open home page"]["top_level"]
+        assert recorder.tests["tests/test_x.py::test_one"]["commands"] == 2
+
+    def test_retried_step_keeps_its_owner(self, recorder):
+        page = FakePage(command_events.attach(FakeDriver()))
+        engine = StepRetry.for_driver(page.driver)
+        engine.begin(retries=1)
+        failures = [StaleElementReferenceException("gone")]
+
+        def flaky():
+            if failures:
+                raise failures.pop()
+        page.click = flaky
+        page.load_things()
+        assert [record["step"] for record in recorder.records if record["depth"] == 0] == \
+            ["FakePage.load_things", "FakePage.load_things"]
+
+    def test_nested_actions_keyed_by_title(self, recorder):
+        page = FakePage(command_events.attach(FakeDriver()))
+        recorder.start_test("t")
+        page.load_things()
+        recorder.finish_test(0.1)
+        # Only the decorated method is owned by the page; the context-manager step is keyed by its title
+        inner = [record for record in recorder.records if record["depth"] == 1]
+        assert [record["step"] for record in inner] == ["Clicking element"]
+        assert inner[0]["page"] is None and not inner[0]["top_level"]
+        assert inner[0]["commands"] == 1
+
+    def test_summarize_pages_methods_and_tests(self):
+        records = [
+            {"test": "a", "step": "HomePage.open", "page": "HomePage", "top_level": True, "depth": 0,
+             "duration_ms": 300.0, "commands": 3, "wait_ms": 100.0, "failed": False},
+            {"test": "a", "step": "CartPage.get_cart_total", "page": "CartPage", "top_level": True, "depth": 0,
+             "duration_ms": 100.0, "commands": 5, "wait_ms": 0.0, "failed": False},
+            {"test": "b", "step": "HomePage.open", "page": "HomePage", "top_level": True, "depth": 0,
+             "duration_ms": 100.0, "commands": 1, "wait_ms": 0.0, "failed": True},
+        ]
+        tests = {"a": {"duration_ms": 450.0, "commands": 8, "wait_ms": 100.0}}
+        report = summarize(records, tests)
+
+        assert list(report["pages"]) == ["HomePage", "CartPage"]
+        assert report["pages"]["HomePage"]["share"] == 0.8
+        assert report["methods"]["HomePage.open"]["count"] == 2
+        assert report["methods"]["HomePage.open"]["p99_ms"] == 300.0
+        assert report["methods"]["HomePage.open"]["failed"] == 1
+        assert report["tests"]["a"]["commands"] == 8
+        assert report["tests"]["a"]["pages"] == {"HomePage": 300.0, "CartPage": 100.0}
+        assert report["tests"]["b"]["steps"] == 1
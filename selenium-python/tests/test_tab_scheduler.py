@@ -0,0 +1,130 @@
+import pytest
+from base.base_page import BasePage
+from base.tab_scheduler import ReadOnlyViolation, TabScheduler
+
+
+class FakeSwitch:
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.execute("switchToWindow", {"handle": handle})
+        self.driver.current_window_handle = handle
+
+    def new_window(self, kind):
+        handle = f"w{len(self.driver.windows)}"
+        self.driver.windows[handle] = {"url": "about:blank", "polls": 0}
+        self.driver.current_window_handle = handle
+
+
+class FakeDriver:
+    """Tabs whose navigations finish after a number of readiness polls"""
+
+    def __init__(self, load_polls):
+        self.load_polls = load_polls
+        self.windows = {"w0": {"url": "http://shop.test/", "polls": 0}}
+        self.current_window_handle = "w0"
+        self.switch_to = FakeSwitch(self)
+        self.commands = []
+
+    @property
+    def window_handles(self):
+        return list(self.windows)
+
+    @property
+    def current_url(self):
+        return self.windows[self.current_window_handle]["url"]
+
+    def execute(self, command, params=None):
+        self.commands.append(command)
+
+    def execute_script(self, script, *args):
+        window = self.windows[self.current_window_handle]
+        if args:
+            window["url"], window["polls"] = args[0], self.load_polls.get(args[0], 0)
+            return None
+        window["polls"] -= 1
+        return window["polls"] < 0
+
+    def get(self, url):
+        self.execute("get", {"url": url})
+
+    def close(self):
+        del self.windows[self.current_window_handle]
+
+
+class FakePage(BasePage):
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def page_changed(self):
+        pass
+
+
+def test_results_come_back_in_order_while_slow_pages_load():
+    urls = [f"http://shop.test/prod.html?idp_={number}" for number in range(1, 6)]
+    # The first product loads slowly; the others are checked meanwhile
+    driver = FakeDriver({urls[0]: 3})
+    order = []
+
+    def check(page):
+        order.append(page.driver.current_url)
+        return page.driver.current_url
+
+    with TabScheduler(driver, tabs=2, poll_interval=0.001) as tabs:
+        assert tabs.run(FakePage, urls, check) == urls
+        assert tabs.stats()["checks"] == 5
+        assert order[0] == urls[1]
+        assert driver.current_window_handle == "w0"
+    assert driver.window_handles == ["w0"]
+
+
+def test_one_tab_never_switches_while_checking():
+    urls = [f"http://shop.test/prod.html?idp_={number}" for number in range(1, 4)]
+    driver = FakeDriver({})
+    with TabScheduler(driver, tabs=1) as tabs:
+        tabs.run(FakePage, urls, lambda page: page.driver.current_url)
+        # Into the new tab and back to the original window, nothing in between
+        assert tabs.stats()["switches"] == 2
+
+
+def test_latest_window_switch_stays_on_the_checked_tab():
+    driver = FakeDriver({})
+
+    def check(page):
+        page.switch_to_latest_window()
+        return page.driver.current_window_handle
+
+    with TabScheduler(driver, tabs=2) as tabs:
+        handles = tabs.run(FakePage, ["http://shop.test/a", "http://shop.test/b"], check)
+    assert handles == ["w1", "w2"]
+
+
+def test_checks_that_change_state_are_rejected():
+    driver = FakeDriver({})
+
+    def check(page):
+        page.driver.execute("clickElement", {"id": "add-to-cart"})
+
+    with TabScheduler(driver, tabs=2) as tabs:
+        with pytest.raises(ReadOnlyViolation, match="clickElement"):
+            tabs.run(FakePage, ["http://shop.test/a"], check)
+        assert driver.current_window_handle == "w0"
+    assert "clickElement" not in driver.commands
+
+
+def test_a_check_that_catches_the_rejection_still_fails():
+    driver = FakeDriver({})
+
+    def check(page):
+        try:
+            page.driver.execute("goBack")
+        except ReadOnlyViolation:
+            pass
+
+    with TabScheduler(driver, tabs=1) as tabs:
+        with pytest.raises(ReadOnlyViolation, match="check tried to send goBack"):
+            tabs.run(FakePage, ["http://shop.test/a"], check)
+    assert "goBack" not in driver.commands
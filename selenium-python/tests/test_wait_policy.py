@@ -0,0 +1,118 @@
+import threading
+import time
+import pytest
+from selenium.common.exceptions import JavascriptException, NoSuchElementException
+from selenium.webdriver.common.by import By
+from base import wait_policy
+from base.base_page import BasePage
+from base.wait_policy import WaitCancelled, WaitPolicy
+
+
+class FakeDriver:
+    """Answers async scripts with a canned state, finds what ``matches`` holds, and records both"""
+
+    def __init__(self, state=None, error=None, matches=()):
+        self.state = state
+        self.error = error
+        self.matches = list(matches)
+        self.calls = []
+        self.finds = 0
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def execute_async_script(self, script, *args):
+        self.calls.append(args)
+        if self.error is not None:
+            raise self.error
+        return self.state
+
+    def find_elements(self, by, value):
+        self.finds += 1
+        return list(self.matches)
+
+    def find_element(self, by, value):
+        if not self.matches:
+            raise NoSuchElementException(value)
+        return self.matches[0]
+
+
+class FakeElement:
+
+    def is_displayed(self):
+        return True
+
+
+def _page(driver, negative_timeout=0.2):
+    page = BasePage(driver)
+    page.waits = WaitPolicy(driver, timeout=10, negative_timeout=negative_timeout, poll_frequency=0.05)
+    return page
+
+
+def test_dom_change_is_one_async_script_with_the_compiled_locator():
+    driver = FakeDriver({"met": True, "count": 0, "text": None})
+    policy = WaitPolicy(driver, timeout=10)
+    assert policy.dom_change((By.XPATH, "//tr[@class='success']"), ("count_below", 2))["met"]
+    assert driver.calls == [("css selector", "tr[class='success']", ["count_below", 2], 10000)]
+
+
+def test_dom_change_reports_a_timeout_to_wait_listeners():
+    durations = []
+    listener = lambda policy, duration, timed_out: durations.append(timed_out)
+    wait_policy.add_wait_listener(listener)
+    try:
+        policy = WaitPolicy(FakeDriver({"met": False, "count": 0, "text": ""}))
+        state = policy.dom_change((By.ID, "totalp"), ("text_matches", r"^\d+$"), timeout=0.5)
+    finally:
+        wait_policy.remove_wait_listener(listener)
+    assert state == {"met": False, "count": 0, "text": ""}
+    assert durations == [True]
+
+
+def test_navigation_during_dom_change_cancels_the_wait():
+    policy = WaitPolicy(FakeDriver(error=JavascriptException("document unloaded while waiting for result")))
+    with pytest.raises(WaitCancelled, match="document unloaded"):
+        policy.dom_change((By.ID, "totalp"), ("present",))
+
+
+def test_absent_costs_one_command_when_nothing_matches():
+    driver = FakeDriver()
+    assert WaitPolicy(driver).absent((By.ID, "orderModal"))
+    assert driver.finds == 1
+
+
+def test_absent_waits_only_the_negative_timeout_for_matches_to_go_away():
+    driver = FakeDriver(matches=[FakeElement()])
+    policy = WaitPolicy(driver, timeout=10, negative_timeout=0.2, poll_frequency=0.05)
+    start = time.perf_counter()
+    assert not policy.absent((By.ID, "orderModal"))
+    assert time.perf_counter() - start < 1
+
+
+def test_present_returns_as_soon_as_the_element_appears():
+    driver = FakeDriver()
+    threading.Timer(0.1, lambda: driver.matches.append(FakeElement())).start()
+    start = time.perf_counter()
+    assert WaitPolicy(driver, timeout=10, poll_frequency=0.05).present((By.ID, "tbodyid"))
+    assert time.perf_counter() - start < 1
+
+
+def test_empty_find_elements_waits_for_requests_to_settle_then_only_the_negative_timeout():
+    driver = FakeDriver({"met": True, "inflight": 0, "seq": 0, "request": None})
+    page = _page(driver)
+    start = time.perf_counter()
+    assert page.find_elements((By.CSS_SELECTOR, "#tbodyid > tr")) == []
+    assert time.perf_counter() - start < 1
+    assert [args[0] for args in driver.calls] == [["idle", 300]]
+    assert page.find_elements((By.CSS_SELECTOR, "#tbodyid > tr"), expect_empty=True) == []
+    assert len(driver.calls) == 1
+
+
+def test_is_element_displayed_is_a_negative_check():
+    driver = FakeDriver({"met": True, "inflight": 0, "seq": 0, "request": None})
+    page = _page(driver)
+    start = time.perf_counter()
+    assert not page.is_element_displayed((By.ID, "orderModal"))
+    assert time.perf_counter() - start < 1
+    driver.matches.append(FakeElement())
+    assert page.is_element_displayed((By.ID, "orderModal"))
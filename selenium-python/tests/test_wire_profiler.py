@@ -0,0 +1,79 @@
+from base.base_page import BasePage
+from plugins.parallel import WORKER_ENV
+from utils import command_events
+from utils import wire_profiler
+from utils.wire_profiler import WireProfiler
+
+
+class FakeDriver:
+
+    def execute(self, driver_command, params=None):
+        return {"value": None}
+
+
+class FakeHomePage(BasePage):
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def get_titles(self):
+        return [self._read(index) for index in range(3)]
+
+    def _read(self, index):
+        return self.driver.execute("getElementText", {"id": index})
+
+
+class TestWireProfiler:
+
+    def test_commands_are_charged_to_outermost_page_method(self, tmp_path):
+        profiler = WireProfiler(output=str(tmp_path / "profile.folded")).start()
+        try:
+            page = FakeHomePage(command_events.attach(FakeDriver()))
+            page.get_titles()
+            page.driver.execute("getTitle")
+        finally:
+            profiler.stop()
+
+        sites = {(site, command): count for site, command, count, _ in profiler.top()}
+        assert sites[("FakeHomePage.get_titles", "getElementText")] == 3
+        assert sites[("test_wire_profiler.test_commands_are_charged_to_outermost_page_method", "getTitle")] == 1
+        assert profiler.commands == 4
+
+    def test_collapsed_stacks_are_flamegraph_compatible(self, tmp_path):
+        profiler = WireProfiler(output=str(tmp_path / "profile.folded")).start()
+        try:
+            FakeHomePage(command_events.attach(FakeDriver())).get_titles()
+        finally:
+            profiler.stop()
+
+        lines = open(profiler.save()).read().splitlines()
+        assert len(lines) == 1
+        stack, micros = lines[0].rsplit(" ", 1)
+        assert stack == ("test_wire_profiler.test_collapsed_stacks_are_flamegraph_compatible;"
+                         "FakeHomePage.get_titles;FakeHomePage._read;getElementText")
+        assert micros.isdigit()
+        assert "getElementText" in profiler.report()
+
+    def test_nothing_recorded_writes_nothing(self, tmp_path):
+        assert WireProfiler(output=str(tmp_path / "p.folded")).save() is None
+
+    def test_worker_profiles_are_merged_by_the_controller(self, tmp_path, monkeypatch):
+        output = str(tmp_path / "profile.folded")
+        for worker in ("0", "1"):
+            monkeypatch.setenv(WORKER_ENV, worker)
+            profiler = WireProfiler(output=output).start()
+            try:
+                FakeHomePage(command_events.attach(FakeDriver())).get_titles()
+            finally:
+                profiler.stop()
+            assert profiler.save() == f"{output}.worker-{worker}"
+        monkeypatch.delenv(WORKER_ENV)
+        monkeypatch.setattr(wire_profiler, "_profiler", None)
+        monkeypatch.setattr(wire_profiler, "enable", lambda output, top: WireProfiler(output, top))
+
+        merged = wire_profiler.merge_worker_profiles(output)
+        assert merged.commands == 6
+        assert merged.top()[0][:3] == ("FakeHomePage.get_titles", "getElementText", 6)
+        assert not list(tmp_path.glob("*.worker-*"))
+        stack, micros = open(merged.save()).read().split()
+        assert stack.endswith("FakeHomePage._read;getElementText")
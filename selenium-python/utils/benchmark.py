@@ -0,0 +1,168 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from utils import command_events
+from utils.driver_factory import DriverFactory
+
+
+class Benchmark:
+    """Time page-object methods and count the WebDriver commands they send.
+
+    ``run`` calls a method ``warmup + rounds`` times, calling ``setup`` (not
+    timed, not counted) before each round, and keeps the median wall time and
+    command count of the timed rounds. ``regressions`` compares the results
+    with a baseline using the tolerances from config.json ``benchmarks``; a
+    result with no baseline entry counts as a regression.
+    """
+
+    def __init__(self, settings=None):
+        self.settings = settings or DriverFactory().get_benchmark_config()
+        self.results = {}
+        self._local = threading.local()
+        command_events.add_listener(self._on_command)
+
+    def _on_command(self, driver, command, params, duration, error):
+        if getattr(self._local, 'counting', False):
+            self._local.commands += 1
+
+    def run(self, name, method, *args, setup=None, rounds=None, warmup=None, **kwargs):
+        """Benchmark method(*args, **kwargs) under name; returns the method's last result"""
+        rounds = rounds or self.settings['rounds']
+        warmup = self.settings['warmup'] if warmup is None else warmup
+        times, commands, result = [], [], None
+        for index in range(warmup + rounds):
+            if setup is not None:
+                setup()
+            self._local.commands = 0
+            self._local.counting = True
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                self._local.counting = False
+            if index >= warmup:
+                times.append(elapsed * 1000)
+                commands.append(self._local.commands)
+        self.results[name] = {
+            "rounds": rounds,
+            "median_ms": round(statistics.median(times), 3),
+            "min_ms": round(min(times), 3),
+            "max_ms": round(max(times), 3),
+            "commands": statistics.median_low(commands),
+        }
+        return result
+
+    def regressions(self, baseline, names=None):
+        """Messages for every result slower or chattier than its baseline beyond tolerance, or without one"""
+        messages = []
+        for name in names or self.results:
+            current, base = self.results.get(name), baseline.get("methods", {}).get(name)
+            if current is None:
+                continue
+            if base is None:
+                # Passing an unmeasured method would leave the gate open for good
+                messages.append(f"{name}: no baseline entry; record one with --update-baseline")
+                continue
+            time_limit = max(base["median_ms"] * (1 + self.settings['time_tolerance']),
+                             base["median_ms"] + self.settings['min_regression_ms'])
+            if current["median_ms"] > time_limit:
+                messages.append(f"{name}: median {current['median_ms']:.1f}ms exceeds baseline "
+                                f"{base['median_ms']:.1f}ms by more than {self.settings['time_tolerance']:.0%}")
+            command_limit = base["commands"] * (1 + self.settings['command_tolerance'])
+            if current["commands"] > command_limit:
+                messages.append(f"{name}: {current['commands']} WebDriver commands, baseline {base['commands']}")
+        return messages
+
+    def close(self):
+        """Stop counting commands"""
+        command_events.remove_listener(self._on_command)
+
+
+def load_baseline(path):
+    """Read a baseline file; a missing file is an empty baseline"""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"methods": {}}
+
+
+def save_baseline(path, results, previous=None):
+    """Write results as the new baseline, keeping entries for methods that did not run"""
+    methods = dict((previous or {}).get("methods", {}))
+    methods.update(results)
+    _write_json(path, {"updated_at": _now(), "commit": _git_commit(), "methods": dict(sorted(methods.items()))})
+
+
+def append_history(path, results):
+    """Append one run's results to the JSON-lines history"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'a') as f:
+        f.write(json.dumps({"timestamp": _now(), "commit": _git_commit(), "methods": results}) + "\n")
+
+
+def load_history(path):
+    """Read every recorded run, oldest first"""
+    try:
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def trend(history, last=10):
+    """Markdown table of median time (and command count) per method over the last runs"""
+    runs = history[-last:]
+    if not runs:
+        return "No benchmark runs recorded yet."
+    names = sorted({name for run in runs for name in run["methods"]})
+    header = ["method"] + [(run.get("commit") or run["timestamp"][:16])[:10] for run in runs] + ["change"]
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    for name in names:
+        cells, medians = [], []
+        for run in runs:
+            result = run["methods"].get(name)
+            if result is None:
+                cells.append("")
+                continue
+            medians.append(result["median_ms"])
+            cells.append(f"{result['median_ms']:.1f}ms / {result['commands']}")
+        change = f"{(medians[-1] - medians[0]) / medians[0]:+.0%}" if len(medians) > 1 and medians[0] else ""
+        lines.append("| " + " | ".join([name] + cells + [change]) + " |")
+    return "\n".join(lines)
+
+
+def _write_json(path, data):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+if __name__ == '__main__':
+    # Usage: python -m utils.benchmark [history.jsonl] [last_n]
+    settings = DriverFactory().get_benchmark_config()
+    history_path = sys.argv[1] if len(sys.argv) > 1 else settings['history']
+    print(trend(load_history(history_path), int(sys.argv[2]) if len(sys.argv) > 2 else 10))
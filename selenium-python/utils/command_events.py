@@ -0,0 +1,68 @@
+import threading
+import time
+
+# Called as listener(driver, command, params, duration_s, error) after every WebDriver command
+_listeners = []
+# Called as guard(driver, command, params) before every WebDriver command; raising stops it being sent
+_guards = []
+_lock = threading.Lock()
+
+
+def add_listener(listener):
+    """Observe every WebDriver command sent by drivers passed to attach()"""
+    with _lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+
+
+def remove_listener(listener):
+    """Stop observing WebDriver commands"""
+    with _lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def add_guard(guard):
+    """Check every WebDriver command before it is sent; an exception from guard rejects the command"""
+    with _lock:
+        if guard not in _guards:
+            _guards.append(guard)
+
+
+def remove_guard(guard):
+    """Stop checking WebDriver commands"""
+    with _lock:
+        if guard in _guards:
+            _guards.remove(guard)
+
+
+def attach(driver):
+    """Route a driver's wire commands through the guards and listeners; safe to call more than once"""
+    if getattr(driver, '_command_events_attached', False):
+        return driver
+    execute = driver.execute
+
+    def _execute(driver_command, params=None):
+        for guard in list(_guards):
+            guard(driver, driver_command, params)
+        if not _listeners:
+            return execute(driver_command, params)
+        start = time.perf_counter()
+        error = None
+        try:
+            return execute(driver_command, params)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            for listener in list(_listeners):
+                try:
+                    listener(driver, driver_command, params, duration, error)
+                except Exception:
+                    # Observers must never break the command itself
+                    pass
+
+    driver.execute = _execute
+    driver._command_events_attached = True
+    return driver
@@ -0,0 +1,224 @@
+"""Local stand-in for the DemoBlaze site.
+
+Serves the store pages from ``fixtures/demoblaze`` and answers the same JSON
+API the live site's XHRs call (``/entries``, ``/bycat``, ``/view``,
+``/addtocart``, ``/viewcart``, ``/deleteitem``, ``/deletecart``) from the
+fixture catalog and an in-memory cart store, so suites run offline at local
+latency.
+
+Run standalone with ``python -m utils.demoblaze_server [port]``.
+"""
+import json
+import mimetypes
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'demoblaze')
+PAGE_SIZE = 9
+PLACEHOLDER_IMAGE = (
+    b'<svg xmlns="http://www.w3.org/2000/svg" width="400" height="400">'
+    b'<rect width="100%" height="100%" fill="#ccc"/></svg>'
+)
+
+
+class CartStore:
+    """Thread-safe in-memory cart entries keyed by the shopper's cookie"""
+
+    def __init__(self):
+        self._entries = []
+        self._lock = threading.Lock()
+
+    def add(self, cookie, entry_id, prod_id):
+        with self._lock:
+            self._entries.append({"cookie": cookie, "id": entry_id, "prod_id": int(prod_id)})
+
+    def items(self, cookie):
+        with self._lock:
+            return [dict(entry) for entry in self._entries if entry["cookie"] == cookie]
+
+    def delete(self, entry_id):
+        with self._lock:
+            self._entries = [entry for entry in self._entries if entry["id"] != entry_id]
+
+    def clear(self, cookie=None):
+        with self._lock:
+            self._entries = [entry for entry in self._entries if cookie is not None and entry["cookie"] != cookie]
+
+
+class DemoBlazeRequestHandler(BaseHTTPRequestHandler):
+    """Route page, asset and API requests for the stand-in server"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == '/entries':
+            return self._send_json(self._entries_page())
+        return self._send_static(path)
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        body = self._read_json()
+        catalog = self.server.catalog
+        cart = self.server.cart
+        if path == '/entries':
+            return self._send_json(self._entries_page())
+        if path == '/bycat':
+            return self._send_json({"Items": [item for item in catalog.values() if item["cat"] == body.get("cat")]})
+        if path == '/view':
+            product_id = self._int_field(body, "id")
+            if product_id is None:
+                return self._send_error(400, "Product id must be a number")
+            item = catalog.get(product_id)
+            return self._send_json(item) if item else self._send_error(404, "Product not found")
+        if path == '/addtocart':
+            if self._int_field(body, "prod_id") is None:
+                return self._send_error(400, "Product id must be a number")
+            cart.add(body.get("cookie"), body.get("id"), body.get("prod_id"))
+            return self._send_json({})
+        if path == '/viewcart':
+            return self._send_json({"Items": cart.items(body.get("cookie"))})
+        if path == '/deleteitem':
+            cart.delete(body.get("id"))
+            return self._send_json("Item deleted.")
+        if path == '/deletecart':
+            cart.clear(body.get("cookie"))
+            return self._send_json({})
+        return self._send_error(404, "Not found")
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._send_cors_headers()
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        # Keep test output clean; requests are not interesting here
+        pass
+
+    def _entries_page(self):
+        items = list(self.server.catalog.values())[:PAGE_SIZE]
+        return {"Items": items, "LastEvaluatedKey": {"id": str(items[-1]["id"])} if items else {}}
+
+    @staticmethod
+    def _int_field(body, name):
+        """body[name] as an int, or None when it is missing or not a number"""
+        try:
+            return int(body.get(name))
+        except (TypeError, ValueError):
+            return None
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return {}
+
+    def _send_static(self, path):
+        if path in ('', '/'):
+            path = '/index.html'
+        if path.startswith('/imgs/') or path.endswith(('.png', '.jpg', '.jpeg', '.gif')):
+            return self._send_bytes(PLACEHOLDER_IMAGE, 'image/svg+xml')
+        content = self.server.load_static(path.lstrip('/'))
+        if content is None:
+            return self._send_error(404, "Not found")
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        return self._send_bytes(content, content_type)
+
+    def _send_json(self, payload, status=200):
+        self._send_bytes(json.dumps(payload).encode('utf-8'), 'application/json', status)
+
+    def _send_error(self, status, message):
+        self._send_json({"errorMessage": message}, status)
+
+    def _send_bytes(self, body, content_type, status=200):
+        self.send_response(status)
+        self._send_cors_headers()
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_cors_headers(self):
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+
+
+class DemoBlazeServer:
+    """DemoBlaze stand-in served from a background thread on an ephemeral port"""
+
+    def __init__(self, host='127.0.0.1', port=0, fixtures_dir=FIXTURES_DIR):
+        self.host = host
+        self.port = port
+        self.fixtures_dir = fixtures_dir
+        self.cart = CartStore()
+        self._httpd = None
+        self._thread = None
+        self._static = {}
+
+    @property
+    def base_url(self):
+        """Base URL of the running server"""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """Start serving and return the base URL"""
+        httpd = ThreadingHTTPServer((self.host, self.port), DemoBlazeRequestHandler)
+        httpd.daemon_threads = True
+        httpd.catalog = self._load_catalog()
+        httpd.cart = self.cart
+        httpd.load_static = self._load_static
+        self.port = httpd.server_address[1]
+        self._httpd = httpd
+        self._thread = threading.Thread(target=httpd.serve_forever, name='demoblaze-server', daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        """Stop serving"""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _load_catalog(self):
+        with open(os.path.join(self.fixtures_dir, 'entries.json')) as f:
+            return {item["id"]: item for item in json.load(f)["Items"]}
+
+    def _load_static(self, name):
+        """Read a fixture file once, expanding the shared {{header}}/{{footer}} partials in pages"""
+        if name not in self._static:
+            path = os.path.normpath(os.path.join(self.fixtures_dir, name))
+            if not path.startswith(os.path.normpath(self.fixtures_dir) + os.sep) or not os.path.isfile(path) \
+                    or os.path.basename(path).startswith('_'):
+                return None
+            with open(path, 'rb') as f:
+                content = f.read()
+            if name.endswith('.html'):
+                for partial in ('header', 'footer'):
+                    with open(os.path.join(self.fixtures_dir, f'_{partial}.html'), 'rb') as f:
+                        content = content.replace(b'{{' + partial.encode() + b'}}', f.read())
+            self._static[name] = content
+        return self._static[name]
+
+
+if __name__ == '__main__':
+    server = DemoBlazeServer(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8000)
+    print(f"DemoBlaze stand-in serving on {server.start()}")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
@@ -7,6 +7,14 @@ from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.edge.options import Options as EdgeOptions
 import json
 import os
+import threading
+import time
+from urllib.parse import urlsplit
+from utils import command_events, session_hub, shared_service, wire_profiler
+from utils.network_policy import NetworkPolicy
+
+# Set while a local stand-in server is running; overrides config.json base_url
+BASE_URL_ENV = 'DEMOBLAZE_BASE_URL'
 
 class DriverFactory:
     def __init__(self):
@@ -20,24 +28,57 @@ class DriverFactory:
         except FileNotFoundError:
             return {"browser": "chrome", "base_url": "https://www.demoblaze.com"}
     
-    def get_driver(self, browser=None):
-        """Get WebDriver instance for specified browser"""
+    def get_driver(self, browser=None, instrument=True):
+        """Get WebDriver instance for specified browser; instrument=False leaves instrument() to the caller"""
         if browser is None:
             browser = self.config.get('browser', 'chrome')
         
         browser = browser.lower()
         
-        if browser == 'chrome':
-            return self._get_chrome_driver()
+        if self.get_remote_config()['enabled']:
+            driver = self._get_remote_driver(browser)
+        elif browser == 'chrome':
+            driver = self._get_chrome_driver()
         elif browser == 'firefox':
-            return self._get_firefox_driver()
+            driver = self._get_firefox_driver()
         elif browser == 'edge':
-            return self._get_edge_driver()
+            driver = self._get_edge_driver()
         else:
             raise Exception(f'Browser {browser} not supported')
+        return self.instrument(driver) if instrument else driver
+
+    def instrument(self, driver):
+        """Install the configured network policy and profiler and route the driver's commands to listeners"""
+        network = self.get_network_policy_config()
+        if network['enabled']:
+            NetworkPolicy.for_driver(driver).install(network)
+        profiler = self.get_profiler_config()
+        if profiler['enabled']:
+            wire_profiler.enable(profiler['output'], profiler['top'])
+        # Lets instrumentation observe every wire command this session sends
+        return command_events.attach(driver)
     
-    def _get_chrome_driver(self):
-        """Get Chrome WebDriver with optimized options"""
+    def get_options(self, browser=None):
+        """Get the configured browser options for specified browser"""
+        browser = (browser or self.config.get('browser', 'chrome')).lower()
+        if browser == 'chrome':
+            return self._chrome_options()
+        elif browser == 'firefox':
+            return self._firefox_options()
+        elif browser == 'edge':
+            return self._edge_options()
+        raise Exception(f'Browser {browser} not supported')
+
+    def get_service(self, browser=None):
+        """Get a driver service (chromedriver, geckodriver, msedgedriver) for specified browser"""
+        browser = (browser or self.config.get('browser', 'chrome')).lower()
+        services = {'chrome': ChromeService, 'firefox': FirefoxService, 'edge': EdgeService}
+        if browser not in services:
+            raise Exception(f'Browser {browser} not supported')
+        return services[browser]()
+
+    def _chrome_options(self):
+        """Chrome options tuned for stable automated runs"""
         options = ChromeOptions()
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
@@ -56,19 +97,24 @@ class DriverFactory:
             options.add_argument('--headless=new')
             options.add_argument('--hide-scrollbars')
             options.add_argument('--mute-audio')
-        
+        self._apply_bidi_options(options)
+        return options
+
+    def _get_chrome_driver(self):
+        """Get Chrome WebDriver with optimized options"""
+        options = self._chrome_options()
         try:
-            driver = webdriver.Chrome(options=options)
+            driver = self._new_session('chrome', options, webdriver.Chrome)
             driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
             # Use reasonable timeouts
             driver.set_page_load_timeout(self.config.get('page_load_timeout', 30))
-            driver.implicitly_wait(self.get_implicit_wait())
+            # Implicit waits stay off; BasePage's WaitPolicy owns all element waits
             return driver
         except Exception as e:
             raise Exception(f'Failed to initialize Chrome driver: {str(e)}')
     
-    def _get_firefox_driver(self):
-        """Get Firefox WebDriver with optimized options"""
+    def _firefox_options(self):
+        """Firefox options sized like the Chrome window"""
         options = FirefoxOptions()
         options.add_argument('--width=1920')
         options.add_argument('--height=1080')
@@ -76,15 +122,20 @@ class DriverFactory:
         # Add headless option if specified in config
         if self.config.get('headless', False):
             options.add_argument('--headless')
-        
+        self._apply_bidi_options(options)
+        return options
+
+    def _get_firefox_driver(self):
+        """Get Firefox WebDriver with optimized options"""
+        options = self._firefox_options()
         try:
             driver = webdriver.Firefox(options=options)
             return driver
         except Exception as e:
             raise Exception(f'Failed to initialize Firefox driver: {str(e)}')
     
-    def _get_edge_driver(self):
-        """Get Edge WebDriver with optimized options"""
+    def _edge_options(self):
+        """Edge options mirroring the Chrome flags"""
         options = EdgeOptions()
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-dev-shm-usage')
@@ -93,17 +144,53 @@ class DriverFactory:
         # Add headless option if specified in config
         if self.config.get('headless', False):
             options.add_argument('--headless')
-        
+        self._apply_bidi_options(options)
+        return options
+
+    def _get_edge_driver(self):
+        """Get Edge WebDriver with optimized options"""
+        options = self._edge_options()
         try:
-            driver = webdriver.Edge(options=options)
+            driver = self._new_session('edge', options, webdriver.Edge)
             return driver
         except Exception as e:
             raise Exception(f'Failed to initialize Edge driver: {str(e)}')
     
+    def _get_remote_driver(self, browser):
+        """Get a session from the configured hub, or from the in-repo session hub when no url is set"""
+        options = self.get_options(browser)
+        try:
+            driver = webdriver.Remote(command_executor=session_hub.hub_url(self), options=options)
+            driver.set_page_load_timeout(self.config.get('page_load_timeout', 30))
+            return driver
+        except Exception as e:
+            raise Exception(f'Failed to initialize remote {browser} driver: {str(e)}')
+
+    def _new_session(self, browser, options, driver_class):
+        """Start a session on the worker's shared driver service, or with a driver process of its own"""
+        if self.get_shared_service_config()['enabled'] and browser in shared_service.SHAREABLE:
+            return shared_service.get_service(self, browser).new_driver(options)
+        return driver_class(options=options)
+
+    def _apply_bidi_options(self, options):
+        """Open a WebDriver BiDi channel for dialog events and network interception"""
+        if self.get_dialog_config()['events'] or self.get_network_policy_config()['enabled']:
+            options.enable_bidi = True
+
     def get_base_url(self):
-        """Get base URL from configuration"""
-        return self.config.get('base_url', 'https://www.demoblaze.com')
+        """Get base URL, preferring a running local stand-in server over configuration"""
+        return os.environ.get(BASE_URL_ENV) or self.config.get('base_url', 'https://www.demoblaze.com')
     
+    def get_api_url(self):
+        """Get the shop backend URL; the local stand-in serves its API from the base URL"""
+        return os.environ.get(BASE_URL_ENV) or self.config.get('api_url', 'https://api.demoblaze.com')
+
+    def get_seeding_config(self):
+        """Get API state seeding settings from configuration"""
+        defaults = {"pool_size": 8, "timeout": 10}
+        defaults.update(self.config.get('api_seeding', {}))
+        return defaults
+
     def get_implicit_wait(self):
         """Get implicit wait time from configuration"""
         return self.config.get('implicit_wait', 10)
@@ -111,3 +198,399 @@ class DriverFactory:
     def get_explicit_wait(self):
         """Get explicit wait time from configuration"""
         return self.config.get('explicit_wait', 10)
+
+    def get_wait_config(self):
+        """Get wait policy settings from configuration"""
+        return {
+            "explicit_wait": self.get_explicit_wait(),
+            "negative_wait": self.config.get('negative_wait', 1),
+            "poll_frequency": self.config.get('poll_frequency', 0.1),
+        }
+
+    def get_dialog_config(self):
+        """Get JavaScript dialog handling settings from configuration"""
+        defaults = {"events": True, "policy": "accept"}
+        defaults.update(self.config.get('dialogs', {}))
+        return defaults
+
+    def get_network_policy_config(self):
+        """Get request blocking and rewriting rules from configuration"""
+        defaults = {"enabled": False, "allow": [], "deny": [], "block_types": [], "rewrite": []}
+        defaults.update(self.config.get('network_policy', {}))
+        return defaults
+
+    def get_screenshot_config(self):
+        """Get screenshot capture flags from test_config and pipeline settings from screenshots"""
+        test_config = self.config.get('test_config', {})
+        defaults = {"on_failure": test_config.get('screenshot_on_failure', True),
+                    "on_success": test_config.get('screenshot_on_success', False),
+                    "dir": "reports/screenshots", "format": "webp", "quality": 80,
+                    "hash_distance": 4, "queue_size": 16, "attach_timeout": 5}
+        defaults.update(self.config.get('screenshots', {}))
+        return defaults
+
+    def get_retry_config(self):
+        """Get step retry and flaky-test quarantine settings from configuration"""
+        defaults = {"retries": self.config.get('test_config', {}).get('retry_failed_tests', 1),
+                    "transient": ["StaleElementReferenceException", "UnexpectedAlertPresentException",
+                                  "TimeoutException", "NoSuchElementException",
+                                  "ElementClickInterceptedException"],
+                    "quarantine_after": 3, "quarantine_window": 10}
+        defaults.update(self.config.get('step_retry', {}))
+        return defaults
+
+    def get_impact_config(self):
+        """Get test-impact index settings from configuration"""
+        defaults = {"record": False, "database": "reports/test_impact.sqlite"}
+        defaults.update(self.config.get('test_impact', {}))
+        return defaults
+
+    def get_result_cache_config(self):
+        """Get cached-pass reuse settings; hermetic_only limits reuse to runs against the stand-in"""
+        defaults = {"enabled": True, "hermetic_only": True, "max_entries": 500, "paths": ["tests/"]}
+        defaults.update(self.config.get('result_cache', {}))
+        return defaults
+
+    def get_readiness_config(self):
+        """Get fetch/XHR readiness tracking settings from configuration"""
+        defaults = {"quiet_ms": 300, "preload": True}
+        defaults.update(self.config.get('readiness', {}))
+        return defaults
+
+    def get_tab_config(self):
+        """Get multi-tab scheduler settings from configuration"""
+        defaults = {"tabs": 4, "load_timeout": 30, "poll_interval": 0.05}
+        defaults.update(self.config.get('tab_scheduler', {}))
+        return defaults
+
+    def get_stand_in_config(self):
+        """Get local stand-in server settings from configuration"""
+        defaults = {"enabled": False, "host": "127.0.0.1"}
+        defaults.update(self.config.get('stand_in_server', {}))
+        return defaults
+
+    def get_reporting_config(self):
+        """Get reporting settings from configuration"""
+        defaults = {"allure": True, "html": True, "json": False, "json_path": "reports/step_timings.json"}
+        defaults.update(self.config.get('reporting', {}))
+        return defaults
+
+    def get_profiler_config(self):
+        """Get wire-command profiler settings from configuration"""
+        defaults = {"enabled": False, "output": "reports/wire_profile.folded", "top": 15}
+        defaults.update(self.config.get('profiler', {}))
+        return defaults
+
+    def get_benchmark_config(self):
+        """Get page-object benchmark settings from configuration"""
+        defaults = {"rounds": 5, "warmup": 1, "time_tolerance": 0.25, "command_tolerance": 0.0,
+                    "min_regression_ms": 5, "baseline": "benchmarks/baseline.json",
+                    "history": "reports/benchmark_history.jsonl", "trend": "reports/benchmark_trend.md"}
+        defaults.update(self.config.get('benchmarks', {}))
+        return defaults
+
+    def get_async_config(self):
+        """Get asyncio page-object layer settings from configuration"""
+        defaults = {"connections": 32, "max_sessions": 24}
+        defaults.update(self.config.get('async_sessions', {}))
+        return defaults
+
+    def get_remote_config(self):
+        """Get remote mode settings; without a url sessions go through the in-repo session hub"""
+        defaults = {"enabled": False, "url": None, "host": "127.0.0.1", "port": 0,
+                    "nodes": {"chrome": 4}, "slots_per_node": 4,
+                    "new_session_timeout": 300, "session_timeout": 300}
+        defaults.update(self.config.get('remote', {}))
+        return defaults
+
+    def get_shared_service_config(self):
+        """Get shared driver service settings; connections 0 sizes the pool from driver_pool"""
+        defaults = {"enabled": False, "connections": 0}
+        defaults.update(self.config.get('shared_service', {}))
+        return defaults
+
+    def get_pool_config(self):
+        """Get driver pool settings from configuration"""
+        defaults = {"enabled": True, "size": 1, "max_reuse": 25, "health_check": True,
+                    "spares": 1, "spare_max_idle": 300, "spare_wait": 30}
+        defaults.update(self.config.get('driver_pool', {}))
+        return defaults
+
+
+class PooledSession:
+    """A live WebDriver session tracked by the pool"""
+
+    def __init__(self, driver, browser):
+        self.driver = driver
+        self.browser = browser
+        self.uses = 0
+
+
+class DriverPool:
+    """Lease already-running WebDriver sessions to tests and reset them on return.
+
+    Sessions are keyed by browser name. A released session is reset (alerts
+    dismissed, extra windows closed, cookies and storage cleared, navigated to
+    about:blank) and kept for the next lease until it reaches ``max_reuse``
+    leases, fails its health check or the pool already holds ``size`` idle
+    sessions for that browser.
+
+    Whenever a new browser has to be launched (first lease, a retired
+    session), ``spares`` more are started on background threads so the next
+    launch is already done when a test asks for it. Spares are launched bare
+    and instrumented by the thread that leases them, so their start-up
+    commands are not charged to whatever test is running meanwhile. A lease
+    waits at most ``spare_wait`` seconds for a spare still starting before it
+    launches in the foreground. Spares that wait longer than
+    ``spare_max_idle`` seconds are quit.
+    """
+
+    def __init__(self, factory=None, size=None, max_reuse=None, health_check=None, enabled=None,
+                 spares=None, spare_max_idle=None, spare_wait=None):
+        self.factory = factory or DriverFactory()
+        pool_config = self.factory.get_pool_config()
+        self.enabled = pool_config['enabled'] if enabled is None else enabled
+        self.size = pool_config['size'] if size is None else size
+        self.max_reuse = pool_config['max_reuse'] if max_reuse is None else max_reuse
+        self.health_check = pool_config['health_check'] if health_check is None else health_check
+        self.spares = pool_config['spares'] if spares is None else spares
+        self.spare_max_idle = pool_config['spare_max_idle'] if spare_max_idle is None else spare_max_idle
+        self.spare_wait = pool_config['spare_wait'] if spare_wait is None else spare_wait
+        self._idle = {}
+        self._leased = {}
+        self._spares = {}
+        self._warming = {}
+        self._closed = False
+        self._lock = threading.Lock()
+        self._spare_ready = threading.Condition(self._lock)
+        self.leases = 0
+        self.launches = 0
+        self.reused = 0
+        self.retired = 0
+        self.spares_used = 0
+        self.spares_expired = 0
+
+    def acquire(self, browser=None):
+        """Lease a healthy session, launching a new one only when none is idle"""
+        browser = (browser or self.factory.config.get('browser', 'chrome')).lower()
+        self._expire_spares()
+        session = None
+        while session is None:
+            with self._lock:
+                idle = self._idle.get(browser, [])
+                candidate = idle.pop() if idle else None
+            if candidate is None:
+                session = PooledSession(self._new_driver(browser), browser)
+            elif not self.health_check or self.is_healthy(candidate.driver):
+                session = candidate
+            else:
+                self._retire(candidate)
+        with self._lock:
+            if session.uses:
+                self.reused += 1
+            session.uses += 1
+            self.leases += 1
+            self._leased[id(session.driver)] = session
+        return session.driver
+
+    def release(self, driver, healthy=True):
+        """Return a leased session, resetting it for reuse or retiring it"""
+        with self._lock:
+            session = self._leased.pop(id(driver), None)
+        self._expire_spares()
+        if session is None:
+            self._quit(driver)
+            return
+        keep = self.enabled and healthy and session.uses < self.max_reuse
+        if keep:
+            keep = self.reset_driver(driver)
+        with self._lock:
+            idle = self._idle.setdefault(session.browser, [])
+            if keep and len(idle) < self.size:
+                idle.append(session)
+                return
+        self._retire(session)
+        if not keep:
+            # The next lease needs a new browser; start it while this test tears down
+            self._warm(session.browser)
+
+    def reset_driver(self, driver):
+        """Bring a session back to a blank state; return False if it could not be reset"""
+        try:
+            self._dismiss_alerts(driver)
+            watcher = getattr(driver, '_dialog_watcher', None)
+            if watcher is not None:
+                watcher.clear()
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except Exception:
+                # about:blank and data: URLs have no storage
+                pass
+            if hasattr(driver, 'execute_cdp_cmd'):
+                # Clears cookies for every domain, not just the current one
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+                for origin in self._storage_origins():
+                    driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                        'origin': origin, 'storageTypes': 'local_storage,session_storage'})
+            else:
+                driver.delete_all_cookies()
+            driver.get('about:blank')
+            return True
+        except Exception:
+            return False
+
+    def _storage_origins(self):
+        """Origins whose storage tests write: the site under test and its API"""
+        origins = []
+        for url in (self.factory.get_base_url(), self.factory.get_api_url()):
+            parts = urlsplit(url)
+            origin = f"{parts.scheme}://{parts.netloc}"
+            if parts.netloc and origin not in origins:
+                origins.append(origin)
+        return origins
+
+    def is_healthy(self, driver):
+        """Check that the session still responds to commands"""
+        try:
+            driver.window_handles
+            return True
+        except Exception:
+            return False
+
+    def shutdown(self):
+        """Quit every session owned by the pool"""
+        with self._lock:
+            self._closed = True
+            sessions = [s for idle in self._idle.values() for s in idle]
+            sessions.extend(self._leased.values())
+            spares = [driver for ready in self._spares.values() for driver, _ in ready]
+            self._idle.clear()
+            self._leased.clear()
+            self._spares.clear()
+        for session in sessions:
+            self._quit(session.driver)
+        for driver in spares:
+            self._quit(driver)
+
+    @property
+    def launches_saved(self):
+        """Number of browser launches avoided by reusing sessions"""
+        # Not leases - launches: spares are launches too, including ones never leased
+        return self.reused
+
+    def stats(self):
+        """Get pool usage counters"""
+        return {
+            "leases": self.leases,
+            "launches": self.launches,
+            "launches_saved": self.launches_saved,
+            "retired": self.retired,
+            "spares_used": self.spares_used,
+            "spares_expired": self.spares_expired,
+        }
+
+    def report(self):
+        """Get a one-line summary of pool usage"""
+        return (f"Driver pool: {self.leases} leases, {self.launches} browser launches, "
+                f"{self.launches_saved} launches saved, {self.retired} sessions retired, "
+                f"{self.spares_used} warm spares used, {self.spares_expired} expired")
+
+    def _new_driver(self, browser):
+        """Hand out a warm spare when one is ready or starting, else launch in the foreground"""
+        driver = None
+        deadline = time.monotonic() + self.spare_wait
+        with self._lock:
+            while True:
+                ready = self._spares.get(browser)
+                if ready:
+                    driver = ready.pop()[0]
+                    break
+                remaining = deadline - time.monotonic()
+                if not self._warming.get(browser) or remaining <= 0:
+                    break
+                # A spare is already starting; waiting for it beats a second cold launch
+                self._spare_ready.wait(remaining)
+        if driver is not None and self.health_check and not self.is_healthy(driver):
+            self._quit(driver)
+            driver = None
+        if driver is None:
+            driver = self._launch(browser)
+        else:
+            with self._lock:
+                self.spares_used += 1
+            driver = self.factory.instrument(driver)
+        self._warm(browser)
+        return driver
+
+    def _warm(self, browser):
+        """Start background launches until browser has spares ready or starting"""
+        with self._lock:
+            if self._closed:
+                return
+            missing = self.spares - len(self._spares.get(browser, [])) - self._warming.get(browser, 0)
+            if missing <= 0:
+                return
+            self._warming[browser] = self._warming.get(browser, 0) + missing
+        for _ in range(missing):
+            threading.Thread(target=self._warm_one, args=(browser,),
+                             name=f"warm-spare-{browser}", daemon=True).start()
+
+    def _warm_one(self, browser):
+        driver = None
+        try:
+            driver = self._launch(browser, instrument=False)
+        except Exception:
+            # The next lease launches in the foreground and surfaces the error
+            pass
+        with self._lock:
+            self._warming[browser] -= 1
+            keep = driver is not None and not self._closed
+            if keep:
+                self._spares.setdefault(browser, []).append((driver, time.monotonic()))
+            self._spare_ready.notify_all()
+        if driver is not None and not keep:
+            self._quit(driver)
+
+    def _expire_spares(self):
+        """Quit spares that have waited longer than spare_max_idle"""
+        cutoff = time.monotonic() - self.spare_max_idle
+        expired = []
+        with self._lock:
+            for ready in self._spares.values():
+                expired.extend(driver for driver, started in ready if started < cutoff)
+                ready[:] = [(driver, started) for driver, started in ready if started >= cutoff]
+            self.spares_expired += len(expired)
+        for driver in expired:
+            self._quit(driver)
+
+    def _launch(self, browser, instrument=True):
+        driver = self.factory.get_driver(browser, instrument=False)
+        driver.maximize_window()
+        with self._lock:
+            self.launches += 1
+        return self.factory.instrument(driver) if instrument else driver
+
+    def _retire(self, session):
+        with self._lock:
+            self.retired += 1
+        self._quit(session.driver)
+
+    def _dismiss_alerts(self, driver):
+        # A page can raise several alerts in a row (e.g. onbeforeunload chains)
+        for _ in range(5):
+            try:
+                driver.switch_to.alert.dismiss()
+            except Exception:
+                return
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
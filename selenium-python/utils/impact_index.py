@@ -0,0 +1,263 @@
+import ast
+import os
+import re
+import sqlite3
+import subprocess
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Changes here can only be mapped to the page objects, locators and tests they define
+PAGES_DIR = "pages/"
+LOCATORS_DIR = "locators/"
+TESTS_DIR = "tests/"
+_HUNK = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tests (
+    nodeid TEXT PRIMARY KEY,
+    outcome TEXT NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS test_symbols (
+    nodeid TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    PRIMARY KEY (nodeid, kind, symbol)
+);
+CREATE INDEX IF NOT EXISTS test_symbols_by_symbol ON test_symbols (kind, symbol);
+"""
+
+
+class ImpactIndex:
+    """Which page-object methods and locator constants each test exercised, in SQLite.
+
+    Rows are written by ``plugins.test_impact`` during normal runs: a passing
+    run replaces a test's symbols, a failing one (which may have stopped
+    early) adds to them. ``affected`` maps a set of changed symbols back to
+    the tests that touched them.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Parallel workers write to the same file; wait for each other's transactions
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.executescript(SCHEMA)
+
+    def record(self, runs):
+        """Store {nodeid: (outcome, {(kind, symbol), ...})} in one transaction"""
+        with self.connection:
+            for nodeid, (outcome, symbols) in runs.items():
+                if outcome == "passed":
+                    self.connection.execute("DELETE FROM test_symbols WHERE nodeid = ?", (nodeid,))
+                self.connection.execute("INSERT OR REPLACE INTO tests VALUES (?, ?, ?)",
+                                        (nodeid, outcome, time.time()))
+                self.connection.executemany("INSERT OR IGNORE INTO test_symbols VALUES (?, ?, ?)",
+                                            [(nodeid, kind, symbol) for kind, symbol in symbols])
+
+    def known_tests(self):
+        """Nodeids that have been recorded at least once"""
+        return {row[0] for row in self.connection.execute("SELECT nodeid FROM tests")}
+
+    def symbols_of(self, nodeid):
+        """(kind, symbol) pairs recorded for a test"""
+        return set(self.connection.execute("SELECT kind, symbol FROM test_symbols WHERE nodeid = ?", (nodeid,)))
+
+    def affected(self, symbols):
+        """Tests that exercised any of the (kind, symbol) pairs; kind "class" matches every member"""
+        nodeids = set()
+        for kind, symbol in symbols:
+            if kind == "class":
+                rows = self.connection.execute("SELECT nodeid FROM test_symbols WHERE symbol LIKE ? ESCAPE '\\'",
+                                               (symbol.replace("_", "\\_") + ".%",))
+            else:
+                rows = self.connection.execute("SELECT nodeid FROM test_symbols WHERE kind = ? AND symbol = ?",
+                                               (kind, symbol))
+            nodeids.update(row[0] for row in rows)
+        return nodeids
+
+    def close(self):
+        self.connection.close()
+
+
+class Change:
+    """What a diff touched: everything, or specific symbols and test functions"""
+
+    def __init__(self):
+        self.everything = []
+        self.symbols = set()
+        self.test_files = {}
+
+    def fan_out(self, path):
+        self.everything.append(path)
+
+    def __repr__(self):
+        return f"Change(everything={self.everything}, symbols={sorted(self.symbols)}, tests={self.test_files})"
+
+
+def git_diff(ref, cwd=PROJECT_ROOT):
+    """Unified diff (no context) between ref and the working tree, paths relative to cwd"""
+    result = subprocess.run(["git", "diff", "--unified=0", "--relative", "--no-renames", ref, "--"],
+                            cwd=cwd, capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def git_show(ref, path, cwd=PROJECT_ROOT):
+    """File contents at ref, or None if it did not exist there"""
+    result = subprocess.run(["git", "show", f"{ref}:./{path}"], cwd=cwd, capture_output=True, text=True)
+    return result.stdout if result.returncode == 0 else None
+
+
+def parse_diff(diff):
+    """Map each changed file to (old line numbers, new line numbers); a None side means the file is absent"""
+    files = {}
+    path = old_path = None
+    for line in diff.splitlines():
+        if line.startswith("--- "):
+            old_path = None if line[4:] == "/dev/null" else line[6:]
+        elif line.startswith("+++ "):
+            path = None if line[4:] == "/dev/null" else line[6:]
+            key = path or old_path
+            files[key] = (set() if old_path else None, set() if path else None)
+        elif line.startswith("@@") and (path or old_path):
+            match = _HUNK.match(line)
+            old_start, old_count, new_start, new_count = (int(group) if group is not None else 1
+                                                          for group in match.groups())
+            old_lines, new_lines = files[path or old_path]
+            if old_lines is not None:
+                old_lines.update(range(old_start, old_start + old_count) if old_count else (old_start,))
+            if new_lines is not None:
+                # A pure deletion sits between new_start and the line after it
+                new_lines.update(range(new_start, new_start + new_count) if new_count
+                                 else (new_start, new_start + 1))
+    return files
+
+
+def definitions(source):
+    """[(first line, last line, kind, name)] for classes, their methods and their constants"""
+    found = []
+    for node in ast.parse(source).body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        found.append((node.lineno, node.end_lineno, "class", node.name))
+        for member in node.body:
+            if isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                start = min([member.lineno] + [decorator.lineno for decorator in member.decorator_list])
+                found.append((start, member.end_lineno, "method", f"{node.name}.{member.name}"))
+            elif isinstance(member, ast.Assign):
+                for target in member.targets:
+                    if isinstance(target, ast.Name) and target.id.isupper():
+                        found.append((member.lineno, member.end_lineno, "locator", f"{node.name}.{target.id}"))
+    return found
+
+
+def touched(source, lines):
+    """Symbols whose definitions cover any of lines; class-level lines outside members touch the class"""
+    if source is None or not lines:
+        return set()
+    symbols = set()
+    found = definitions(source)
+    members = [entry for entry in found if entry[2] != "class"]
+    for line in lines:
+        hits = [(kind, name) for start, end, kind, name in members if start <= line <= end]
+        if not hits:
+            hits = [("class", name) for start, end, kind, name in found if kind == "class" and start <= line <= end]
+        if not hits:
+            # Imports and module-level code can affect every class in the file
+            hits = [("class", name) for start, end, kind, name in found if kind == "class"]
+        symbols.update(hits)
+    return symbols
+
+
+def test_functions(source, lines):
+    """Names of test functions covering lines, or None when a change is outside any test function"""
+    if source is None:
+        return None
+    spans = []
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name.startswith("test"):
+            start = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+            spans.append((start, node.end_lineno, node.name))
+    names = set()
+    for line in lines:
+        hits = [name for start, end, name in spans if start <= line <= end]
+        if not hits:
+            return None
+        names.update(hits)
+    return names
+
+
+def changes_since(ref, cwd=PROJECT_ROOT):
+    """Work out what changed between ref and the working tree"""
+    change = Change()
+    for path, (old_lines, new_lines) in parse_diff(git_diff(ref, cwd)).items():
+        mapped = path.endswith(".py") and path.startswith((PAGES_DIR, LOCATORS_DIR, TESTS_DIR))
+        if not mapped or path == LOCATORS_DIR + "registry.py" or os.path.basename(path).startswith(("conftest", "__init__")):
+            change.fan_out(path)
+            continue
+        new_source = _read(os.path.join(cwd, path)) if new_lines is not None else None
+        old_source = git_show(ref, path, cwd) if old_lines is not None else None
+        if path.startswith(TESTS_DIR):
+            old_tests = test_functions(old_source, old_lines) if old_lines else set()
+            new_tests = test_functions(new_source, new_lines) if new_lines else set()
+            change.test_files[path] = None if old_tests is None or new_tests is None else old_tests | new_tests
+        else:
+            change.symbols |= touched(old_source, old_lines) | touched(new_source, new_lines)
+    return change
+
+
+def locator_references(pages_dir=os.path.join(PROJECT_ROOT, PAGES_DIR)):
+    """Map 'Locators.CONSTANT' to the 'Page.method' names whose source refers to it"""
+    references = {}
+    for filename in sorted(os.listdir(pages_dir)):
+        if not filename.endswith(".py"):
+            continue
+        for node in ast.parse(_read(os.path.join(pages_dir, filename))).body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            for member in node.body:
+                if not isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    continue
+                for inner in ast.walk(member):
+                    if (isinstance(inner, ast.Attribute) and isinstance(inner.value, ast.Name)
+                            and inner.value.id.endswith("Locators")):
+                        references.setdefault(f"{inner.value.id}.{inner.attr}", set()).add(
+                            f"{node.name}.{member.name}")
+    return references
+
+
+def select(nodeids, change, index, references=None):
+    """Subset of nodeids a change can affect: tests that touched changed symbols, changed tests and unrecorded tests"""
+    if change.everything:
+        return list(nodeids)
+    references = locator_references() if references is None else references
+    symbols = set(change.symbols)
+    for kind, name in change.symbols:
+        # Locators read without compile_locator (e.g. extract_rows field specs) show up as method use
+        if kind == "locator":
+            symbols.update(("method", method) for method in references.get(name, ()))
+        elif kind == "class" and name.endswith("Locators"):
+            for locator, methods in references.items():
+                if locator.startswith(name + "."):
+                    symbols.update(("method", method) for method in methods)
+    affected = index.affected(symbols)
+    known = index.known_tests()
+    selected = []
+    for nodeid in nodeids:
+        path, _, rest = nodeid.partition("::")
+        function = rest.rsplit("::", 1)[-1].split("[", 1)[0]
+        if path in change.test_files:
+            functions = change.test_files[path]
+            if functions is None or function in functions:
+                selected.append(nodeid)
+                continue
+        if nodeid in affected or nodeid not in known:
+            selected.append(nodeid)
+    return selected
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
@@ -0,0 +1,177 @@
+import fnmatch
+import threading
+
+# Used when the browser does not report a request's destination
+EXTENSION_TYPES = {
+    "image": (".png", ".jpg", ".jpeg", ".gif", ".webp", ".svg", ".ico", ".bmp", ".avif"),
+    "media": (".mp4", ".webm", ".ogg", ".ogv", ".mp3", ".wav", ".m3u8"),
+    "font": (".woff", ".woff2", ".ttf", ".otf", ".eot"),
+    "stylesheet": (".css",),
+    "script": (".js", ".mjs"),
+}
+# Destinations the browser may report, folded into the types used in config.json
+DESTINATION_TYPES = {"video": "media", "audio": "media", "track": "media", "style": "stylesheet"}
+
+# Bytes observed per URL across every session in this process, used to value blocked requests
+_sizes = {}
+_sizes_lock = threading.Lock()
+
+
+def resource_type(url, reported=None):
+    """Resource type of a request: what the browser reported, else inferred from the extension"""
+    if reported:
+        return DESTINATION_TYPES.get(reported, reported)
+    path = url.split("?", 1)[0].split("#", 1)[0].lower()
+    for kind, extensions in EXTENSION_TYPES.items():
+        if path.endswith(extensions):
+            return kind
+    return None
+
+
+def known_sizes():
+    """Copy of the URL -> bytes table learned from completed responses"""
+    with _sizes_lock:
+        return dict(_sizes)
+
+
+def remember_sizes(sizes):
+    """Seed the URL -> bytes table, e.g. from an earlier run's cache"""
+    with _sizes_lock:
+        for url, size in sizes.items():
+            _sizes.setdefault(url, size)
+
+
+class NetworkPolicy:
+    """Declarative request blocking and rewriting for one WebDriver session.
+
+    Rules (from config.json ``network_policy``, overridable per test) are
+    evaluated for every request in order: ``rewrite`` entries redirect
+    matching URLs, ``allow`` patterns always load, ``deny`` patterns and
+    ``block_types`` (image, media, font, stylesheet, script, ...) fail the
+    request in the browser. Page documents are never blocked. Enforcement
+    runs on WebDriver BiDi network interception, so it needs a session with
+    BiDi enabled; ``install`` is a no-op otherwise.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.defaults = None
+        self.rules = None
+        self.installed = False
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Get the policy attached to this driver"""
+        policy = getattr(driver, '_network_policy', None)
+        if policy is None:
+            policy = cls(driver)
+            driver._network_policy = policy
+        return policy
+
+    @staticmethod
+    def supported(driver):
+        """Whether the session was started with a BiDi channel"""
+        return bool(getattr(driver, 'caps', {}).get('webSocketUrl'))
+
+    def install(self, settings):
+        """Start intercepting requests with settings as the default rules"""
+        self.defaults = self._normalize(settings)
+        self.rules = self.defaults
+        if self.installed or not self.supported(self.driver):
+            return self
+        self.driver.network.add_request_handler(self._on_request)
+        self.driver.network.add_event_handler("response_completed", self._on_response)
+        self.installed = True
+        return self
+
+    def configure(self, **overrides):
+        """Apply per-test overrides on top of the defaults; no arguments restores the defaults.
+
+        Accepts enabled, allow, deny, block_types, rewrite (replacing the
+        default lists) and allow_types (removed from block_types).
+        """
+        rules = dict(self.defaults or self._normalize({}))
+        allow_types = overrides.pop('allow_types', ())
+        rules.update(self._normalize(overrides, partial=True))
+        rules['block_types'] = [kind for kind in rules['block_types'] if kind not in allow_types]
+        self.rules = rules
+        return self
+
+    def reset_stats(self):
+        """Start counting a new test's requests"""
+        with self._lock:
+            self.stats = {"requests": 0, "blocked": 0, "rewritten": 0, "bytes_loaded": 0,
+                          "bytes_saved": 0, "unsized_blocked": 0}
+
+    def decide(self, url, reported_type=None):
+        """Return ("allow" | "block" | "rewrite", new_url) for a request under the current rules"""
+        rules = self.rules
+        if not rules or not rules['enabled']:
+            return "allow", url
+        for rewrite in rules['rewrite']:
+            if fnmatch.fnmatchcase(url, rewrite['pattern']):
+                return "rewrite", rewrite['url']
+        if any(fnmatch.fnmatchcase(url, pattern) for pattern in rules['allow']):
+            return "allow", url
+        kind = resource_type(url, reported_type)
+        if kind == "document":
+            return "allow", url
+        if any(fnmatch.fnmatchcase(url, pattern) for pattern in rules['deny']):
+            return "block", url
+        if kind in rules['block_types']:
+            return "block", url
+        return "allow", url
+
+    def _on_request(self, request):
+        action, url = self.decide(request.url, request.resource_type)
+        with self._lock:
+            self.stats["requests"] += 1
+            if action == "block":
+                self.stats["blocked"] += 1
+                with _sizes_lock:
+                    size = _sizes.get(request.url)
+                if size is None:
+                    self.stats["unsized_blocked"] += 1
+                else:
+                    self.stats["bytes_saved"] += size
+            elif action == "rewrite":
+                self.stats["rewritten"] += 1
+        if action == "block":
+            request.fail()
+        elif action == "rewrite":
+            request.set_url(url)
+
+    def _on_response(self, params):
+        response = (params.get("response") if isinstance(params, dict) else getattr(params, "response", None)) or {}
+        url = response.get("url")
+        size = response.get("bytesReceived") or response.get("bodySize") or 0
+        if not url or not size:
+            return
+        with _sizes_lock:
+            _sizes[url] = size
+        with self._lock:
+            self.stats["bytes_loaded"] += size
+
+    @staticmethod
+    def _normalize(settings, partial=False):
+        defaults = {"enabled": True, "allow": [], "deny": [], "block_types": [], "rewrite": []}
+        rules = {} if partial else dict(defaults)
+        for key in defaults:
+            if key in settings:
+                value = settings[key]
+                rules[key] = list(value) if isinstance(value, (list, tuple)) else value
+        if 'block_types' in rules:
+            rules['block_types'] = [kind.lower() for kind in rules['block_types']]
+        return rules
+
+
+def format_bytes(size):
+    """Human-readable byte count"""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
@@ -0,0 +1,164 @@
+import ast
+import hashlib
+import os
+import sys
+import time
+from importlib import metadata
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Report user property marking a pass replayed from the cache instead of executed
+CACHED_PROPERTY = "result_cache"
+# Inputs of every test besides its own module's imports; base/js holds the scripts pages run in the browser
+SHARED_INPUTS = ("config.json", "conftest.py", "fixtures", os.path.join("base", "js"))
+
+
+def is_cached(report):
+    """Whether a test report replays a cached pass"""
+    return any(name == CACHED_PROPERTY for name, _ in getattr(report, "user_properties", ()))
+
+
+class Fingerprinter:
+    """Hash the inputs a test's outcome depends on against a hermetic site.
+
+    A test's fingerprint covers its module and every project module that
+    module imports, transitively (page objects, locators, ``TestData``,
+    ``BasePage``, ...), plus the inputs shared by all tests: config.json,
+    the root conftest with its imports and ``pytest_plugins``, the stand-in
+    fixture data under ``fixtures/`` and the page scripts under ``base/js/``.
+    Data files a test reads, such as its ``@pytest.mark.dataset`` file, are
+    passed as ``inputs``. Python and Selenium versions are included too.
+    File hashes and import closures are computed once.
+    """
+
+    def __init__(self, root=PROJECT_ROOT):
+        self.root = root
+        self._files = {}
+        self._imports = {}
+        self._shared = None
+
+    def fingerprint(self, path, inputs=()):
+        """Fingerprint of the test module at path and the data files in inputs"""
+        digest = hashlib.sha1(self.shared().encode())
+        files = self.closure(os.path.abspath(path)) | {os.path.abspath(name) for name in inputs}
+        for dependency in sorted(files):
+            digest.update(f"{os.path.relpath(dependency, self.root)}:{self.file_hash(dependency)}\n".encode())
+        return digest.hexdigest()
+
+    def shared(self):
+        """Hash of the inputs every test shares"""
+        if self._shared is None:
+            digest = hashlib.sha1(f"{sys.version}\n{_version('selenium')}\n".encode())
+            for name in SHARED_INPUTS:
+                path = os.path.join(self.root, name)
+                files = self.closure(path) if name.endswith(".py") else _walk(path)
+                for dependency in sorted(files):
+                    digest.update(f"{os.path.relpath(dependency, self.root)}:{self.file_hash(dependency)}\n".encode())
+            self._shared = digest.hexdigest()
+        return self._shared
+
+    def file_hash(self, path):
+        if path not in self._files:
+            try:
+                with open(path, "rb") as f:
+                    self._files[path] = hashlib.sha1(f.read()).hexdigest()
+            except OSError:
+                self._files[path] = "missing"
+        return self._files[path]
+
+    def closure(self, path):
+        """path and every project module it imports, transitively"""
+        seen = set()
+        pending = [path]
+        while pending:
+            current = pending.pop()
+            if current in seen or not os.path.isfile(current):
+                continue
+            seen.add(current)
+            pending.extend(self.imports(current))
+        return seen
+
+    def imports(self, path):
+        """Project module files imported by the module at path; pytest_plugins names count as imports"""
+        if path not in self._imports:
+            with open(path, encoding="utf-8") as f:
+                tree = ast.parse(f.read())
+            names = []
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import):
+                    names.extend(alias.name for alias in node.names)
+                elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                    names.append(node.module)
+                    names.extend(f"{node.module}.{alias.name}" for alias in node.names)
+                elif (isinstance(node, ast.Assign) and any(isinstance(target, ast.Name) and target.id == "pytest_plugins"
+                                                           for target in node.targets)
+                      and isinstance(node.value, (ast.List, ast.Tuple))):
+                    names.extend(element.value for element in node.value.elts if isinstance(element, ast.Constant))
+            self._imports[path] = [resolved for resolved in map(self.resolve, names) if resolved]
+        return self._imports[path]
+
+    def resolve(self, module):
+        """File of a project module, or None for the standard library and third-party packages"""
+        base = os.path.join(self.root, *module.split("."))
+        for candidate in (base + ".py", os.path.join(base, "__init__.py")):
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+
+
+class ResultCache:
+    """Passing outcomes by nodeid and fingerprint, least recently used evicted past max_entries"""
+
+    def __init__(self, entries, max_entries):
+        self.entries = dict(entries)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.evicted = 0
+
+    def lookup(self, nodeid, fingerprint):
+        """The cached pass for nodeid if its inputs are unchanged, else None"""
+        entry = self.entries.get(nodeid)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return None
+        return entry
+
+    def touch(self, nodeid):
+        """Mark a cached pass as used now"""
+        if nodeid in self.entries:
+            self.entries[nodeid]["used"] = time.time()
+            self.hits += 1
+
+    def store(self, nodeid, fingerprint, duration):
+        """Remember a pass, evicting the least recently used entries beyond the cap"""
+        self.entries[nodeid] = {"fingerprint": fingerprint, "duration": duration, "used": time.time()}
+        self._evict()
+
+    def forget(self, nodeid):
+        self.entries.pop(nodeid, None)
+
+    def saved_seconds(self, nodeids):
+        """Recorded run time of the given cached passes"""
+        return sum(self.entries[nodeid]["duration"] for nodeid in nodeids if nodeid in self.entries)
+
+    def _evict(self):
+        excess = len(self.entries) - self.max_entries
+        if excess > 0:
+            for nodeid in sorted(self.entries, key=lambda key: self.entries[key]["used"])[:excess]:
+                del self.entries[nodeid]
+            self.evicted += excess
+
+
+def _walk(path):
+    if os.path.isfile(path):
+        return {path}
+    found = set()
+    for directory, subdirectories, files in os.walk(path):
+        subdirectories[:] = [name for name in subdirectories if name != "__pycache__"]
+        found.update(os.path.join(directory, name) for name in files)
+    return found
+
+
+def _version(package):
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return "none"
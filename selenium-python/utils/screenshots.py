@@ -0,0 +1,225 @@
+import hashlib
+import io
+import os
+import queue
+import re
+import threading
+import time
+from plugins.parallel import WORKER_ENV
+from utils.driver_factory import DriverFactory
+
+try:
+    from PIL import Image
+except ImportError:
+    # Without Pillow frames are stored as captured and only exact duplicates are skipped
+    Image = None
+
+# Allure mime type per stored format
+MIME_TYPES = {"png": "image/png", "jpg": "image/jpeg", "webp": "image/webp"}
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def perceptual_hash(image):
+    """64-bit difference hash: brightness gradients of a 9x8 grayscale thumbnail"""
+    pixels = list(image.convert("L").resize((9, 8), Image.Resampling.BOX).getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = bits << 1 | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return bits
+
+
+def distance(first, second):
+    """Number of differing bits between two hashes; exact-match hashes are 0 or 64 apart"""
+    if isinstance(first, int) and isinstance(second, int):
+        return bin(first ^ second).count("1")
+    return 0 if first == second else 64
+
+
+class Frame:
+    """One captured screenshot on its way to disk"""
+
+    def __init__(self, name, stream, png):
+        self.name = name
+        self.stream = stream
+        self.png = png
+        self.path = None
+        self.mime_type = None
+        self.duplicate = False
+        self.done = threading.Event()
+
+
+class ScreenshotPipeline:
+    """Hand screenshots to a background writer so capturing costs only the capture command.
+
+    ``submit`` queues the raw PNG on a bounded queue and returns at once; a
+    frame that finds the queue full is dropped rather than blocking the test.
+    The writer thread hashes each frame, and a frame within
+    ``hash_distance`` bits of the last one stored for the same stream (test)
+    reuses that file instead of being encoded again. Other frames are
+    re-encoded as ``format`` (webp or jpg at ``quality``; png keeps the
+    capture) under ``dir``. ``collect`` waits at most ``attach_timeout`` in
+    all for a stream's frames; ones still queued then are counted as late.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.directory = settings['dir']
+        self.format = settings['format'] if Image is not None else "png"
+        self.stream = None
+        self.frames = {}
+        self.captured = 0
+        self.stored = 0
+        self.duplicates = 0
+        self.dropped = 0
+        self.late = 0
+        self.bytes_captured = 0
+        self.bytes_written = 0
+        self._last = {}
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=settings['queue_size'])
+        self._writer = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+        self._writer.start()
+
+    def capture(self, driver, name="screenshot", stream=None):
+        """Take a screenshot and queue it; returns the Frame, or None if it was dropped"""
+        return self.submit(driver.get_screenshot_as_png(), name, stream)
+
+    def submit(self, png, name="screenshot", stream=None):
+        """Queue a captured PNG for hashing, compression and storage"""
+        frame = Frame(name, stream or self.stream, png)
+        with self._lock:
+            self.captured += 1
+            self.bytes_captured += len(png)
+        try:
+            self._queue.put_nowait(frame)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return None
+        with self._lock:
+            self.frames.setdefault(frame.stream, []).append(frame)
+        return frame
+
+    def collect(self, stream, timeout=None):
+        """Remove and return a stream's stored frames, waiting up to timeout in all for any still in the queue"""
+        with self._lock:
+            frames = self.frames.pop(stream, [])
+        timeout = self.settings['attach_timeout'] if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        for frame in frames:
+            frame.done.wait(max(deadline - time.monotonic(), 0))
+        stored = [frame for frame in frames if frame.done.is_set()]
+        with self._lock:
+            self._last.pop(stream, None)
+            # Still written to disk, but too late for this stream's attachments
+            self.late += len(frames) - len(stored)
+        return [frame for frame in stored if frame.path]
+
+    def flush(self, timeout=None):
+        """Wait until every queued frame is stored"""
+        with self._lock:
+            frames = [frame for stream_frames in self.frames.values() for frame in stream_frames]
+        for frame in frames:
+            frame.done.wait(timeout)
+
+    def close(self):
+        """Store what is queued and stop the writer"""
+        self._queue.put(None)
+        self._writer.join()
+
+    def stats(self):
+        """Get capture, dedupe and storage counters"""
+        return {
+            "captured": self.captured,
+            "stored": self.stored,
+            "duplicates": self.duplicates,
+            "dropped": self.dropped,
+            "late": self.late,
+            "bytes_captured": self.bytes_captured,
+            "bytes_written": self.bytes_written,
+        }
+
+    def report(self):
+        """Get a one-line summary of the pipeline's work"""
+        return (f"Screenshots: {self.captured} captured, {self.stored} stored, "
+                f"{self.duplicates} near-duplicates reused, {self.dropped} dropped (queue full), "
+                f"{self.late} stored too late to attach, "
+                f"{self.bytes_captured // 1024}KB captured -> {self.bytes_written // 1024}KB written")
+
+    def _run(self):
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                return
+            try:
+                self._store(frame)
+            except Exception:
+                # A frame that cannot be stored is not attached; the test carries on
+                pass
+            finally:
+                frame.png = None
+                frame.done.set()
+
+    def _store(self, frame):
+        image = None
+        if Image is not None:
+            try:
+                image = Image.open(io.BytesIO(frame.png))
+                frame_hash = perceptual_hash(image)
+            except Exception:
+                image = None
+        if image is None:
+            frame_hash = hashlib.sha1(frame.png).hexdigest()
+        with self._lock:
+            last = self._last.get(frame.stream)
+        if last is not None and distance(last[0], frame_hash) <= self.settings['hash_distance']:
+            frame.path, frame.mime_type = last[1], last[2]
+            frame.duplicate = True
+            with self._lock:
+                self.duplicates += 1
+            return
+        extension = self.format if image is not None else "png"
+        data = frame.png if extension == "png" else self._encode(image, extension)
+        frame.path = self._write(frame.name, extension, data)
+        frame.mime_type = MIME_TYPES[extension]
+        with self._lock:
+            self._last[frame.stream] = (frame_hash, frame.path, frame.mime_type)
+            self.stored += 1
+            self.bytes_written += len(data)
+
+    def _encode(self, image, extension):
+        output = io.BytesIO()
+        if extension == "jpg":
+            image.convert("RGB").save(output, "JPEG", quality=self.settings['quality'], optimize=True)
+        else:
+            image.save(output, "WEBP", quality=self.settings['quality'], method=4)
+        return output.getvalue()
+
+    def _write(self, name, extension, data):
+        os.makedirs(self.directory, exist_ok=True)
+        self._sequence += 1
+        worker = os.environ.get(WORKER_ENV)
+        prefix = f"w{worker}-" if worker is not None else ""
+        slug = re.sub(r"[^\w.-]+", "_", name)[:80]
+        path = os.path.join(self.directory, f"{prefix}{self._sequence:04d}-{slug}.{extension}")
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+
+def get_pipeline():
+    """Get the process-wide pipeline, starting it from config.json on first use"""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = ScreenshotPipeline(DriverFactory().get_screenshot_config())
+        return _pipeline
+
+
+def running_pipeline():
+    """Get the pipeline if anything has started it, else None"""
+    return _pipeline
@@ -0,0 +1,407 @@
+"""Lightweight WebDriver session hub for locally spawned driver nodes.
+
+Accepts standard WebDriver new-session requests on ``POST /session``, queues
+them in arrival order and dispatches each to the least busy node that serves
+the requested browser and has a free slot. A node is one driver executable
+(chromedriver, msedgedriver, geckodriver) started by the hub; it hosts up to
+``slots`` sessions at once (geckodriver always one). Every later command of a
+session is proxied to its node, ``DELETE /session/{id}`` frees the slot and
+sessions idle for ``session_timeout`` seconds are ended. ``GET /status``
+answers like a WebDriver endpoint and adds queue depth, slot usage and how
+long new-session requests waited.
+
+Run standalone with ``python -m utils.session_hub [port]``.
+"""
+import atexit
+import json
+import math
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import urllib3
+from selenium.webdriver.common.driver_finder import DriverFinder
+
+# Set while a hub started by this process (or its pytest controller) is running
+HUB_URL_ENV = 'SELENIUM_HUB_URL'
+# Capability browserName values and the DriverFactory browser they run on
+BROWSER_NAMES = {"chrome": "chrome", "chromium": "chrome", "msedge": "edge", "microsoftedge": "edge",
+                 "edge": "edge", "firefox": "firefox"}
+# Where each browser's options take the binary the node's driver found
+BINARY_OPTIONS = {"chrome": "goog:chromeOptions", "edge": "ms:edgeOptions", "firefox": "moz:firefoxOptions"}
+# geckodriver hosts one session per process
+SINGLE_SESSION = {"firefox"}
+_SESSION_PATH = re.compile(r"^/session/([^/]+)(/.*)?$")
+_WAIT_SAMPLES = 1000
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def requested_browser(payload):
+    """The DriverFactory browser a new-session payload asks for, or None"""
+    capabilities = payload.get("capabilities", {})
+    candidates = [capabilities.get("alwaysMatch", {})] + list(capabilities.get("firstMatch", []) or [{}])
+    candidates.append(payload.get("desiredCapabilities", {}))
+    for candidate in candidates:
+        name = (candidate or {}).get("browserName")
+        if name:
+            return BROWSER_NAMES.get(name.lower())
+    return None
+
+
+def _error(status, error, message):
+    return status, {"value": {"error": error, "message": message, "stacktrace": ""}}
+
+
+class Node:
+    """One driver executable the hub dispatches sessions to"""
+
+    def __init__(self, browser, slots, url=None):
+        self.browser = browser
+        self.slots = 1 if browser in SINGLE_SESSION else slots
+        self.url = url
+        self.used = 0
+        self.sessions = 0
+        self._service = None
+        self._browser_path = None
+
+    @property
+    def free(self):
+        return self.slots - self.used
+
+    def start(self, factory):
+        """Launch the driver executable unless the node was given the url of a running one"""
+        if self.url is None:
+            self._service = factory.get_service(self.browser)
+            finder = DriverFinder(self._service, factory.get_options(self.browser))
+            self._browser_path = finder.get_browser_path() or None
+            self._service.path = self._service.env_path() or finder.get_driver_path()
+            self._service.start()
+            self.url = self._service.service_url
+        return self
+
+    def prepare(self, payload):
+        """Point a new-session payload at the browser binary this node's driver found"""
+        if not self._browser_path:
+            return payload
+        always = payload.setdefault("capabilities", {}).setdefault("alwaysMatch", {})
+        always.pop("browserVersion", None)
+        always.setdefault(BINARY_OPTIONS[self.browser], {}).setdefault("binary", self._browser_path)
+        return payload
+
+    def stop(self):
+        """Stop the driver executable if this node launched it"""
+        if self._service is not None:
+            self._service.stop()
+            self._service = None
+
+
+class SessionRequest:
+    """A queued new-session request"""
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.enqueued = time.monotonic()
+        self.node = None
+        self.ready = threading.Event()
+
+
+class SessionHub:
+    """Queue new-session requests and proxy sessions to local driver nodes.
+
+    ``nodes`` maps a browser to how many sessions of it may run at once; the
+    hub starts ``ceil(sessions / slots_per_node)`` driver executables for it
+    (one per session for Firefox). Requests for a browser nobody serves fail
+    at once, requests that wait longer than ``new_session_timeout`` fail with
+    ``session not created``.
+    """
+
+    def __init__(self, factory, nodes=None, slots_per_node=None, host=None, port=None,
+                 new_session_timeout=None, session_timeout=None):
+        settings = factory.get_remote_config()
+        self.factory = factory
+        self.host = host or settings['host']
+        self.port = settings['port'] if port is None else port
+        self.new_session_timeout = new_session_timeout or settings['new_session_timeout']
+        self.session_timeout = session_timeout or settings['session_timeout']
+        if isinstance(nodes, list):
+            self.nodes = nodes
+        else:
+            self.nodes = self._plan_nodes(nodes or settings['nodes'], slots_per_node or settings['slots_per_node'])
+        self.created = 0
+        self.timeouts = 0
+        self.reaped = 0
+        self._queue = deque()
+        self._sessions = {}
+        # Recent new-session waits for the mean and p95; the longest ever is kept apart
+        self._waits = deque(maxlen=_WAIT_SAMPLES)
+        self._wait_max = 0.0
+        self._lock = threading.Lock()
+        self._http = urllib3.PoolManager(maxsize=max(sum(node.slots for node in self.nodes), 1), retries=False,
+                                         timeout=urllib3.Timeout(connect=10, read=None))
+        self._httpd = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+    @property
+    def url(self):
+        """URL of the running hub"""
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        """Start the nodes and serve in the background; return the hub URL"""
+        for node in self.nodes:
+            node.start(self.factory)
+        httpd = ThreadingHTTPServer((self.host, self.port), SessionHubRequestHandler)
+        httpd.daemon_threads = True
+        httpd.hub = self
+        self.port = httpd.server_address[1]
+        self._httpd = httpd
+        self._thread = threading.Thread(target=httpd.serve_forever, name='session-hub', daemon=True)
+        self._thread.start()
+        threading.Thread(target=self._reap, name='session-hub-reaper', daemon=True).start()
+        return self.url
+
+    def stop(self):
+        """End every session, stop serving and stop the nodes"""
+        self._stopped.set()
+        with self._lock:
+            sessions = list(self._sessions.items())
+        for session_id, (node, _) in sessions:
+            self._end(session_id, node)
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        for node in self.nodes:
+            node.stop()
+        self._http.clear()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def new_session(self, payload):
+        """Queue a new-session request until a node has a slot, then create the session there"""
+        browser = requested_browser(payload)
+        if not any(node.browser == browser for node in self.nodes):
+            return _error(500, "session not created", f"No node serves browser {browser or 'unknown'}")
+        request = SessionRequest(browser)
+        with self._lock:
+            self._queue.append(request)
+            self._dispatch()
+        if not request.ready.wait(self.new_session_timeout):
+            with self._lock:
+                if request.node is None:
+                    self._queue.remove(request)
+                    self.timeouts += 1
+                    return _error(500, "session not created",
+                                  f"No {browser} slot became free within {self.new_session_timeout}s")
+        node = request.node
+        try:
+            status, body = self._forward(node, "POST", "/session", node.prepare(payload))
+        except Exception as e:
+            status, body = _error(500, "session not created", f"Node {node.url} failed: {e}")
+        session_id = None
+        if status == 200:
+            session_id = body.get("value", {}).get("sessionId") or body.get("sessionId")
+        with self._lock:
+            if session_id:
+                self._sessions[session_id] = (node, time.monotonic())
+                node.sessions += 1
+                self.created += 1
+            else:
+                node.used -= 1
+                self._dispatch()
+        return status, body
+
+    def command(self, method, session_id, path, payload):
+        """Proxy one command of a session to its node"""
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                self._sessions[session_id] = (entry[0], time.monotonic())
+        if entry is None:
+            return _error(404, "invalid session id", f"Session {session_id} is not known to this hub")
+        node = entry[0]
+        if method == "DELETE" and path == f"/session/{session_id}":
+            return self._end(session_id, node)
+        try:
+            return self._forward(node, method, path, payload)
+        except Exception as e:
+            return _error(500, "unknown error", f"Node {node.url} failed: {e}")
+
+    def stats(self):
+        """Get queue depth, slot usage per browser and new-session wait times (seconds)"""
+        with self._lock:
+            slots = {}
+            for node in self.nodes:
+                usage = slots.setdefault(node.browser, {"used": 0, "total": 0, "nodes": 0})
+                usage["used"] += node.used
+                usage["total"] += node.slots
+                usage["nodes"] += 1
+            waits = sorted(self._waits)
+            return {
+                "queue": len(self._queue),
+                "slots": slots,
+                "sessions": len(self._sessions),
+                "created": self.created,
+                "timeouts": self.timeouts,
+                "reaped": self.reaped,
+                "wait": {
+                    "mean": sum(waits) / len(waits) if waits else 0.0,
+                    "p95": waits[min(int(len(waits) * 0.95), len(waits) - 1)] if waits else 0.0,
+                    "max": self._wait_max,
+                },
+            }
+
+    def report(self):
+        """Get a one-line summary of the hub's sessions, slots and queueing"""
+        stats = self.stats()
+        slots = ", ".join(f"{browser} {usage['used']}/{usage['total']} slots on {usage['nodes']} nodes"
+                          for browser, usage in stats["slots"].items())
+        return (f"Session hub: {stats['created']} sessions ({slots}); waited {stats['wait']['mean']:.2f}s "
+                f"mean, {stats['wait']['p95']:.2f}s p95, {stats['wait']['max']:.2f}s max; "
+                f"{stats['timeouts']} timed out, {stats['reaped']} idle sessions ended")
+
+    def _plan_nodes(self, sessions, slots_per_node):
+        nodes = []
+        for browser, count in sessions.items():
+            per_node = 1 if browser in SINGLE_SESSION else max(slots_per_node, 1)
+            for index in range(math.ceil(count / per_node)):
+                nodes.append(Node(browser, min(per_node, count - index * per_node)))
+        return nodes
+
+    def _dispatch(self):
+        """Hand free slots to queued requests in arrival order; call with the lock held"""
+        for request in list(self._queue):
+            candidates = [node for node in self.nodes if node.browser == request.browser and node.free > 0]
+            if not candidates:
+                continue
+            node = max(candidates, key=lambda node: node.free)
+            node.used += 1
+            request.node = node
+            self._queue.remove(request)
+            wait = time.monotonic() - request.enqueued
+            self._waits.append(wait)
+            self._wait_max = max(self._wait_max, wait)
+            request.ready.set()
+
+    def _end(self, session_id, node):
+        try:
+            result = self._forward(node, "DELETE", f"/session/{session_id}", None)
+        except Exception as e:
+            # The slot is freed either way; a dead session cannot be ended twice
+            result = _error(500, "unknown error", f"Node {node.url} failed: {e}")
+        with self._lock:
+            if self._sessions.pop(session_id, None) is not None:
+                node.used -= 1
+                self._dispatch()
+        return result
+
+    def _reap(self):
+        """End sessions whose client stopped sending commands without quitting"""
+        interval = min(self.session_timeout / 4, 5)
+        while not self._stopped.wait(interval):
+            cutoff = time.monotonic() - self.session_timeout
+            with self._lock:
+                idle = [(session_id, node) for session_id, (node, used) in self._sessions.items() if used < cutoff]
+                self.reaped += len(idle)
+            for session_id, node in idle:
+                self._end(session_id, node)
+
+    def _forward(self, node, method, path, payload):
+        body = None if payload is None else json.dumps(payload).encode('utf-8')
+        response = self._http.request(method, node.url + path, body=body,
+                                      headers={"Content-Type": "application/json; charset=utf-8"})
+        data = response.data
+        return response.status, json.loads(data) if data else {}
+
+
+class SessionHubRequestHandler(BaseHTTPRequestHandler):
+    """Route WebDriver requests to the hub"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/status':
+            hub = self.server.hub
+            stats = hub.stats()
+            ready = any(usage["used"] < usage["total"] for usage in stats["slots"].values())
+            message = "Ready" if ready else "All slots are in use"
+            return self._send_json(200, {"value": {"ready": ready, "message": message, "hub": stats}})
+        return self._session_command()
+
+    def do_POST(self):
+        if self.path.rstrip('/') == '/session':
+            return self._send_json(*self.server.hub.new_session(self._read_json()))
+        return self._session_command()
+
+    def do_DELETE(self):
+        return self._session_command()
+
+    def log_message(self, format, *args):
+        # Every command passes through here; logging them would swamp the test output
+        pass
+
+    def _session_command(self):
+        match = _SESSION_PATH.match(self.path)
+        if match is None:
+            return self._send_json(*_error(404, "unknown command", f"{self.command} {self.path}"))
+        payload = self._read_json() if self.command == 'POST' else None
+        return self._send_json(*self.server.hub.command(self.command, match.group(1), self.path, payload))
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return {}
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def hub_url(factory):
+    """URL to request sessions from: the configured hub, the controller's, or one started in this process"""
+    global _hub
+    url = factory.get_remote_config()['url'] or os.environ.get(HUB_URL_ENV)
+    if url:
+        return url
+    with _hub_lock:
+        if _hub is None:
+            _hub = SessionHub(factory)
+            # Worker processes spawned from here inherit the hub instead of starting their own
+            os.environ[HUB_URL_ENV] = _hub.start()
+            atexit.register(_hub.stop)
+        return _hub.url
+
+
+def running_hub():
+    """Get the hub started in this process, or None"""
+    return _hub
+
+
+if __name__ == '__main__':
+    from utils.driver_factory import DriverFactory
+    hub = SessionHub(DriverFactory(), port=int(sys.argv[1]) if len(sys.argv) > 1 else 4444)
+    print(f"Session hub serving on {hub.start()}")
+    try:
+        hub._thread.join()
+    except KeyboardInterrupt:
+        hub.stop()
@@ -0,0 +1,159 @@
+import atexit
+import threading
+from selenium import webdriver
+from selenium.webdriver.chrome.remote_connection import ChromeRemoteConnection
+from selenium.webdriver.common.driver_finder import DriverFinder
+from selenium.webdriver.edge.remote_connection import EdgeRemoteConnection
+from selenium.webdriver.remote.client_config import ClientConfig
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+_services = {}
+_services_lock = threading.Lock()
+
+
+class SharedConnectionMixin:
+    """Remote connection used by many sessions; quitting one session keeps the pool open"""
+
+    def close(self):
+        pass
+
+    def shutdown(self):
+        """Close every pooled connection"""
+        super().close()
+
+    def pool_stats(self):
+        """Return (requests sent, connections opened) on the driver's connection pool"""
+        pool = self._conn.connection_from_url(self._client_config.remote_server_addr)
+        return pool.num_requests, pool.num_connections
+
+
+class SharedSessionMixin:
+    """Driver whose session lives on a SharedDriverService instead of a driver process of its own"""
+
+    def __init__(self, options, executor):
+        # Without a service of its own, quit() ends the session and leaves the driver running
+        self.service = None
+        self.options = options
+        RemoteWebDriver.__init__(self, command_executor=executor, options=options)
+
+
+class SharedChromeConnection(SharedConnectionMixin, ChromeRemoteConnection):
+    pass
+
+
+class SharedEdgeConnection(SharedConnectionMixin, EdgeRemoteConnection):
+    pass
+
+
+class SharedChrome(SharedSessionMixin, webdriver.Chrome):
+    pass
+
+
+class SharedEdge(SharedSessionMixin, webdriver.Edge):
+    pass
+
+
+# geckodriver hosts one session per process, so only Chromium drivers are shared
+SHAREABLE = {
+    'chrome': (SharedChrome, SharedChromeConnection),
+    'edge': (SharedEdge, SharedEdgeConnection),
+}
+
+
+class SharedDriverService:
+    """One driver executable per worker process hosting every session of a browser.
+
+    ``webdriver.Chrome(options=...)`` launches a chromedriver process and
+    builds a new HTTP connection pool for each session. This service starts
+    the driver once and sends every session's commands through one
+    keep-alive pool of ``connections`` connections, so a new session costs
+    only the browser launch. Without a url the configured browser's driver is
+    located and launched the same way ``DriverFactory`` does; with a url an
+    already running driver server is used.
+    """
+
+    def __init__(self, factory, browser, connections, url=None):
+        if browser not in SHAREABLE:
+            raise Exception(f'Browser {browser} cannot share a driver service')
+        self.factory = factory
+        self.browser = browser
+        self.connections = connections
+        self.url = url
+        self.sessions = 0
+        self.executor = None
+        self._service = None
+        self._browser_path = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Launch the driver executable (unless a url was given) and open the connection pool"""
+        if self.url is None:
+            self._service = self.factory.get_service(self.browser)
+            finder = DriverFinder(self._service, self.factory.get_options(self.browser))
+            self._browser_path = finder.get_browser_path() or None
+            self._service.path = self._service.env_path() or finder.get_driver_path()
+            self._service.start()
+            self.url = self._service.service_url
+        config = ClientConfig(remote_server_addr=self.url, keep_alive=True, timeout=120,
+                              init_args_for_pool_manager={
+                                  "init_args_for_pool_manager": {"maxsize": self.connections}})
+        self.executor = SHAREABLE[self.browser][1](self.url, client_config=config)
+        return self
+
+    def new_driver(self, options):
+        """Start a browser session on this service"""
+        if self._browser_path:
+            options.binary_location = self._browser_path
+            options.browser_version = None
+        driver = SHAREABLE[self.browser][0](options, self.executor)
+        with self._lock:
+            self.sessions += 1
+        return driver
+
+    def stats(self):
+        """Get session and connection reuse counters"""
+        requests, connections = self.executor.pool_stats()
+        return {
+            "sessions": self.sessions,
+            "requests": requests,
+            "connections": connections,
+            "connections_reused": max(requests - connections, 0),
+        }
+
+    def report(self):
+        """Get a one-line summary of the service's sessions and connection reuse"""
+        stats = self.stats()
+        return (f"Shared {self.browser} driver: {stats['sessions']} sessions on one driver process, "
+                f"{stats['requests']} commands over {stats['connections']} connections "
+                f"({stats['connections_reused']} reused)")
+
+    def stop(self):
+        """Close the connection pool and stop the driver executable if this service launched it"""
+        if self.executor is not None:
+            self.executor.shutdown()
+        if self._service is not None:
+            self._service.stop()
+            self._service = None
+
+
+def get_service(factory, browser):
+    """Get this process's shared service for browser, starting it on first use"""
+    with _services_lock:
+        service = _services.get(browser)
+        if service is None:
+            settings = factory.get_shared_service_config()
+            connections = settings['connections']
+            if not connections:
+                # One connection per session the pool can hold at once: idle, leased and spares
+                pool = factory.get_pool_config()
+                connections = pool['size'] + pool['spares'] + 1
+            service = SharedDriverService(factory, browser, connections).start()
+            _services[browser] = service
+            atexit.register(service.stop)
+        return service
+
+
+def running_services():
+    """Get the shared services started in this process"""
+    with _services_lock:
+        return list(_services.values())
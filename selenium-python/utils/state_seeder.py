@@ -0,0 +1,123 @@
+import json
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import urllib3
+from utils.driver_factory import DriverFactory
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(size, timeout):
+    """Process-wide keep-alive connection pool, shared by every seeder"""
+    key = (size, timeout)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = urllib3.PoolManager(maxsize=size, block=True, timeout=timeout,
+                                              retries=urllib3.Retry(total=2, backoff_factor=0.1))
+        return _pools[key]
+
+
+class StateSeeder:
+    """Put the shop into a known state through its backend API instead of UI click flows.
+
+    Calls the same endpoints the site's own XHRs use (``/entries``,
+    ``/addtocart``, ``/viewcart``, ``/deleteitem``, ``/deletecart``) over pooled
+    keep-alive connections for one shopper cookie, then hands that cookie to
+    the browser with ``inject_session`` so pages render the seeded state.
+    """
+
+    COOKIE_NAME = 'user'
+
+    def __init__(self, api_url=None, cookie=None, factory=None):
+        self.factory = factory or DriverFactory()
+        settings = self.factory.get_seeding_config()
+        self.api_url = (api_url or self.factory.get_api_url()).rstrip('/')
+        self.cookie = cookie or str(uuid.uuid4())
+        self.pool_size = settings['pool_size']
+        self.http = _get_pool(self.pool_size, settings['timeout'])
+        self._catalog = None
+        # Cart entry id -> product id for everything this seeder put in the cart
+        self.seeded = {}
+
+    def _post(self, path, body=None):
+        if body is None:
+            response = self.http.request('GET', f"{self.api_url}/{path}")
+        else:
+            response = self.http.request('POST', f"{self.api_url}/{path}", body=json.dumps(body),
+                                         headers={'Content-Type': 'application/json'})
+        if response.status >= 400:
+            raise Exception(f"Seeding call /{path} failed with HTTP {response.status}: {response.data[:200]!r}")
+        return json.loads(response.data) if response.data else None
+
+    def catalog(self):
+        """Get the products listed on the home page"""
+        if self._catalog is None:
+            self._catalog = self._post('entries')['Items']
+        return self._catalog
+
+    def product_id(self, name):
+        """Get the id of the first product whose title contains name"""
+        for item in self.catalog():
+            if name.lower() in item['title'].lower():
+                return item['id']
+        raise Exception(f"Product '{name}' not found in catalog")
+
+    def add_product(self, prod_id):
+        """Add one product to the cart; returns the cart entry id"""
+        entry_id = str(uuid.uuid4())
+        self._post('addtocart', {"id": entry_id, "cookie": self.cookie, "prod_id": int(prod_id), "flag": False})
+        self.seeded[entry_id] = int(prod_id)
+        return entry_id
+
+    def add_products(self, prod_ids):
+        """Add several products concurrently over the connection pool; returns entry ids in order"""
+        prod_ids = list(prod_ids)
+        if len(prod_ids) <= 1:
+            return [self.add_product(prod_id) for prod_id in prod_ids]
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(prod_ids))) as executor:
+            return list(executor.map(self.add_product, prod_ids))
+
+    def add_products_by_name(self, names):
+        """Add products by (partial) title"""
+        return self.add_products(self.product_id(name) for name in names)
+
+    def add_first_products(self, count):
+        """Add the first `count` catalog products"""
+        return self.add_products(item['id'] for item in self.catalog()[:count])
+
+    def view_cart(self):
+        """Get the cart entries for this shopper"""
+        return self._post('viewcart', {"cookie": self.cookie, "flag": False})['Items']
+
+    def delete_item(self, entry_id):
+        """Remove one cart entry"""
+        self._post('deleteitem', {"id": entry_id})
+        self.seeded.pop(entry_id, None)
+
+    def clear_cart(self):
+        """Remove every item from this shopper's cart in one call"""
+        self._post('deletecart', {"cookie": self.cookie})
+        self.seeded.clear()
+
+    def reseed(self, driver=None, base_url=None):
+        """Put the cart back to exactly what this seeder added, dropping anything the UI changed"""
+        prod_ids = list(self.seeded.values())
+        self.clear_cart()
+        self.add_products(prod_ids)
+        if driver is not None:
+            self.inject_session(driver, base_url)
+
+    def inject_session(self, driver, base_url=None):
+        """Make the browser shop as this seeder's cookie on the site under test"""
+        base_url = base_url or self.factory.get_base_url()
+        cookie = {"name": self.COOKIE_NAME, "value": self.cookie, "path": "/"}
+        if hasattr(driver, 'execute_cdp_cmd'):
+            # Chromium can set the cookie for any origin without loading a page first
+            driver.execute_cdp_cmd('Network.setCookie', dict(cookie, url=base_url))
+            return
+        if urlsplit(driver.current_url).netloc != urlsplit(base_url).netloc:
+            driver.get(base_url)
+        driver.add_cookie(cookie)
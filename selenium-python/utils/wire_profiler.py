@@ -0,0 +1,170 @@
+import atexit
+import glob
+import json
+import os
+import sys
+import threading
+from utils import command_events
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Frames from these files are plumbing, not call sites
+_SKIPPED_FILES = {os.path.abspath(command_events.__file__), os.path.abspath(__file__),
+                  os.path.join(PROJECT_ROOT, 'base', 'step_retry.py')}
+_COMPREHENSIONS = {'<listcomp>', '<dictcomp>', '<setcomp>', '<genexpr>'}
+
+_profiler = None
+_profiler_lock = threading.Lock()
+
+
+class WireProfiler:
+    """Attribute every WebDriver wire command to the page-object code that sent it.
+
+    Each command's latency is charged to its Python call stack, trimmed to
+    frames from this project (page-object methods are labelled
+    ``Class.method``, everything else ``module.function``). ``save`` writes
+    the stacks in collapsed format for flamegraph.pl / speedscope, weighted in
+    microseconds; ``top`` ranks the outermost page-object call sites by
+    total command time. In a parallel worker ``save`` writes the raw data
+    instead, for the controller to merge with ``merge_worker_profiles``.
+    """
+
+    def __init__(self, output='reports/wire_profile.folded', top=15):
+        self.output = output
+        self.top_n = top
+        self.stacks = {}
+        self.call_sites = {}
+        self.commands = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Begin observing commands from every driver created by DriverFactory"""
+        command_events.add_listener(self.on_command)
+        return self
+
+    def stop(self):
+        """Stop observing commands"""
+        command_events.remove_listener(self.on_command)
+
+    def on_command(self, driver, command, params, duration, error):
+        frames = self._project_frames(sys._getframe(1))
+        micros = int(duration * 1e6)
+        stack = ";".join(label for label, _ in frames)
+        stack = f"{stack};{command}" if stack else command
+        pages = [label for label, is_page in frames if is_page]
+        site = (pages[0] if pages else (frames[-1][0] if frames else "<driver>"), command)
+        with self._lock:
+            self.commands += 1
+            self.stacks[stack] = self.stacks.get(stack, 0) + micros
+            count, total = self.call_sites.get(site, (0, 0.0))
+            self.call_sites[site] = (count + 1, total + duration)
+
+    @staticmethod
+    def _project_frames(frame):
+        """Project frames from outermost to innermost as (label, is_page_object) pairs"""
+        from base.base_page import BasePage
+        frames = []
+        while frame is not None:
+            code = frame.f_code
+            filename = os.path.abspath(code.co_filename)
+            if (not code.co_filename.startswith('<') and filename.startswith(PROJECT_ROOT)
+                    and filename not in _SKIPPED_FILES and 'site-packages' not in filename
+                    and code.co_name not in _COMPREHENSIONS):
+                owner = frame.f_locals.get('self')
+                if isinstance(owner, BasePage):
+                    frames.append((f"{type(owner).__name__}.{code.co_name}", True))
+                else:
+                    module = os.path.splitext(os.path.basename(filename))[0]
+                    frames.append((f"{module}.{code.co_name}", False))
+            frame = frame.f_back
+        frames.reverse()
+        return frames
+
+    def top(self, n=None):
+        """Most expensive (call site, command) pairs as (site, command, count, total_s), slowest first"""
+        with self._lock:
+            rows = [(site, command, count, total) for (site, command), (count, total) in self.call_sites.items()]
+        rows.sort(key=lambda row: row[3], reverse=True)
+        return rows[:n or self.top_n]
+
+    def report(self, n=None):
+        """Top-N call sites as a text table"""
+        lines = [f"{'call site':<45} {'command':<28} {'count':>6} {'total ms':>10} {'mean ms':>8}"]
+        for site, command, count, total in self.top(n):
+            lines.append(f"{site:<45} {command:<28} {count:>6} {total * 1000:>10.1f} {total * 1000 / count:>8.2f}")
+        return "\n".join(lines)
+
+    def output_path(self):
+        """Where save() writes; parallel workers get their own file"""
+        worker = _worker()
+        return self.output if worker is None else f"{self.output}.worker-{worker}"
+
+    def save(self):
+        """Write the collapsed stacks (raw data in a worker); returns the path, or None if nothing was recorded"""
+        with self._lock:
+            stacks = sorted(self.stacks.items())
+            call_sites = [[site, command, count, total]
+                          for (site, command), (count, total) in self.call_sites.items()]
+            commands = self.commands
+        if not stacks:
+            return None
+        path = self.output_path()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            if _worker() is not None:
+                json.dump({"commands": commands, "stacks": dict(stacks), "call_sites": call_sites}, f)
+            else:
+                for stack, micros in stacks:
+                    f.write(f"{stack} {micros}\n")
+        return path
+
+    def merge(self, data):
+        """Add the raw data a worker's save() wrote"""
+        with self._lock:
+            self.commands += data["commands"]
+            for stack, micros in data["stacks"].items():
+                self.stacks[stack] = self.stacks.get(stack, 0) + micros
+            for site, command, count, total in data["call_sites"]:
+                known_count, known_total = self.call_sites.get((site, command), (0, 0.0))
+                self.call_sites[(site, command)] = (known_count + count, known_total + total)
+
+
+def _worker():
+    # Imported here: plugins.parallel imports DriverFactory, which imports this module
+    from plugins.parallel import WORKER_ENV
+    return os.environ.get(WORKER_ENV)
+
+
+def enable(output='reports/wire_profile.folded', top=15):
+    """Start the process-wide profiler once; later calls return the running one"""
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            _profiler = WireProfiler(output, top).start()
+            atexit.register(_profiler.save)
+        return _profiler
+
+
+def get_profiler():
+    """Get the running profiler, or None when profiling is off"""
+    return _profiler
+
+
+def merge_worker_profiles(output='reports/wire_profile.folded', top=15):
+    """Fold the profiles parallel workers saved into this process's profiler; returns it, or None"""
+    parts = sorted(glob.glob(f"{output}.worker-*"))
+    if not parts:
+        return _profiler
+    profiler = enable(output, top)
+    for part in parts:
+        with open(part) as f:
+            profiler.merge(json.load(f))
+        os.remove(part)
+    return profiler
+
+
+def discard_worker_profiles(output='reports/wire_profile.folded'):
+    """Remove worker profiles left over from an earlier run"""
+    for stale in glob.glob(f"{output}.worker-*"):
+        os.remove(stale)